@@ -0,0 +1,49 @@
+"""
+Attendance API.
+
+create_app builds the Flask app. Blueprint modules are imported when an app is
+created rather than when the package is, NumPy is only imported by the report and
+analytics code paths that need it, and the schema is managed by `flask init-db`
+instead of being checked on every start, which keeps cold starts short.
+"""
+import importlib
+
+from flask import Flask
+
+from api import compression, passwords, rate_limit, sharding, tracing
+from api.config import Config
+from api.extensions import db
+
+BLUEPRINTS = (
+    'api.blueprints.auth',
+    'api.blueprints.subjects',
+    'api.blueprints.students',
+    'api.blueprints.classes',
+    'api.blueprints.reports',
+    'api.blueprints.jobs',
+    'api.blueprints.terms',
+    'api.blueprints.batch',
+)
+
+
+def create_app(config=None):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    if config:
+        app.config.update(config)
+
+    db.init_app(app)
+    # Registered first so it runs after the other after_request hooks, on the final body
+    compression.init_app(app)
+    tracing.init_app(app)
+    rate_limit.init_app(app)
+    passwords.init_app(app)
+    sharding.init_app(app)
+
+    for module in BLUEPRINTS:
+        app.register_blueprint(importlib.import_module(module).bp)
+
+    from api.cli import register_commands
+    register_commands(app)
+
+    return app
@@ -0,0 +1,209 @@
+"""
+Vectorized attendance analytics.
+
+Every function works on a per-subject boolean matrix of shape
+(students x classes), classes ordered oldest first, where True means the
+student was present.
+"""
+import datetime
+import itertools
+
+import numpy as np
+
+from api import attendance_bitmap
+from api.archive import subject_classes
+from api.attendance_store import enrollment_ordinals, held_classes
+from api.extensions import db
+from api.fields import REPORT_CLASS_FIELDS, REPORT_STUDENT_FIELDS, AT_RISK_FIELDS, pick
+from api.models import Student, Subject, StudentSubject, Class, Attendance, AttendanceBitmap
+
+
+def attendance_matrix(present_bitsets, enrolled):
+    """Build the (students x classes) matrix from per-class present bitsets."""
+    return attendance_bitmap.unpack_matrix(present_bitsets, enrolled).T
+
+
+def attendance_rates(matrix):
+    """Share of all classes each student attended; NaN when there are no classes."""
+    if not matrix.shape[1]:
+        return np.full(matrix.shape[0], np.nan)
+    return matrix.mean(axis=1)
+
+
+def rolling_rates(matrix, window):
+    """
+    Attendance rate over a sliding window of ``window`` consecutive classes.
+    Column ``j`` of the result covers classes ``j .. j + window - 1``; when a subject
+    has fewer classes than the window the single column covers all of them.
+    """
+    students, classes = matrix.shape
+    window = max(1, min(window, classes))
+    if not classes:
+        return np.full((students, 0), np.nan)
+    totals = np.zeros((students, classes + 1), dtype=np.int32)
+    np.cumsum(matrix, axis=1, out=totals[:, 1:])
+    return (totals[:, window:] - totals[:, :-window]) / window
+
+
+def threshold_breaches(matrix, threshold, window):
+    """
+    Return (overall_rates, recent_rates, breached) for one subject, where
+    ``breached`` flags students below ``threshold`` overall or in their latest window.
+    """
+    overall = attendance_rates(matrix)
+    if not matrix.shape[1]:
+        return overall, overall, np.zeros(matrix.shape[0], dtype=bool)
+    recent = rolling_rates(matrix, window)[:, -1]
+    return overall, recent, (overall < threshold) | (recent < threshold)
+
+
+def load_subject_matrices(professor_id=None):
+    """
+    Bulk-load attendance of every subject (of one professor, or of everyone) into
+    (students x classes) NumPy matrices, classes oldest first.
+    Returns a list of (subject, student_ids, class_ids, matrix) tuples.
+    A fixed handful of queries is issued regardless of how many subjects there are.
+    """
+    subjects = Subject.query
+    enrollments = db.session.query(StudentSubject.subject_id, StudentSubject.student_id).join(Subject)
+    classes = db.session.query(Class.id, Class.subject_id).filter(held_classes())
+    rows = db.session.query(Attendance.class_id, Attendance.student_id) \
+        .join(Class).filter(Attendance.status == 'present', held_classes())
+    bitmaps = db.session.query(AttendanceBitmap.class_id, AttendanceBitmap.present).join(Class).filter(held_classes())
+    if professor_id is not None:
+        subjects = subjects.filter(Subject.professor_id == professor_id)
+        enrollments = enrollments.filter(Subject.professor_id == professor_id)
+        classes = classes.filter(Class.professor_id == professor_id)
+        rows = rows.filter(Class.professor_id == professor_id)
+        bitmaps = bitmaps.filter(Class.professor_id == professor_id)
+
+    # np.array() on Row objects is slow, so id pairs are flattened through fromiter
+    def id_pairs(query):
+        return np.fromiter(itertools.chain.from_iterable(query), dtype=np.int64).reshape(-1, 2)
+
+    subjects = subjects.order_by(Subject.id).all()
+    enrollments = id_pairs(enrollments.order_by(StudentSubject.subject_id, StudentSubject.id))
+    classes = id_pairs(classes.order_by(Class.subject_id, Class.date, Class.id))
+    rows = id_pairs(rows)
+    bitmaps = bitmaps.all()
+
+    # Position of each enrollment / class within its subject (both are grouped by subject)
+    def positions(subject_column):
+        return np.arange(len(subject_column)) - np.searchsorted(subject_column, subject_column)
+
+    ordinals = positions(enrollments[:, 0])
+    columns = positions(classes[:, 1])
+
+    # class_id -> (subject, column) and (subject_id, student_id) -> ordinal as array lookups
+    column_of = np.full(int(classes[:, 0].max(initial=0)) + 1, -1, dtype=np.int64)
+    column_of[classes[:, 0]] = columns
+    subject_of = np.zeros_like(column_of)
+    subject_of[classes[:, 0]] = classes[:, 1]
+    stride = int(max(enrollments[:, 1].max(initial=0), rows[:, 1].max(initial=0))) + 1
+    keys = enrollments[:, 0] * stride + enrollments[:, 1]
+    order = np.argsort(keys)
+    keys, key_ordinals = keys[order], ordinals[order]
+
+    # Drop rows of students no longer enrolled, then group the rest by subject
+    row_subjects = subject_of[rows[:, 0]]
+    row_keys = row_subjects * stride + rows[:, 1]
+    found = np.searchsorted(keys, row_keys).clip(max=max(len(keys) - 1, 0))
+    enrolled = keys[found] == row_keys if len(keys) else np.zeros(len(rows), dtype=bool)
+    order = np.argsort(row_subjects[enrolled], kind='stable')
+    row_subjects = row_subjects[enrolled][order]
+    row_ordinals = key_ordinals[found[enrolled]][order]
+    row_columns = column_of[rows[enrolled, 0]][order]
+
+    bitmaps_by_subject = {}
+    for class_id, present in bitmaps:
+        bitmaps_by_subject.setdefault(int(subject_of[class_id]), []).append((class_id, present))
+
+    def span(column, subject_id):
+        return slice(np.searchsorted(column, subject_id), np.searchsorted(column, subject_id, side='right'))
+
+    result = []
+    for subject in subjects:
+        student_ids = enrollments[span(enrollments[:, 0], subject.id), 1]
+        class_ids = classes[span(classes[:, 1], subject.id), 0]
+        matrix = np.zeros((len(student_ids), len(class_ids)), dtype=bool)
+
+        mine = span(row_subjects, subject.id)
+        matrix[row_ordinals[mine], row_columns[mine]] = True
+
+        stored = bitmaps_by_subject.get(subject.id, [])
+        if stored:
+            unpacked = attendance_matrix(
+                [attendance_bitmap.from_bytes(present) for _, present in stored], len(student_ids))
+            matrix[:, column_of[[class_id for class_id, _ in stored]]] |= unpacked
+
+        result.append((subject, student_ids.tolist(), class_ids.tolist(), matrix))
+    return result
+
+
+def subject_report(subject, class_fields=REPORT_CLASS_FIELDS, student_fields=REPORT_STUDENT_FIELDS):
+    """
+    Attendance totals per class and attendance rate per student, as served by /subject/<id>/report.
+    Classes of archived terms are included and flagged "archived"; scheduled classes that are
+    still to come are not. Only the given fields of each class and student are returned, and a
+    list with no fields is left out.
+    """
+    ordinals = enrollment_ordinals(subject.id)
+    classes = subject_classes(subject, ordinals, date_to=datetime.date.today())
+    report = {"id": subject.id, "name": subject.name}
+
+    if class_fields:
+        report["classes"] = [pick({
+            "id": class_id,
+            "date": date.isoformat(),
+            "present": attendance_bitmap.popcount(present_bits),
+            "total": len(ordinals),
+            "archived": archived
+        }, class_fields) for class_id, date, _, present_bits, archived in classes]
+
+    if student_fields:
+        present = attendance_bitmap.unpack_matrix([entry[3] for entry in classes], len(ordinals))
+        attended = present.sum(axis=0)
+        names = {}
+        if {'first_name', 'last_name'} & set(student_fields):
+            names = {row.id: row for row in db.session.query(Student.id, Student.first_name, Student.last_name)
+                     .filter(Student.id.in_(ordinals))}
+        report["students"] = [pick({
+            "id": student_id,
+            "first_name": names[student_id].first_name if names else None,
+            "last_name": names[student_id].last_name if names else None,
+            "attended": int(attended[ordinal]),
+            "rate": round(float(attended[ordinal]) / len(classes), 4) if classes else None
+        }, student_fields) for ordinal, student_id in enumerate(ordinals)]
+    return report
+
+
+def at_risk_report(professor_id, threshold, window, fields=AT_RISK_FIELDS):
+    """
+    Students below the attendance threshold, overall or over their last ``window`` classes,
+    with the given fields of each.
+    """
+    flagged = []
+    for subject, student_ids, class_ids, matrix in load_subject_matrices(professor_id):
+        overall, recent, breached = threshold_breaches(matrix, threshold, window)
+        for ordinal in np.flatnonzero(breached):
+            flagged.append({
+                "student_id": student_ids[ordinal],
+                "subject_id": subject.id,
+                "subject_name": subject.name,
+                "professor_id": subject.professor_id,
+                "classes": len(class_ids),
+                "attended": int(matrix[ordinal].sum()),
+                "rate": round(float(overall[ordinal]), 4),
+                "recent_rate": round(float(recent[ordinal]), 4)
+            })
+
+    names = {}
+    student_ids = {entry["student_id"] for entry in flagged}
+    if student_ids and {'first_name', 'last_name'} & set(fields):
+        names = {row.id: row for row in db.session.query(Student.id, Student.first_name, Student.last_name)
+                 .filter(Student.id.in_(student_ids))}
+    for entry in flagged:
+        entry["first_name"] = names[entry["student_id"]].first_name if names else None
+        entry["last_name"] = names[entry["student_id"]].last_name if names else None
+
+    return {"threshold": threshold, "window": window, "students": [pick(entry, fields) for entry in flagged]}
@@ -0,0 +1,154 @@
+"""
+Cold storage for closed terms.
+
+Archiving a term moves its classes out of the hot tables (Class, Attendance,
+AttendanceBitmap) into the archive database. Each subject gets one
+ArchivedSubjectTerm row for the term, holding every class of that subject in
+the term:
+- class ids as little-endian int64;
+- dates as int32 proleptic ordinals;
+- the marked and present bitsets as fixed-width rows of ceil(size / 8) bytes
+  (see attendance_bitmap).
+Each field is zlib-compressed. Queries on current classes no longer scan old
+terms, and report code reads archived classes back through archived_classes().
+"""
+import array
+import datetime
+import sys
+import zlib
+
+from api import attendance_bitmap
+from api.attendance_store import enrollment_ordinals, class_bitsets
+from api.extensions import db
+from api.models import Class, Attendance, AttendanceBitmap, ArchivedSubjectTerm
+
+
+def _pack(typecode, values):
+    packed = array.array(typecode, values)
+    if sys.byteorder != 'little':
+        packed.byteswap()  # stored little-endian
+    return zlib.compress(packed.tobytes())
+
+
+def _unpack(typecode, data):
+    packed = array.array(typecode)
+    packed.frombytes(zlib.decompress(data))
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    return packed
+
+
+def pack_block(classes, bitsets, size):
+    """Compress [(class_id, date)] and their {class_id: (marked, present)} bitsets into column values."""
+    return {
+        "size": size,
+        "classes": len(classes),
+        "class_ids": _pack('q', [class_id for class_id, _ in classes]),
+        "dates": _pack('i', [date.toordinal() for _, date in classes]),
+        "marked": zlib.compress(b''.join(attendance_bitmap.to_bytes(bitsets[class_id][0], size)
+                                         for class_id, _ in classes)),
+        "present": zlib.compress(b''.join(attendance_bitmap.to_bytes(bitsets[class_id][1], size)
+                                          for class_id, _ in classes)),
+    }
+
+
+def unpack_block(block):
+    """Inverse of pack_block: [(class_id, date, marked, present)] in stored order."""
+    width = (block.size + 7) // 8
+    marked = zlib.decompress(block.marked)
+    present = zlib.decompress(block.present)
+    return [(class_id, datetime.date.fromordinal(ordinal),
+             attendance_bitmap.from_bytes(marked[i * width:(i + 1) * width]),
+             attendance_bitmap.from_bytes(present[i * width:(i + 1) * width]))
+            for i, (class_id, ordinal) in enumerate(zip(_unpack('q', block.class_ids), _unpack('i', block.dates)))]
+
+
+def archived_classes(subject_id, professor_id, date_from=None, date_to=None):
+    """
+    Archived classes of a subject as [(class_id, date, marked, present)], oldest first.
+    Bits are enrollment ordinals, exactly like class_bitsets for live classes.
+    """
+    blocks = ArchivedSubjectTerm.query.filter_by(professor_id=professor_id, subject_id=subject_id)
+    if date_from:
+        blocks = blocks.filter(ArchivedSubjectTerm.end_date >= date_from)
+    if date_to:
+        blocks = blocks.filter(ArchivedSubjectTerm.start_date <= date_to)
+
+    classes = [entry for block in blocks for entry in unpack_block(block)
+               if (not date_from or entry[1] >= date_from) and (not date_to or entry[1] <= date_to)]
+    classes.sort(key=lambda entry: (entry[1], entry[0]))
+    return classes
+
+
+def subject_classes(subject, ordinals, date_from=None, date_to=None):
+    """
+    Every class of a subject, live and archived, as (class_id, date, marked, present, archived)
+    ordered by date. Bits are enrollment ordinals whichever store a class came from.
+    """
+    query = db.session.query(Class.id, Class.date) \
+        .filter(Class.subject_id == subject.id, Class.professor_id == subject.professor_id)
+    if date_from:
+        query = query.filter(Class.date >= date_from)
+    if date_to:
+        query = query.filter(Class.date <= date_to)
+    live = query.order_by(Class.date, Class.id).all()
+    bitsets = class_bitsets([class_id for class_id, _ in live], ordinals)
+
+    classes = [(class_id, date, *bitsets[class_id], False) for class_id, date in live]
+    classes += [(*entry, True) for entry in archived_classes(subject.id, subject.professor_id, date_from, date_to)]
+    classes.sort(key=lambda entry: entry[1])
+    return classes
+
+
+def archive_term(term, progress=None):
+    """
+    Move a term's classes into the archive, one subject at a time. The archive rows are
+    committed before the hot rows are deleted, so an interruption never loses attendance;
+    running it again finishes the job. Returns a summary dict.
+    """
+    subject_ids = [row.subject_id for row in db.session.query(Class.subject_id).distinct().filter(
+        Class.professor_id == term.professor_id, Class.date.between(term.start_date, term.end_date))]
+    summary = {"term_id": term.id, "subjects": 0, "classes": 0, "archived_bytes": 0}
+
+    for done, subject_id in enumerate(subject_ids, 1):
+        classes = db.session.query(Class.id, Class.date).filter(
+            Class.professor_id == term.professor_id, Class.subject_id == subject_id,
+            Class.date.between(term.start_date, term.end_date)).order_by(Class.date, Class.id).all()
+        class_ids = [class_id for class_id, _ in classes]
+        ordinals = enrollment_ordinals(subject_id)
+
+        key = (term.professor_id, term.id, subject_id)
+        block = db.session.get(ArchivedSubjectTerm, key)
+        # Classes left over by an interrupted run are already in the block and only need deleting
+        archived = {entry[0] for entry in unpack_block(block)} if block else set()
+        pending = [(class_id, date) for class_id, date in classes if class_id not in archived]
+        if pending:
+            bitsets = class_bitsets([class_id for class_id, _ in pending], ordinals)
+            entries = [(class_id, date, *bitsets[class_id]) for class_id, date in pending]
+            if block:
+                entries += unpack_block(block)
+            entries.sort(key=lambda entry: (entry[1], entry[0]))
+            values = pack_block([(class_id, date) for class_id, date, _, _ in entries],
+                                {class_id: (marked, present) for class_id, _, marked, present in entries},
+                                max(len(ordinals), block.size if block else 0))
+            block = block or ArchivedSubjectTerm(professor_id=key[0], term_id=key[1], subject_id=key[2])
+            block.start_date, block.end_date = entries[0][1], entries[-1][1]
+            for column, value in values.items():
+                setattr(block, column, value)
+            db.session.add(block)
+            db.session.commit()
+
+        Attendance.query.filter(Attendance.class_id.in_(class_ids)).delete(synchronize_session=False)
+        AttendanceBitmap.query.filter(AttendanceBitmap.class_id.in_(class_ids)).delete(synchronize_session=False)
+        Class.query.filter(Class.id.in_(class_ids)).delete(synchronize_session=False)
+        db.session.commit()
+
+        summary["subjects"] += 1
+        summary["classes"] += len(classes)
+        summary["archived_bytes"] += len(block.class_ids) + len(block.dates) + len(block.marked) + len(block.present)
+        if progress:
+            progress(done / len(subject_ids))
+
+    term.archived_at = datetime.datetime.utcnow()
+    db.session.commit()
+    return summary
@@ -0,0 +1,60 @@
+"""
+Compact per-class attendance bitsets.
+
+Bit ``i`` of a class bitmap belongs to the student with enrollment ordinal ``i``
+in the class's subject, where ordinals follow StudentSubject insertion order.
+Bitmaps are stored little-endian so that growing the enrollment never moves
+existing bits.
+"""
+
+
+def from_ordinals(ordinals):
+    """Build a bitset with the given ordinals set."""
+    bits = 0
+    for ordinal in ordinals:
+        bits |= 1 << ordinal
+    return bits
+
+
+def to_ordinals(bits):
+    """Return the ordinals that are set in a bitset, lowest first."""
+    ordinals = []
+    ordinal = 0
+    while bits:
+        if bits & 1:
+            ordinals.append(ordinal)
+        bits >>= 1
+        ordinal += 1
+    return ordinals
+
+
+def has_bit(bits, ordinal):
+    return bool((bits >> ordinal) & 1)
+
+
+def popcount(bits):
+    return bin(bits).count('1')
+
+
+def to_bytes(bits, size):
+    """Serialize a bitset covering ``size`` ordinals; higher bits are dropped."""
+    return (bits & ((1 << size) - 1)).to_bytes((size + 7) // 8, 'little')
+
+
+def from_bytes(data):
+    return int.from_bytes(data or b'', 'little')
+
+
+def unpack_matrix(bitsets, size):
+    """
+    Expand bitsets into a (len(bitsets) x size) boolean matrix.
+    Row ``c`` is class ``c``, column ``i`` is enrollment ordinal ``i``.
+    """
+    import numpy as np  # deferred: only reports and analytics need it
+
+    width = (size + 7) // 8
+    if not bitsets or not width:
+        return np.zeros((len(bitsets), size), dtype=bool)
+    packed = np.frombuffer(b''.join(to_bytes(bits, size) for bits in bitsets), dtype=np.uint8)
+    unpacked = np.unpackbits(packed.reshape(len(bitsets), width), axis=1, bitorder='little')
+    return unpacked[:, :size].astype(bool)
@@ -0,0 +1,218 @@
+"""
+Attendance storage helpers shared by the row and bitmap storage modes and the group commit writer.
+"""
+import datetime
+import functools
+import threading
+
+from flask import current_app
+
+from api import attendance_bitmap
+from api.extensions import db, class_event_broker
+from api.group_commit import GroupCommitQueue
+from api.inserts import insert_or_ignore
+from api.models import Class, StudentSubject, Attendance, AttendanceBitmap
+from api.sharding import current_shard, event_channel, use_shard
+
+_group_commit_lock = threading.Lock()
+
+
+def held_classes():
+    """
+    Filter for classes held by today. Scheduled classes that are still to come are left
+    out of attendance rates, where they would otherwise count as absences.
+    """
+    return Class.date <= datetime.date.today()
+
+
+def enrollment_ordinals(subject_id):
+    """
+    Student ids enrolled in a subject, in enrollment order.
+    The list index of a student is its bit position in the subject's class bitmaps.
+    """
+    rows = db.session.query(StudentSubject.student_id) \
+        .filter_by(subject_id=subject_id) \
+        .order_by(StudentSubject.id).all()
+    return [row.student_id for row in rows]
+
+
+def enrollment_ordinal(student_subject):
+    return StudentSubject.query.filter(StudentSubject.subject_id == student_subject.subject_id,
+                                       StudentSubject.id < student_subject.id).count()
+
+
+def class_bitsets(class_ids, ordinals):
+    """
+    Return {class_id: (marked, present)} bitsets for the given classes of one subject.
+    Classes stored as bitmaps are read directly; classes stored as rows are folded in
+    with a single query, so callers never need to care which form a class is in.
+    """
+    bitsets = {class_id: (0, 0) for class_id in class_ids}
+    if not class_ids:
+        return bitsets
+
+    for stored in AttendanceBitmap.query.filter(AttendanceBitmap.class_id.in_(class_ids)):
+        bitsets[stored.class_id] = (attendance_bitmap.from_bytes(stored.marked),
+                                    attendance_bitmap.from_bytes(stored.present))
+
+    position = {student_id: ordinal for ordinal, student_id in enumerate(ordinals)}
+    rows = db.session.query(Attendance.class_id, Attendance.student_id, Attendance.status) \
+        .filter(Attendance.class_id.in_(class_ids)).all()
+    for class_id, student_id, status in rows:
+        ordinal = position.get(student_id)
+        if ordinal is None:
+            continue
+        marked, present = bitsets[class_id]
+        marked |= 1 << ordinal
+        if status == 'present':
+            present |= 1 << ordinal
+        bitsets[class_id] = (marked, present)
+
+    return bitsets
+
+
+def stored_status(class_id, student_subject):
+    """
+    The status stored for a student in a class, from whichever form the class is in,
+    or None when the student is not marked.
+    """
+    stored = AttendanceBitmap.query.filter_by(class_id=class_id).populate_existing().first()
+    if not stored:
+        return db.session.execute(
+            db.select(Attendance.status)
+            .where(Attendance.class_id == class_id, Attendance.student_id == student_subject.student_id)
+        ).scalar()
+    ordinal = enrollment_ordinal(student_subject)
+    if not attendance_bitmap.has_bit(attendance_bitmap.from_bytes(stored.marked), ordinal):
+        return None
+    return 'present' if attendance_bitmap.has_bit(attendance_bitmap.from_bytes(stored.present), ordinal) else 'absent'
+
+
+def lock_class(class_id):
+    """
+    Take the write lock for a class's attendance until the transaction ends, then return its
+    AttendanceBitmap read afresh, or None. The no-op UPDATE locks the class row (on SQLite, the
+    whole database), so concurrent writers on one class read and change its bitmap in turn
+    instead of overwriting each other's bits.
+    """
+    db.session.execute(db.update(Class).where(Class.id == class_id).values(id=Class.id)
+                       .execution_options(synchronize_session=False))
+    return AttendanceBitmap.query.filter_by(class_id=class_id).populate_existing().first()
+
+
+def convert_class_to_bitmap(class_):
+    """Replace a class's Attendance rows with an AttendanceBitmap. Caller commits."""
+    stored = lock_class(class_.id) or AttendanceBitmap(class_=class_)
+    # A new bitmap is only complete once its bits are set below, so it must not be flushed by these reads
+    with db.session.no_autoflush:
+        ordinals = enrollment_ordinals(class_.subject_id)
+        marked, present = class_bitsets([class_.id], ordinals)[class_.id]
+    stored.size = len(ordinals)
+    stored.marked = attendance_bitmap.to_bytes(marked, stored.size)
+    stored.present = attendance_bitmap.to_bytes(present, stored.size)
+    db.session.add(stored)
+    Attendance.query.filter_by(class_id=class_.id).delete()
+
+
+def convert_class_to_rows(class_):
+    """Replace a class's AttendanceBitmap with Attendance rows. Caller commits."""
+    stored = lock_class(class_.id)
+    if not stored:
+        return
+    ordinals = enrollment_ordinals(class_.subject_id)
+    marked = attendance_bitmap.from_bytes(stored.marked)
+    present = attendance_bitmap.from_bytes(stored.present)
+    existing = {row.student_id for row in Attendance.query.filter_by(class_id=class_.id)}
+    for ordinal in attendance_bitmap.to_ordinals(marked):
+        if ordinal >= len(ordinals) or ordinals[ordinal] in existing:
+            continue
+        status = 'present' if attendance_bitmap.has_bit(present, ordinal) else 'absent'
+        db.session.add(Attendance(class_id=class_.id, student_id=ordinals[ordinal], status=status))
+    db.session.delete(stored)
+
+
+def apply_bitmap_marks(class_, marks):
+    """
+    Set the bits of (ordinal, status) marks in a class bitmap, converting the class from
+    rows first if needed. Returns one bool per mark, False where the student was
+    already marked. Caller commits.
+    """
+    stored = lock_class(class_.id)
+    # Classes still holding rows are converted on first write so the two forms never mix
+    if not stored:
+        convert_class_to_bitmap(class_)
+        stored = class_.bitmap
+
+    marked = attendance_bitmap.from_bytes(stored.marked)
+    present = attendance_bitmap.from_bytes(stored.present)
+    applied = []
+    for ordinal, status in marks:
+        if attendance_bitmap.has_bit(marked, ordinal):
+            applied.append(False)
+            continue
+        marked |= 1 << ordinal
+        if status == 'present':
+            present |= 1 << ordinal
+        stored.size = max(stored.size, ordinal + 1)
+        applied.append(True)
+
+    stored.marked = attendance_bitmap.to_bytes(marked, stored.size)
+    stored.present = attendance_bitmap.to_bytes(present, stored.size)
+    return applied
+
+
+def flush_attendance_batch(items):
+    """
+    Write queued (class_id, student_id, ordinal, status) marks in a single transaction.
+    Returns one bool per item, False where the student was already marked.
+    """
+    results = [False] * len(items)
+
+    if current_app.config['ATTENDANCE_STORAGE'] == 'bitmap':
+        by_class = {}
+        for index, (class_id, _, ordinal, status) in enumerate(items):
+            by_class.setdefault(class_id, []).append((index, ordinal, status))
+        for class_id, marks in by_class.items():
+            applied = apply_bitmap_marks(db.session.get(Class, class_id),
+                                         [(ordinal, status) for _, ordinal, status in marks])
+            for (index, _, _), result in zip(marks, applied):
+                results[index] = result
+    else:
+        # As in the single-mark path, the unique (class_id, student_id) constraint settles repeats,
+        # including ones written by another process since the batch was queued
+        for index, (class_id, student_id, _, status) in enumerate(items):
+            results[index] = insert_or_ignore(Attendance, class_id=class_id, student_id=student_id,
+                                              status=status) is not None
+
+    try:
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    for (class_id, student_id, _, status), marked in zip(items, results):
+        if marked:
+            class_event_broker.publish(event_channel(class_id), {"student_id": student_id, "status": status})
+    return results
+
+
+def flush_shard_batch(shard, items):
+    with use_shard(shard):
+        return flush_attendance_batch(items)
+
+
+def group_commit_queue():
+    """
+    The attendance GroupCommitQueue for this request, started on first use.
+    With sharding each shard has its own queue and writer, so shards commit in parallel.
+    """
+    app = current_app._get_current_object()
+    shard = current_shard() if app.config['SHARDING_ENABLED'] else None
+    with _group_commit_lock:
+        queues = app.extensions.setdefault('group_commit', {})
+        if shard not in queues:
+            queues[shard] = GroupCommitQueue(
+                app, flush_attendance_batch if shard is None else functools.partial(flush_shard_batch, shard),
+                max_batch=app.config['GROUP_COMMIT_MAX_BATCH'],
+                max_delay=app.config['GROUP_COMMIT_MAX_DELAY_MS'] / 1000)
+        return queues[shard]
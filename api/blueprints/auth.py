@@ -0,0 +1,128 @@
+from flask import Blueprint, request, jsonify, current_app
+import jwt
+import datetime
+import hashlib
+import secrets
+
+from api.extensions import db
+from api.models import Professor, RefreshToken
+from api.passwords import hash_password, verify_password
+
+bp = Blueprint('auth', __name__)
+
+
+def refresh_token_hash(token):
+    # Refresh tokens are 256 random bits, so a fast hash is enough; no password hashing involved
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_tokens(professor_id):
+    """A new access token and refresh token for the professor; the caller commits."""
+    now = datetime.datetime.utcnow()
+    access_ttl = current_app.config['ACCESS_TOKEN_TTL']
+    refresh_ttl = current_app.config['REFRESH_TOKEN_TTL']
+    access_token = jwt.encode({'id': professor_id, 'exp': now + access_ttl}, current_app.config['SECRET_KEY'])
+    refresh_token = secrets.token_urlsafe(32)
+
+    # Expired refresh tokens are purged on issue, which keeps the table bounded by the TTL
+    RefreshToken.query.filter(RefreshToken.professor_id == professor_id, RefreshToken.expires_at < now).delete()
+    db.session.add(RefreshToken(professor_id=professor_id, token_hash=refresh_token_hash(refresh_token),
+                                expires_at=now + refresh_ttl))
+    return {
+        'token': access_token,
+        'expires_in': int(access_ttl.total_seconds()),
+        'refresh_token': refresh_token,
+        'refresh_expires_in': int(refresh_ttl.total_seconds())
+    }
+
+
+@bp.route('/register', methods=['POST'])
+def register():
+    data = request.get_json()
+    hashed_password = hash_password(data['password'])
+    new_professor = Professor(name=data['name'], email=data['email'], password=hashed_password)
+    try:
+        db.session.add(new_professor)
+        db.session.commit()
+        return jsonify({'message': 'Professor registered successfully!'}), 201
+    except:
+        return jsonify({'message': 'Registration failed. Email might be already in use.'}), 400
+
+
+@bp.route('/login', methods=['POST'])
+def login():
+    data = request.get_json()
+    professor = Professor.query.filter_by(email=data['email']).first()
+    if not professor:
+        return jsonify({'message': 'Login failed. Check email and password.'}), 401
+    professor_id, password = professor.id, professor.password
+    # Hand the connection back to the pool while the hash is checked
+    db.session.close()
+    matches, new_hash = verify_password(password, data['password'])
+    if not matches:
+        return jsonify({'message': 'Login failed. Check email and password.'}), 401
+
+    # Check if the stored hash is from an older method and upgrade it, unless it changed meanwhile
+    if new_hash:
+        try:
+            Professor.query.filter_by(id=professor_id, password=password).update({'password': new_hash})
+            db.session.commit()
+        except Exception:
+            db.session.rollback()  # the old hash still works, so the login goes ahead
+
+    try:
+        tokens = issue_tokens(professor_id)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': f'Login failed: {str(e)}'}), 500
+    return jsonify(tokens)
+
+
+@bp.route('/token/refresh', methods=['POST'])
+def refresh_token():
+    """
+    Swap a refresh token for a new access token and refresh token, without the password.
+    Body: {"refresh_token": ...}. Each refresh token works once; the response has the same
+    fields as login.
+    """
+    data = request.get_json(silent=True) or {}
+    token = data.get('refresh_token')
+
+    # Validate input
+    if not isinstance(token, str) or not token:
+        return jsonify({'message': 'refresh_token is required.'}), 400
+
+    stored = RefreshToken.query.filter_by(token_hash=refresh_token_hash(token)).first()
+    if not stored or stored.expires_at < datetime.datetime.utcnow():
+        return jsonify({'message': 'Refresh token is invalid or expired. Log in again.'}), 401
+
+    try:
+        # Check if a concurrent refresh used the token first
+        used = RefreshToken.query.filter_by(id=stored.id).delete()
+        if not used:
+            db.session.rollback()
+            return jsonify({'message': 'Refresh token is invalid or expired. Log in again.'}), 401
+        tokens = issue_tokens(stored.professor_id)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': f'Failed to refresh token: {str(e)}'}), 500
+    return jsonify(tokens), 200
+
+
+@bp.route('/token/revoke', methods=['POST'])
+def revoke_token():
+    """End a login session: the refresh token stops working. Body: {"refresh_token": ...}."""
+    data = request.get_json(silent=True) or {}
+    token = data.get('refresh_token')
+    if not isinstance(token, str) or not token:
+        return jsonify({'message': 'refresh_token is required.'}), 400
+
+    try:
+        RefreshToken.query.filter_by(token_hash=refresh_token_hash(token)).delete()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': f'Failed to revoke token: {str(e)}'}), 500
+    return jsonify({'message': 'Token revoked.'}), 200
@@ -0,0 +1,61 @@
+from flask import Blueprint, request, jsonify, current_app
+from werkzeug.exceptions import HTTPException
+
+from api.decorators import token_required
+from api.extensions import db
+from api.tracing import span
+
+bp = Blueprint('batch', __name__)
+
+# Views that stream or send files, and the batch endpoint itself
+EXCLUDED_ENDPOINTS = {'batch.batch', 'classes.stream_class_events', 'jobs.get_job_result'}
+
+
+def dispatch(path, params):
+    """
+    Run a GET sub-request through its normal view. The sub-request shares this request's app
+    context, so the token decoded for the batch, the professor and the DB session are reused.
+    """
+    with current_app.test_request_context(path, method='GET', query_string=params,
+                                          headers={'x-access-token': request.headers['x-access-token']},
+                                          environ_base={'REMOTE_ADDR': request.remote_addr}):
+        try:
+            if request.endpoint in EXCLUDED_ENDPOINTS:
+                return {"status": 400, "body": {"message": f"{path} cannot be batched."}}
+            response = current_app.make_response(current_app.dispatch_request())
+        except HTTPException as e:
+            return {"status": e.code, "body": {"message": e.description}}
+        except Exception as e:
+            db.session.rollback()
+            return {"status": 500, "body": {"message": f"Failed: {str(e)}"}}
+        body = response.get_json(silent=True)
+        return {"status": response.status_code, "body": body if body is not None else response.get_data(as_text=True)}
+
+
+@bp.route('/batch', methods=['POST'])
+@token_required
+def batch(current_user):
+    """
+    Run several reads in one round trip. Body: {"requests": [{"path": "/students"},
+    {"path": "/subject/1/classes", "params": {"limit": 20}}, ...]}; only GET sub-requests are
+    supported. Responds 200 with {"responses": [{"status": ..., "body": ...}, ...]} in request order.
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get('requests')
+
+    # Validate input
+    if not isinstance(items, list) or not items:
+        return jsonify({"message": "requests must be a non-empty list."}), 400
+    if len(items) > current_app.config['BATCH_MAX_REQUESTS']:
+        return jsonify({"message": f"At most {current_app.config['BATCH_MAX_REQUESTS']} requests per batch."}), 400
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str) or not item['path'].startswith('/') \
+                or item.get('method', 'GET').upper() != 'GET' or not isinstance(item.get('params') or {}, dict):
+            return jsonify({"message": "Each request needs a path starting with /, "
+                                       "GET as its method and params as an object."}), 400
+
+    responses = []
+    for item in items:
+        with span(f"batch {item['path']}", 'batch'):
+            responses.append(dispatch(item['path'], item.get('params')))
+    return jsonify({"responses": responses}), 200
@@ -0,0 +1,429 @@
+from flask import Blueprint, request, jsonify, current_app
+import datetime
+import json
+import queue
+
+from sqlalchemy.exc import IntegrityError
+
+from api import attendance_bitmap
+from api.archive import subject_classes
+from api.attendance_store import enrollment_ordinal, enrollment_ordinals, apply_bitmap_marks, group_commit_queue, \
+    stored_status
+from api.decorators import token_required, idempotent
+from api.extensions import db, class_event_broker
+from api.fields import requested_fields, fields_error, pick
+from api.inserts import insert_or_ignore
+from api.models import Student, Subject, StudentSubject, Class, Attendance, AttendanceBitmap
+from api.sharding import event_channel
+
+bp = Blueprint('classes', __name__)
+
+
+@bp.route('/classes', methods=['POST'])
+@token_required
+@idempotent
+def create_class(current_user):
+    """
+    Create a new class for a specific subject.
+    """
+    data = request.get_json()
+    subject_id = data.get('subject_id')
+
+    # Validate input
+    if not subject_id:
+        return jsonify({"message": "Subject ID is required."}), 400
+
+    # Check if the subject exists and belongs to the current professor
+    subject = Subject.query.filter_by(id=subject_id, professor_id=current_user.id).first()
+    if not subject:
+        return jsonify({"message": "Subject not found or does not belong to the current professor."}), 404
+
+    # Create a new class
+    new_class = Class(professor_id=current_user.id, subject_id=subject_id)
+    try:
+        db.session.add(new_class)
+        db.session.commit()
+        return jsonify({
+            "message": "Class created successfully!",
+            "class": {
+                "id": new_class.id,
+                "subject_id": new_class.subject_id,
+                "subject_name": subject.name,
+                "professor_id": new_class.professor_id,
+                "date": new_class.date
+            }
+        }), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"Failed to create class: {str(e)}"}), 500
+
+
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+# Longest range one schedule request may cover
+MAX_SCHEDULE_DAYS = 366
+
+
+def parse_weekday(value):
+    if isinstance(value, int) and 0 <= value < 7:
+        return value
+    if isinstance(value, str) and value[:3].lower() in WEEKDAYS:
+        return WEEKDAYS.index(value[:3].lower())
+    raise ValueError(f"Unknown weekday: {value!r}")
+
+
+@bp.route('/subject/<int:subject_id>/schedule', methods=['POST'])
+@token_required
+@idempotent
+def schedule_classes(current_user, subject_id):
+    """
+    Create a class on every matching day of a date range, in one transaction.
+    Body: {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD", "weekdays": ["mon", "wed"] or [0, 2],
+    "exclude": ["YYYY-MM-DD", ...]}. Days that already have a class are skipped, so the same
+    schedule can be posted again safely.
+    """
+    data = request.get_json() or {}
+
+    # Validate input
+    try:
+        start = datetime.date.fromisoformat(data['start'])
+        end = datetime.date.fromisoformat(data['end'])
+        weekdays = {parse_weekday(day) for day in data['weekdays']}
+        exclude = {datetime.date.fromisoformat(day) for day in data.get('exclude', [])}
+    except KeyError as e:
+        return jsonify({"message": f"{e.args[0]} is required."}), 400
+    except (TypeError, ValueError) as e:
+        return jsonify({"message": f"Invalid schedule: {e}"}), 400
+    if not weekdays or end < start or (end - start).days >= MAX_SCHEDULE_DAYS:
+        return jsonify({"message": f"Give at least one weekday and a range of at most {MAX_SCHEDULE_DAYS} days."}), 400
+
+    # Check if the subject exists and belongs to the current professor
+    subject = Subject.query.filter_by(id=subject_id, professor_id=current_user.id).first()
+    if not subject:
+        return jsonify({"message": "Subject not found or does not belong to the current professor."}), 404
+
+    days = [start + datetime.timedelta(days=offset) for offset in range((end - start).days + 1)]
+    days = [day for day in days if day.weekday() in weekdays and day not in exclude]
+    existing = {row.date for row in db.session.query(Class.date).filter(
+        Class.subject_id == subject_id, Class.professor_id == current_user.id, Class.date.between(start, end))}
+    new_days = [day for day in days if day not in existing]
+
+    try:
+        created = []
+        if new_days:
+            created = db.session.execute(
+                db.insert(Class).returning(Class.id, Class.date, sort_by_parameter_order=True),
+                [{"professor_id": current_user.id, "subject_id": subject_id, "date": day} for day in new_days]
+            ).all()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"Failed to schedule classes: {str(e)}"}), 500
+
+    # Parallel id/date lists keep a semester of classes small on the wire
+    return jsonify({
+        "message": f"Scheduled {len(created)} classes.",
+        "subject_id": subject_id,
+        "created": {"ids": [row.id for row in created], "dates": [row.date.isoformat() for row in created]},
+        "skipped": sorted(day.isoformat() for day in days if day in existing)
+    }), 201
+
+
+@bp.route('/classes/<int:class_id>/attendance', methods=['POST'])
+@token_required
+@idempotent
+def mark_attendance(current_user, class_id):
+    """
+    Mark attendance for a student in a specific class.
+    """
+    data = request.get_json()
+    student_id = data.get('student_id')
+    status = data.get('status', 'present').lower()  # Default to 'present'
+
+    # Validate input
+    if not student_id:
+        return jsonify({"message": "Student ID is required."}), 400
+
+    # Check if the class exists and belongs to the current professor
+    class_ = Class.query.filter_by(id=class_id, professor_id=current_user.id).first()
+    if not class_:
+        return jsonify({"message": "Class not found or does not belong to the current professor."}), 404
+
+    # Check if the student is associated with the subject of the class
+    student_subject = StudentSubject.query.filter_by(student_id=student_id, subject_id=class_.subject_id).first()
+    if not student_subject:
+        return jsonify({"message": "Student is not assigned to this subject."}), 400
+
+    bitmap_storage = current_app.config['ATTENDANCE_STORAGE'] == 'bitmap'
+    if bitmap_storage and status not in ('present', 'absent'):
+        return jsonify({"message": "Status must be 'present' or 'absent'."}), 400
+
+    if current_app.config['GROUP_COMMIT_ENABLED']:
+        return mark_attendance_grouped(class_, student_subject, status)
+
+    if bitmap_storage:
+        return mark_attendance_bitmap(class_, student_subject, status)
+
+    # Mark attendance; the unique (class_id, student_id) constraint turns a repeat into a no-op
+    try:
+        attendance_id = insert_or_ignore(Attendance, class_id=class_id, student_id=student_subject.student_id,
+                                         status=status)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"Failed to mark attendance: {str(e)}"}), 500
+
+    if attendance_id is None:
+        return already_marked(class_, student_subject)
+
+    class_event_broker.publish(event_channel(class_id), {"student_id": student_subject.student_id, "status": status})
+    return jsonify({"message": "Attendance marked successfully!"}), 201
+
+
+def mark_attendance_bitmap(class_, student_subject, status):
+    """
+    Bitmap storage variant of mark_attendance: flips the student's bits in the class bitmap.
+    """
+    ordinal = enrollment_ordinal(student_subject)
+    try:
+        try:
+            applied = apply_bitmap_marks(class_, [(ordinal, status)])[0]
+        except IntegrityError:
+            # Another request created the class's bitmap first; read theirs and apply to it
+            db.session.rollback()
+            applied = apply_bitmap_marks(class_, [(ordinal, status)])[0]
+        if not applied:
+            db.session.rollback()
+            return already_marked(class_, student_subject)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"Failed to mark attendance: {str(e)}"}), 500
+
+    class_event_broker.publish(event_channel(class_.id), {"student_id": student_subject.student_id, "status": status})
+    return jsonify({"message": "Attendance marked successfully!"}), 201
+
+
+def mark_attendance_grouped(class_, student_subject, status):
+    """
+    Group commit variant of mark_attendance: the mark is queued and committed together
+    with other concurrent marks, and the response is sent once that transaction commits.
+    """
+    ordinal = enrollment_ordinal(student_subject) if current_app.config['ATTENDANCE_STORAGE'] == 'bitmap' else None
+    item = (class_.id, student_subject.student_id, ordinal, status)
+
+    # End this request's read transaction so it does not hold SQLite's lock while the writer commits
+    db.session.rollback()
+    try:
+        marked = group_commit_queue().submit(item)
+    except Exception as e:
+        return jsonify({"message": f"Failed to mark attendance: {str(e)}"}), 500
+
+    if not marked:
+        return already_marked(class_, student_subject)
+    return jsonify({"message": "Attendance marked successfully!"}), 201
+
+
+def already_marked(class_, student_subject):
+    """
+    The 409 for a repeated mark, in every storage mode. It carries the stored status, so a
+    client can tell a harmless repeat from a mark that differs from what it sent.
+    """
+    return jsonify({"message": "Attendance already marked for this student in this class.",
+                    "status": stored_status(class_.id, student_subject)}), 409
+
+
+# Fields of GET /classes/<id>: the class block, then the fields of each attendance entry
+CLASS_ATTENDANCE_FIELDS = ['class', 'student_id', 'first_name', 'last_name', 'status']
+
+
+@bp.route('/classes/<int:class_id>', methods=['GET'])
+@token_required
+def get_class_attendance(current_user, class_id):
+    """
+    Get details of a class and its attendance. ?fields= picks from class (the class block) and
+    the attendance entries' student_id, first_name, last_name and status.
+    """
+    fields = requested_fields(CLASS_ATTENDANCE_FIELDS)
+    if fields is None:
+        return fields_error(CLASS_ATTENDANCE_FIELDS)
+    entry_fields = [name for name in fields if name != 'class']
+
+    # Check if the class exists and belongs to the current professor; the subject name is
+    # only joined in for the class block
+    query = db.select(Class.id, Class.subject_id, Class.professor_id, Class.date, AttendanceBitmap.present) \
+        .outerjoin(AttendanceBitmap, AttendanceBitmap.class_id == Class.id) \
+        .where(Class.id == class_id, Class.professor_id == current_user.id)
+    if 'class' in fields:
+        query = query.add_columns(Subject.name).join(Subject, Subject.id == Class.subject_id)
+    class_ = db.session.execute(query).first()
+    if not class_:
+        return jsonify({"message": "Class not found or does not belong to the current professor."}), 404
+
+    response = {}
+    if 'class' in fields:
+        response["class"] = {
+            "id": class_.id,
+            "subject_id": class_.subject_id,
+            "subject_name": class_.name,
+            "professor_id": class_.professor_id,
+            "date": class_.date
+        }
+    if not entry_fields:
+        return jsonify(response), 200
+
+    # All students in the subject of the class, in enrollment (bitmap ordinal) order, with
+    # their names and attendance row (if any) joined in when asked for
+    row_statuses = 'status' in entry_fields and class_.present is None
+    query = db.select(Student.id, *[getattr(Student, name) for name in ('first_name', 'last_name')
+                                    if name in entry_fields]) \
+        .join(StudentSubject, StudentSubject.student_id == Student.id)
+    if row_statuses:
+        query = query.add_columns(Attendance.status) \
+            .outerjoin(Attendance, (Attendance.class_id == class_id) & (Attendance.student_id == Student.id))
+    rows = db.session.execute(
+        query.where(StudentSubject.subject_id == class_.subject_id).order_by(StudentSubject.id)
+    ).all()
+
+    # Build attendance data
+    if row_statuses:
+        statuses = [row.status or "absent" for row in rows]
+    elif class_.present is not None:
+        present = attendance_bitmap.from_bytes(class_.present)
+        statuses = ["present" if attendance_bitmap.has_bit(present, ordinal) else "absent"
+                    for ordinal in range(len(rows))]
+    else:
+        statuses = [None] * len(rows)
+
+    attendance_data = []
+    for row, status in zip(rows, statuses):
+        entry = dict(row._asdict(), student_id=row.id, status=status)
+        attendance_data.append(pick(entry, entry_fields))
+    response["attendance"] = attendance_data
+    return jsonify(response), 200
+
+
+@bp.route('/classes/<int:class_id>/events', methods=['GET'])
+@token_required
+def stream_class_events(current_user, class_id):
+    """
+    Server-Sent Events stream of attendance marks for a class, pushed as they are committed.
+    Each event is `event: attendance` with data {"student_id": ..., "status": ...}.
+    """
+    class_ = Class.query.filter_by(id=class_id, professor_id=current_user.id).first()
+    if not class_:
+        return jsonify({"message": "Class not found or does not belong to the current professor."}), 404
+
+    channel = event_channel(class_id)
+    events = class_event_broker.subscribe(channel)
+
+    def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = events.get(timeout=15)
+                except queue.Empty:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: attendance\ndata: {json.dumps(event)}\n\n"
+        finally:
+            class_event_broker.unsubscribe(channel, events)
+
+    return current_app.response_class(stream(), mimetype='text/event-stream',
+                              headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+MAX_CLASSES_LIMIT = 1000
+
+# Fields of GET /subject/<id>/classes, and their columns
+CLASS_COLUMNS = {'id': Class.id, 'date': Class.date}
+
+
+@bp.route('/subject/<int:subject_id>/classes', methods=['GET'])
+@token_required
+def get_classes_for_subject(current_user, subject_id):
+    """
+    Classes of a subject, newest first. Optional query parameters: from and to (YYYY-MM-DD,
+    inclusive), limit (1..1000) and fields (id, date); has_more tells whether the limit cut the list short.
+    """
+    fields = requested_fields(CLASS_COLUMNS)
+    if fields is None:
+        return fields_error(CLASS_COLUMNS)
+
+    # Validate input
+    try:
+        date_from = datetime.date.fromisoformat(request.args['from']) if 'from' in request.args else None
+        date_to = datetime.date.fromisoformat(request.args['to']) if 'to' in request.args else None
+    except ValueError:
+        return jsonify({"message": "from and to must be dates (YYYY-MM-DD)."}), 400
+    limit = request.args.get('limit', type=int)
+    if limit is not None and not 1 <= limit <= MAX_CLASSES_LIMIT:
+        return jsonify({"message": f"limit must be between 1 and {MAX_CLASSES_LIMIT}."}), 400
+
+    # First, ensure the subject belongs to the logged-in professor.
+    subject = Subject.query.filter_by(id=subject_id, professor_id=current_user.id).first()
+    if not subject:
+        return jsonify({"message": "Subject not found or access denied"}), 404
+
+    # Range scan on ix_class_subject_date
+    query = db.session.query(*[CLASS_COLUMNS[name] for name in fields]) \
+        .filter(Class.subject_id == subject_id, Class.professor_id == current_user.id)
+    if date_from:
+        query = query.filter(Class.date >= date_from)
+    if date_to:
+        query = query.filter(Class.date <= date_to)
+    query = query.order_by(Class.date.desc(), Class.id.desc())
+    if limit:
+        query = query.limit(limit + 1)
+    rows = query.all()
+
+    has_more = limit is not None and len(rows) > limit
+    classes_list = [{name: value.isoformat() if name == 'date' else value for name, value in zip(fields, row)}
+                    for row in rows[:limit]]
+    return jsonify({"classes": classes_list, "has_more": has_more}), 200
+
+
+CALENDAR_FIELDS = ['date', 'classes', 'present', 'ratio']
+
+
+@bp.route('/subject/<int:subject_id>/calendar', methods=['GET'])
+@token_required
+def get_subject_calendar(current_user, subject_id):
+    """
+    Per-day class counts and attendance ratios for one month (?month=YYYY-MM, default this month).
+    Only days with classes are listed; ratio is present marks over enrolled students times classes.
+    Archived terms are included. ?fields= picks from the days' date, classes, present and ratio.
+    """
+    fields = requested_fields(CALENDAR_FIELDS)
+    if fields is None:
+        return fields_error(CALENDAR_FIELDS)
+
+    try:
+        month = datetime.datetime.strptime(request.args['month'], '%Y-%m').date() if 'month' in request.args \
+            else datetime.date.today().replace(day=1)
+    except ValueError:
+        return jsonify({"message": "month must be YYYY-MM."}), 400
+    next_month = (month + datetime.timedelta(days=32)).replace(day=1)
+
+    subject = Subject.query.filter_by(id=subject_id, professor_id=current_user.id).first()
+    if not subject:
+        return jsonify({"message": "Subject not found or access denied"}), 404
+
+    ordinals = enrollment_ordinals(subject_id)
+    classes = subject_classes(subject, ordinals, month, next_month - datetime.timedelta(days=1))
+
+    days = {}
+    for _, date, _, present, _ in classes:
+        day = days.setdefault(date, {"date": date.isoformat(), "classes": 0, "present": 0})
+        day["classes"] += 1
+        day["present"] += attendance_bitmap.popcount(present)
+    for day in days.values():
+        possible = day["classes"] * len(ordinals)
+        day["ratio"] = round(day["present"] / possible, 4) if possible else None
+
+    return jsonify({
+        "month": month.strftime('%Y-%m'),
+        "enrolled": len(ordinals),
+        "days": [pick(day, fields) for day in days.values()]
+    }), 200
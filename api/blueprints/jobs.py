@@ -0,0 +1,93 @@
+from flask import Blueprint, request, jsonify, send_file, current_app
+import json
+
+from api.decorators import token_required, idempotent
+from api.extensions import db
+from api.jobs import JOB_KINDS, PROCESS_STARTED, job_runner, job_shard
+from api.models import Job
+
+bp = Blueprint('jobs', __name__)
+
+
+def job_json(job, progress=None):
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "params": json.loads(job.params),
+        "status": job.status,
+        "progress": job.progress if progress is None else progress,
+        "message": job.message,
+        "created_at": job.created_at.isoformat(),
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "result_url": f"/jobs/{job.id}/result" if job.status == 'succeeded' else None
+    }
+
+
+@bp.route('/jobs', methods=['POST'])
+@token_required
+@idempotent
+def create_job(current_user):
+    """
+    Queue a background job. Body: {"kind": ..., "params": {...}} where kind is one of
+    subject_report ({subject_id}), attendance_export ({subject_id}), at_risk ({threshold, window})
+    or archive_term ({term_id}, see api.archive).
+    Responds 202 with the job; poll GET /jobs/<id> until it has succeeded or failed.
+    """
+    data = request.get_json() or {}
+    kind = JOB_KINDS.get(data.get('kind'))
+    params = data.get('params') or {}
+    if not kind or not isinstance(params, dict):
+        return jsonify({"message": f"kind must be one of: {', '.join(JOB_KINDS)}."}), 400
+
+    error = kind.validate(current_user.id, params)
+    if error:
+        return jsonify({"message": error}), 400
+
+    # Check if the professor already has enough work queued
+    pending = Job.query.filter(Job.professor_id == current_user.id,
+                               Job.status.in_(('queued', 'running'))).count()
+    if pending >= current_app.config['JOB_MAX_PENDING']:
+        return jsonify({"message": "Too many jobs in progress, try again when one has finished."}), 429
+
+    job = Job(professor_id=current_user.id, kind=data['kind'], params=json.dumps(params))
+    try:
+        db.session.add(job)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"Failed to create job: {str(e)}"}), 500
+
+    job_runner().submit(job_shard(), job.id)
+    return jsonify({"message": "Job queued.", "job": job_json(job)}), 202
+
+
+@bp.route('/jobs/<int:job_id>', methods=['GET'])
+@token_required
+def get_job(current_user, job_id):
+    # Progress is read before the row, so a job finishing in between is seen as finished
+    progress = job_runner().progress(job_shard(), job_id)
+    job = Job.query.filter_by(id=job_id, professor_id=current_user.id).first()
+    if not job:
+        return jsonify({"message": "Job not found or access denied"}), 404
+
+    if progress is None and job.status in ('queued', 'running') and job.created_at < PROCESS_STARTED:
+        # Check if the job was lost with the process that accepted it
+        job.status = 'failed'
+        job.message = 'Interrupted by a server restart.'
+        db.session.commit()
+    return jsonify({"job": job_json(job, progress)}), 200
+
+
+@bp.route('/jobs/<int:job_id>/result', methods=['GET'])
+@token_required
+def get_job_result(current_user, job_id):
+    job = Job.query.filter_by(id=job_id, professor_id=current_user.id).first()
+    if not job:
+        return jsonify({"message": "Job not found or access denied"}), 404
+    if job.status != 'succeeded':
+        return jsonify({"message": f"Job has no result yet (status: {job.status})."}), 409
+
+    kind = JOB_KINDS[job.kind]
+    return send_file(job.result_path, mimetype=kind.mimetype, as_attachment=True,
+                     download_name=f"{job.kind}-{job.id}.{kind.extension}")
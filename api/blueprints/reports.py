@@ -0,0 +1,52 @@
+from flask import Blueprint, request, jsonify
+
+from api.decorators import token_required
+from api.fields import (REPORT_CLASS_FIELDS, REPORT_STUDENT_FIELDS, AT_RISK_FIELDS, requested_fields,
+                        nested_fields, dotted, fields_error)
+from api.models import Subject
+
+bp = Blueprint('reports', __name__)
+
+REPORT_FIELDS = dotted({'classes': REPORT_CLASS_FIELDS, 'students': REPORT_STUDENT_FIELDS})
+
+
+@bp.route('/subject/<int:subject_id>/report', methods=['GET'])
+@token_required
+def get_subject_report(current_user, subject_id):
+    """
+    Attendance totals per class and attendance rate per student for a subject.
+    Computed on class bitsets regardless of the storage mode the classes are in.
+    ?fields= takes classes, students or their fields, e.g. students.id,students.rate.
+    """
+    fields = requested_fields(REPORT_FIELDS)
+    if fields is None:
+        return fields_error(REPORT_FIELDS)
+
+    subject = Subject.query.filter_by(id=subject_id, professor_id=current_user.id).first()
+    if not subject:
+        return jsonify({"message": "Subject not found or access denied"}), 404
+
+    from api.analytics import subject_report  # deferred: pulls in NumPy
+
+    return jsonify(subject_report(subject, nested_fields(fields, 'classes', REPORT_CLASS_FIELDS),
+                                  nested_fields(fields, 'students', REPORT_STUDENT_FIELDS))), 200
+
+
+@bp.route('/analytics/at-risk', methods=['GET'])
+@token_required
+def get_at_risk_students(current_user):
+    """
+    Students falling below the attendance threshold across all of the professor's subjects.
+    Query parameters: threshold (0..1, default 0.75), window (classes, default 5) and fields.
+    """
+    threshold = request.args.get('threshold', 0.75, type=float)
+    window = request.args.get('window', 5, type=int)
+    if not 0 <= threshold <= 1 or window < 1:
+        return jsonify({"message": "Threshold must be between 0 and 1 and window at least 1."}), 400
+    fields = requested_fields(AT_RISK_FIELDS)
+    if fields is None:
+        return fields_error(AT_RISK_FIELDS)
+
+    from api.analytics import at_risk_report  # deferred: pulls in NumPy
+
+    return jsonify(at_risk_report(current_user.id, threshold, window, fields)), 200
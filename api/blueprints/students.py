@@ -0,0 +1,146 @@
+from flask import Blueprint, request, jsonify
+
+from api.decorators import token_required, idempotent
+from api.extensions import db
+from api.fields import requested_fields, fields_error, pick
+from api.inserts import insert_or_ignore
+from api.models import Student, StudentSubject
+from api.sharding import ShardRoutingError
+from api.student_attendance import SUBJECT_ATTENDANCE_FIELDS, student_attendance
+
+bp = Blueprint('students', __name__)
+
+# Fields of GET /students, and the column each is read from
+STUDENT_COLUMNS = {
+    'id': Student.id,
+    'first_name': Student.first_name,
+    'last_name': Student.last_name,
+    'email': Student.email
+}
+
+
+@bp.route('/students', methods=['GET'])
+@token_required
+def get_students(current_user):
+    """Students of the logged-in professor. ?fields= picks a subset of id, first_name, last_name and email."""
+    fields = requested_fields(STUDENT_COLUMNS)
+    if fields is None:
+        return fields_error(STUDENT_COLUMNS)
+
+    # Fetch students for the logged-in professor as column tuples, only the columns asked for
+    students = db.session.execute(
+        db.select(*[STUDENT_COLUMNS[name] for name in fields])
+        .where(Student.professor_id == current_user.id)
+    ).all()
+
+    if not students:
+        return jsonify({'message': 'No students found.', 'students': []}), 200
+
+    student_list = [dict(zip(fields, row)) for row in students]
+
+    return jsonify({
+        'message': 'Students fetched successfully!',
+        'students': student_list
+    }), 200
+
+
+@bp.route('/students', methods=['POST'])
+@token_required
+@idempotent
+def add_student(current_user):
+    data = request.get_json()
+
+    # Validate input data
+    if not data.get('email') or not data.get('first_name') or not data.get('last_name'):
+        return jsonify({'message': 'Missing required fields.'}), 400
+
+    # Emails are unique across all professors, so an existing student makes the insert a no-op
+    try:
+        student_id = insert_or_ignore(
+            Student,
+            first_name=data['first_name'],
+            last_name=data['last_name'],
+            email=data['email'],
+            professor_id=current_user.id
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': 'Failed to add student.', 'error': str(e)}), 500
+
+    if student_id is None:
+        # The same answer whoever owns the student, so it does not reveal another professor's students
+        return jsonify({'message': 'A student with this email already exists.'}), 409
+
+    return jsonify({
+        'message': 'Student added successfully!',
+        'student': {
+            'id': student_id,
+            'first_name': data['first_name'],
+            'last_name': data['last_name'],
+            'email': data['email']
+        }
+    }), 201
+
+
+@bp.route('/assign_student', methods=['POST'])
+def assign_student():
+    data = request.get_json()
+
+    student_id = data.get('student_id')
+    subject_id = data.get('subject_id')
+
+    if not student_id or not subject_id:
+        return jsonify({"message": "Student ID and Subject ID are required."}), 400
+
+    try:
+        assignment_id = insert_or_ignore(StudentSubject, student_id=student_id, subject_id=subject_id)
+        db.session.commit()
+    except ShardRoutingError:
+        # No token to pick a shard by; answered 401 by the sharding error handler
+        raise
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"Failed to assign student to subject: {str(e)}"}), 500
+
+    if assignment_id is None:
+        return jsonify({"message": "Student is already assigned to this subject."}), 409
+    return jsonify({"message": "Student successfully assigned to subject."}), 201
+
+
+MAX_RECENT_ABSENCES = 50
+
+
+@bp.route('/students/<int:student_id>/attendance', methods=['GET'])
+@token_required
+def get_student_attendance(current_user, student_id):
+    """
+    A student's attendance in each of the professor's subjects they are enrolled in: classes,
+    attended, absences, rate and the dates of recent absences (?recent=, default 5). Archived
+    terms are included. ?fields= applies to the subjects.
+    """
+    recent = request.args.get('recent', 5, type=int)
+    if not 0 <= recent <= MAX_RECENT_ABSENCES:
+        return jsonify({"message": f"recent must be between 0 and {MAX_RECENT_ABSENCES}."}), 400
+    fields = requested_fields(SUBJECT_ATTENDANCE_FIELDS)
+    if fields is None:
+        return fields_error(SUBJECT_ATTENDANCE_FIELDS)
+
+    # Check if the student exists and belongs to the current professor
+    student = db.session.execute(
+        db.select(Student.id, Student.first_name, Student.last_name)
+        .where(Student.id == student_id, Student.professor_id == current_user.id)
+    ).first()
+    if not student:
+        return jsonify({"message": "Student not found or access denied"}), 404
+
+    subjects = student_attendance(student.id, current_user.id, recent, 'recent_absences' in fields)
+    classes = sum(entry["classes"] for entry in subjects)
+    attended = sum(entry["attended"] for entry in subjects)
+    return jsonify({
+        "student": student._asdict(),
+        "classes": classes,
+        "attended": attended,
+        "rate": round(attended / classes, 4) if classes else None,
+        "subjects": [pick(entry, fields) for entry in subjects]
+    }), 200
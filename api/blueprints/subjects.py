@@ -0,0 +1,87 @@
+from flask import Blueprint, request, jsonify
+
+from api.decorators import token_required, idempotent
+from api.extensions import db
+from api.fields import requested_fields, fields_error
+from api.inserts import insert_or_ignore
+from api.models import Student, Subject, StudentSubject
+
+bp = Blueprint('subjects', __name__)
+
+# Fields of GET /subjects and of the students in GET /subject/<id>/students, with their columns
+SUBJECT_COLUMNS = {'id': Subject.id, 'name': Subject.name}
+ENROLLED_COLUMNS = {'id': Student.id, 'first_name': Student.first_name, 'last_name': Student.last_name}
+
+
+@bp.route('/subjects', methods=['GET'])
+@token_required
+def get_subjects(current_user):
+    fields = requested_fields(SUBJECT_COLUMNS)
+    if fields is None:
+        return fields_error(SUBJECT_COLUMNS)
+
+    # Column tuples straight from the cursor, no ORM instances are built
+    subjects = db.session.execute(
+        db.select(*[SUBJECT_COLUMNS[name] for name in fields]).where(Subject.professor_id == current_user.id)
+    ).all()
+
+    if not subjects:
+        return jsonify({'message': 'No subjects found.', 'subjects': []}), 200
+
+    subject_list = [dict(zip(fields, row)) for row in subjects]
+
+    return jsonify({'message': 'Subjects fetched successfully!', 'subjects': subject_list}), 200
+
+
+@bp.route('/subjects', methods=['POST'])
+@token_required
+@idempotent
+def add_subject(current_user):
+    data = request.get_json()
+    subject_name = data.get('name')
+
+    if not subject_name:
+        return jsonify({'message': 'Subject name is required.'}), 400
+
+    # The unique (professor_id, name) index turns a duplicate into a no-op
+    try:
+        subject_id = insert_or_ignore(Subject, name=subject_name, professor_id=current_user.id)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': 'Failed to create subject.', 'error': str(e)}), 500
+
+    if subject_id is None:
+        existing = db.session.execute(
+            db.select(Subject.id).where(Subject.professor_id == current_user.id, Subject.name == subject_name)
+        ).scalar()
+        return jsonify({'message': 'Subject already exists.', 'subject': {'id': existing, 'name': subject_name}}), 409
+
+    return jsonify({'message': 'Subject created successfully!',
+                    'subject': {'id': subject_id, 'name': subject_name}}), 201
+
+
+@bp.route("/subject/<int:subject_id>/students", methods=["GET"])
+def get_subject_students(subject_id):
+    # ?fields= applies to the students
+    fields = requested_fields(ENROLLED_COLUMNS)
+    if fields is None:
+        return fields_error(ENROLLED_COLUMNS)
+
+    # Fetch the subject to ensure it exists
+    subject = db.session.execute(db.select(Subject.id, Subject.name).where(Subject.id == subject_id)).first()
+    if not subject:
+        return {"error": "Subject not found"}, 404
+
+    # Fetch enrolled students in one join, in enrollment order
+    rows = db.session.execute(
+        db.select(*[ENROLLED_COLUMNS[name] for name in fields])
+        .join(StudentSubject, StudentSubject.student_id == Student.id)
+        .where(StudentSubject.subject_id == subject_id)
+        .order_by(StudentSubject.id)
+    ).all()
+
+    # Build the response
+    students = [dict(zip(fields, row)) for row in rows]
+
+    return {"id": subject.id, "name": subject.name, "students": students}, 200
@@ -0,0 +1,68 @@
+from flask import Blueprint, request, jsonify
+import datetime
+
+from api.decorators import token_required, idempotent
+from api.extensions import db
+from api.fields import requested_fields, fields_error, pick
+from api.models import Term
+
+bp = Blueprint('terms', __name__)
+
+
+TERM_FIELDS = ['id', 'name', 'start', 'end', 'archived_at']
+
+
+def term_json(term):
+    return {
+        "id": term.id,
+        "name": term.name,
+        "start": term.start_date.isoformat(),
+        "end": term.end_date.isoformat(),
+        "archived_at": term.archived_at.isoformat() if term.archived_at else None
+    }
+
+
+@bp.route('/terms', methods=['GET'])
+@token_required
+def get_terms(current_user):
+    fields = requested_fields(TERM_FIELDS)
+    if fields is None:
+        return fields_error(TERM_FIELDS)
+
+    terms = Term.query.filter_by(professor_id=current_user.id).order_by(Term.start_date.desc()).all()
+    return jsonify({"terms": [pick(term_json(term), fields) for term in terms]}), 200
+
+
+@bp.route('/terms', methods=['POST'])
+@token_required
+@idempotent
+def add_term(current_user):
+    """
+    Define a term: {"name": ..., "start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}.
+    Once it has ended it can be archived with POST /jobs {"kind": "archive_term", "params": {"term_id": ...}}.
+    """
+    data = request.get_json() or {}
+
+    # Validate input
+    try:
+        start = datetime.date.fromisoformat(data['start'])
+        end = datetime.date.fromisoformat(data['end'])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"message": "start and end are required (YYYY-MM-DD)."}), 400
+    if not data.get('name') or end < start:
+        return jsonify({"message": "A name is required and end cannot be before start."}), 400
+
+    # Check if the term overlaps one the professor already has
+    overlapping = Term.query.filter(Term.professor_id == current_user.id, Term.start_date <= end,
+                                    Term.end_date >= start).first()
+    if overlapping:
+        return jsonify({"message": f"Term overlaps {overlapping.name}."}), 400
+
+    term = Term(professor_id=current_user.id, name=data['name'], start_date=start, end_date=end)
+    try:
+        db.session.add(term)
+        db.session.commit()
+        return jsonify({"message": "Term added successfully!", "term": term_json(term)}), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"Failed to add term: {str(e)}"}), 500
@@ -0,0 +1,38 @@
+"""
+In-process publish/subscribe of attendance changes, one channel per class.
+
+Every open ``GET /classes/<id>/events`` stream holds a bounded queue; publishers
+never block, a subscriber that falls that far behind simply misses events and
+is expected to re-fetch the class.
+"""
+import queue
+import threading
+
+
+class ClassEventBroker:
+    def __init__(self, max_queue=1000):
+        self.max_queue = max_queue
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, class_id):
+        events = queue.Queue(self.max_queue)
+        with self._lock:
+            self._subscribers.setdefault(class_id, set()).add(events)
+        return events
+
+    def unsubscribe(self, class_id, events):
+        with self._lock:
+            subscribers = self._subscribers.get(class_id, set())
+            subscribers.discard(events)
+            if not subscribers:
+                self._subscribers.pop(class_id, None)
+
+    def publish(self, class_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(class_id, ()))
+        for events in subscribers:
+            try:
+                events.put_nowait(event)
+            except queue.Full:
+                pass
@@ -0,0 +1,89 @@
+import json
+
+import click
+from flask.cli import with_appcontext
+
+from api.attendance_store import convert_class_to_bitmap, convert_class_to_rows
+from api.extensions import db
+from api.models import Class, AttendanceBitmap, init_db
+from api.sharding import each_shard, split_database
+from api.tracing import merge_traces
+
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Create missing tables and indexes."""
+    init_db()
+    print("Database schema is up to date.")
+
+
+@click.command('at-risk')
+@with_appcontext
+@click.option('--threshold', default=0.75, show_default=True)
+@click.option('--window', default=5, show_default=True)
+def at_risk(threshold, window):
+    """Print the at-risk list for every professor as JSON (meant for a nightly job)."""
+    from api.analytics import at_risk_report
+
+    students = []
+    for _ in each_shard():
+        students += at_risk_report(None, threshold, window)["students"]
+    print(json.dumps({"threshold": threshold, "window": window, "students": students}, indent=2))
+
+
+@click.command('attendance-to-bitmaps')
+@with_appcontext
+def attendance_to_bitmaps():
+    """Convert every class's Attendance rows into an AttendanceBitmap."""
+    converted = 0
+    for _ in each_shard():
+        classes = Class.query.all()
+        for class_ in classes:
+            convert_class_to_bitmap(class_)
+        db.session.commit()
+        converted += len(classes)
+    print(f"Converted {converted} classes to bitmap storage.")
+
+
+@click.command('attendance-to-rows')
+@with_appcontext
+def attendance_to_rows():
+    """Convert every AttendanceBitmap back into Attendance rows."""
+    converted = 0
+    for _ in each_shard():
+        classes = Class.query.join(AttendanceBitmap).all()
+        for class_ in classes:
+            convert_class_to_rows(class_)
+        db.session.commit()
+        converted += len(classes)
+    print(f"Converted {converted} classes to row storage.")
+
+
+@click.command('shard-split')
+@with_appcontext
+def shard_split():
+    """Copy the main database's per-professor rows into shards (see SHARDING_ENABLED)."""
+    try:
+        copied = split_database()
+    except FileExistsError as e:
+        raise click.ClickException(str(e))
+    for name, rows in copied.items():
+        print(f"{name}: {rows} rows")
+    print(f"Split into {len(copied)} shards. Set SHARDING_ENABLED=1 to serve from them.")
+
+
+@click.command('trace-merge')
+@click.argument('output', type=click.Path(dir_okay=False))
+@click.argument('traces', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+def trace_merge(output, traces):
+    """Merge client and server trace files of one trace id into a single file for the trace viewer."""
+    events = merge_traces(traces)
+    with open(output, 'w') as out:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, out)
+    print(f"Wrote {len(events)} events to {output}.")
+
+
+def register_commands(app):
+    for command in (init_db_command, at_risk, attendance_to_bitmaps, attendance_to_rows, shard_split, trace_merge):
+        app.cli.add_command(command)
@@ -0,0 +1,96 @@
+"""
+Negotiated response compression.
+
+Text and JSON responses are encoded with the best of br and gzip the client accepts
+(Accept-Encoding, honouring q-values). brotli is optional: without the package only
+gzip is offered. Bodies under COMPRESSION_MIN_SIZE are left alone, since a small
+response gains less than the encoding costs.
+
+Streamed responses (the class event stream, job result files) are compressed chunk by
+chunk and flushed after every chunk, so each event still reaches the client as soon as
+it is produced. Their size is not known up front, so the threshold does not apply.
+"""
+import zlib
+
+from flask import current_app, request
+
+from api.tracing import span
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+
+def gzip_stream(level):
+    """(compress, flush, finish) of a gzip stream."""
+    stream = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return stream.compress, lambda: stream.flush(zlib.Z_SYNC_FLUSH), stream.flush
+
+
+def brotli_stream(quality):
+    stream = brotli.Compressor(quality=quality)
+    return stream.process, stream.flush, stream.finish
+
+
+def encoder(encoding):
+    if encoding == 'br':
+        return brotli_stream(current_app.config['COMPRESSION_BROTLI_QUALITY'])
+    return gzip_stream(current_app.config['COMPRESSION_GZIP_LEVEL'])
+
+
+def accepted_encoding():
+    offers = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(offers)
+
+
+def compress_chunks(source, chunks, stream):
+    # Runs after the request has ended, so the encoder is made beforehand
+    compress, flush, finish = stream
+    try:
+        for chunk in chunks:
+            if chunk:
+                yield compress(chunk) + flush()
+        yield finish()
+    finally:
+        # Closing the original iterable runs its cleanup, e.g. the event stream's unsubscribe
+        close = getattr(source, 'close', None)
+        if close is not None:
+            close()
+
+
+def compress_response(response):
+    config = current_app.config
+    if response.mimetype not in config['COMPRESSION_MIMETYPES'] or 'Content-Encoding' in response.headers \
+            or response.status_code < 200 or response.status_code in (204, 206, 304):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = accepted_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed or response.direct_passthrough:
+        source = response.response
+        response.response = compress_chunks(source, response.iter_encoded(), encoder(encoding))
+        response.direct_passthrough = False
+        response.headers.pop('Content-Length', None)
+        response.headers.pop('Accept-Ranges', None)
+    else:
+        data = response.get_data()
+        if len(data) < config['COMPRESSION_MIN_SIZE']:
+            return response
+        with span('compress', 'compression', encoding=encoding, size=len(data)):
+            compress, _, finish = encoder(encoding)
+            response.set_data(compress(data) + finish())
+
+    response.headers['Content-Encoding'] = encoding
+    # The encoded body is a different byte sequence, so a strong ETag becomes weak
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_app(app):
+    if app.config['COMPRESSION_ENABLED']:
+        app.after_request(compress_response)
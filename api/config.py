@@ -0,0 +1,67 @@
+import datetime
+import os
+
+
+class Config:
+    SECRET_KEY = 'your_secret_key'
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///attendance.db')
+    # Closed terms are moved into a separate archive database (see api.archive), by default next to the main one
+    SQLALCHEMY_BINDS = {
+        'archive': os.environ.get('ARCHIVE_DATABASE_URL', os.path.splitext(SQLALCHEMY_DATABASE_URI)[0] + '_archive.db')
+    }
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # 'rows' keeps one Attendance row per student, 'bitmap' keeps one AttendanceBitmap per class
+    ATTENDANCE_STORAGE = os.environ.get('ATTENDANCE_STORAGE', 'rows')
+    # How long a stored Idempotency-Key response is replayed for
+    IDEMPOTENCY_TTL = datetime.timedelta(hours=24)
+    # A key still reserved this long after its request started is taken to be abandoned (e.g. a crashed worker)
+    IDEMPOTENCY_PENDING_TTL = datetime.timedelta(minutes=5)
+    # Group commit: queue attendance writes and commit them in batches of up to MAX_BATCH every MAX_DELAY_MS
+    GROUP_COMMIT_ENABLED = os.environ.get('GROUP_COMMIT_ENABLED', '0') == '1'
+    GROUP_COMMIT_MAX_BATCH = 200
+    GROUP_COMMIT_MAX_DELAY_MS = 5
+    # Sharding: professors stay in the main database, their other rows go to a SQLite file per
+    # professor under SHARD_DIR (relative to the instance folder), or to SHARD_BUCKETS files when set
+    SHARDING_ENABLED = os.environ.get('SHARDING_ENABLED', '0') == '1'
+    SHARD_DIR = os.environ.get('SHARD_DIR', 'shards')
+    SHARD_BUCKETS = int(os.environ.get('SHARD_BUCKETS', '0'))
+    # Background jobs: at most JOB_WORKERS run at once so reports cannot take over the process, and a
+    # professor can have at most JOB_MAX_PENDING queued or running. Results go under the instance folder.
+    JOB_WORKERS = 2
+    JOB_MAX_PENDING = 5
+    JOB_RESULTS_DIR = 'job_results'
+    # Rate limiting (see api.rate_limit): per-client token buckets as (tokens per second, burst),
+    # and a gate of GATE_MAX_INFLIGHT concurrent requests of which reads may use GATE_READ_SHARE
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', '1') == '1'
+    RATE_LIMITS = {
+        'login': (0.5, 10),
+        'attendance': (50, 200),
+        'read': (10, 40),
+        'write': (5, 30),
+    }
+    GATE_MAX_INFLIGHT = 32
+    GATE_READ_SHARE = 0.5
+    # Login sessions: short-lived access tokens (JWT, x-access-token) renewed with POST /token/refresh,
+    # whose refresh tokens last REFRESH_TOKEN_TTL, so a full login is needed about once a month
+    ACCESS_TOKEN_TTL = datetime.timedelta(hours=1)
+    REFRESH_TOKEN_TTL = datetime.timedelta(days=30)
+    # Password hashing (see api.passwords): werkzeug method string for new hashes, including its cost; hashes
+    # made another way are replaced on the next login. PASSWORD_WORKERS threads hash, and at most
+    # PASSWORD_MAX_PENDING logins wait for one before login answers 503.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_WORKERS = int(os.environ.get('PASSWORD_WORKERS', '2'))
+    PASSWORD_MAX_PENDING = 16
+    # Sub-requests accepted by one POST /batch
+    BATCH_MAX_REQUESTS = 20
+    # Tracing (see api.tracing): requests with an X-Trace-Id header, plus TRACE_SAMPLE_RATE of the rest,
+    # are written as Chrome trace files under TRACE_DIR in the instance folder
+    TRACING_ENABLED = os.environ.get('TRACING_ENABLED', '0') == '1'
+    TRACE_SAMPLE_RATE = float(os.environ.get('TRACE_SAMPLE_RATE', '0'))
+    TRACE_DIR = 'traces'
+    # Response compression (see api.compression): text and JSON bodies of at least COMPRESSION_MIN_SIZE bytes
+    # are sent gzip or, when the brotli package is installed, br encoded to clients that accept it
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', '1') == '1'
+    COMPRESSION_MIN_SIZE = 1024
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', '6'))
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '4'))
+    COMPRESSION_MIMETYPES = {'application/json', 'text/csv', 'text/event-stream', 'text/plain', 'text/html'}
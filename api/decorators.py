@@ -0,0 +1,106 @@
+from flask import request, jsonify, current_app
+import datetime
+import hashlib
+from functools import wraps
+
+from api.extensions import db
+from api.inserts import insert_or_ignore
+from api.models import Professor, IdempotencyKey
+from api.rate_limit import too_many
+from api.tokens import token_professor_id
+from api.tracing import span
+
+
+# Token decorator
+def token_required(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        token = request.headers.get('x-access-token')
+        if not token:
+            return jsonify({'message': 'Token is missing!'}), 401
+        with span('token_required'):
+            professor_id = token_professor_id()
+            # session.get serves batched sub-requests from the identity map instead of querying again
+            current_user = db.session.get(Professor, professor_id) if professor_id is not None else None
+        if not current_user:
+            return jsonify({'message': 'Token is invalid!'}), 401
+        with span(request.endpoint, 'handler'):
+            return f(current_user, *args, **kwargs)
+
+    return decorated
+
+# Idempotency decorator, goes below token_required
+def idempotent(f):
+    """
+    Replay the stored response when a request repeats an Idempotency-Key.
+    The key is reserved before the handler runs, so a retry that arrives while the first
+    request is still running gets a 409 instead of running the handler again. A key reused
+    for a different path or body is rejected. Only successful responses are stored, so a
+    request that failed validation or hit a server error can be corrected and retried with
+    the same key.
+    """
+    @wraps(f)
+    def decorated(current_user, *args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if not key:
+            return f(current_user, *args, **kwargs)
+        if len(key) > 100:
+            return jsonify({'message': 'Idempotency-Key must be at most 100 characters.'}), 400
+
+        request_hash = hashlib.sha256(request.get_data()).hexdigest()
+        now = datetime.datetime.utcnow()
+        try:
+            # Expired keys and abandoned reservations are purged on write, which keeps the table bounded by the TTL
+            IdempotencyKey.query.filter(db.or_(
+                IdempotencyKey.created_at < now - current_app.config['IDEMPOTENCY_TTL'],
+                db.and_(IdempotencyKey.status_code.is_(None),
+                        IdempotencyKey.created_at < now - current_app.config['IDEMPOTENCY_PENDING_TTL'])
+            )).delete()
+            # The unique (professor_id, key) constraint lets exactly one of several concurrent requests reserve the key
+            reservation = insert_or_ignore(IdempotencyKey, professor_id=current_user.id, key=key,
+                                           request_path=request.path, request_hash=request_hash, created_at=now)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'message': f'Failed to reserve Idempotency-Key: {str(e)}'}), 500
+
+        if reservation is None:
+            stored = IdempotencyKey.query.filter_by(professor_id=current_user.id, key=key).first()
+            if stored and (stored.request_path != request.path or stored.request_hash != request_hash):
+                return jsonify({'message': 'Idempotency-Key was already used for a different request.'}), 422
+            if stored is None or stored.status_code is None:
+                # Still running, or it just failed and released the key; either way a retry is safe
+                return too_many('A request with this Idempotency-Key is still in progress.', 409, 1)
+            response = current_app.response_class(stored.response, status=stored.status_code, mimetype='application/json')
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+
+        try:
+            response = current_app.make_response(f(current_user, *args, **kwargs))
+        except Exception:
+            db.session.rollback()
+            release_idempotency_key(reservation)
+            raise
+        if not 200 <= response.status_code < 300:
+            release_idempotency_key(reservation)
+            return response
+
+        try:
+            db.session.execute(db.update(IdempotencyKey).where(IdempotencyKey.id == reservation)
+                               .values(status_code=response.status_code, response=response.get_data(as_text=True)))
+            db.session.commit()
+        except Exception:
+            # The key stays reserved until IDEMPOTENCY_PENDING_TTL; the request itself succeeded
+            db.session.rollback()
+        return response
+
+    return decorated
+
+
+def release_idempotency_key(reservation):
+    """Drop a reservation whose request did not succeed, so the key can be retried."""
+    try:
+        IdempotencyKey.query.filter_by(id=reservation).delete()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
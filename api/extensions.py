@@ -0,0 +1,7 @@
+from flask_sqlalchemy import SQLAlchemy
+
+from api.class_events import ClassEventBroker
+from api.sharding import ShardedSession
+
+db = SQLAlchemy(session_options={'class_': ShardedSession})
+class_event_broker = ClassEventBroker()
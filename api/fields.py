@@ -0,0 +1,48 @@
+"""
+Sparse fieldsets: list and report endpoints accept ?fields=a,b to return only some fields of
+each item, and select only the columns those fields need. Reports with several lists name
+fields as list.field (students.rate), or a bare list name for all of its fields.
+"""
+from flask import request, jsonify
+
+# Fields of the computed reports (api.analytics), kept here so views can validate ?fields=
+# without importing NumPy
+REPORT_CLASS_FIELDS = ['id', 'date', 'present', 'total', 'archived']
+REPORT_STUDENT_FIELDS = ['id', 'first_name', 'last_name', 'attended', 'rate']
+AT_RISK_FIELDS = ['student_id', 'first_name', 'last_name', 'subject_id', 'subject_name', 'professor_id',
+                  'classes', 'attended', 'rate', 'recent_rate']
+
+
+def requested_fields(available):
+    """
+    Fields named in ?fields=, in the order of `available`, or all of `available` when the parameter is
+    absent. None when it is empty or names a field that is not available.
+    """
+    raw = request.args.get('fields')
+    if raw is None:
+        return list(available)
+    names = {name.strip() for name in raw.split(',') if name.strip()}
+    if not names or not names <= set(available):
+        return None
+    return [name for name in available if name in names]
+
+
+def nested_fields(fields, section, item_fields):
+    """Item fields of `section` in a dotted fieldset: all of them for a bare section name, [] when not named."""
+    if section in fields:
+        return list(item_fields)
+    return [name for name in item_fields if f'{section}.{name}' in fields]
+
+
+def dotted(sections):
+    """The available names for {section: item fields}: each section, then each section.field."""
+    return [name for section, item_fields in sections.items()
+            for name in [section] + [f'{section}.{field}' for field in item_fields]]
+
+
+def pick(item, fields):
+    return {name: item[name] for name in fields}
+
+
+def fields_error(available):
+    return jsonify({"message": f"fields must be a comma-separated list of: {', '.join(available)}."}), 400
@@ -0,0 +1,60 @@
+"""
+Write-behind queue that groups many small writes into shared transactions.
+
+Request threads call ``submit`` and block until the batch holding their item has
+been committed, so a response is only sent once the write is durable. A single
+writer thread drains the queue every ``max_delay`` seconds or whenever
+``max_batch`` items are waiting, whichever comes first.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class GroupCommitQueue:
+    def __init__(self, app, flush, max_batch=200, max_delay=0.005):
+        """
+        ``flush(items)`` runs inside an app context on the writer thread, must commit,
+        and returns one result per item in the same order.
+        """
+        self.app = app
+        self.flush = flush
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='group-commit', daemon=True)
+        self._thread.start()
+
+    def submit(self, item, timeout=30):
+        """Enqueue ``item`` and wait for its result once its batch has committed."""
+        future = Future()
+        self._queue.put((item, future))
+        return future.result(timeout)
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            try:
+                with self.app.app_context():
+                    results = self.flush(items)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
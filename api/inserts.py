@@ -0,0 +1,31 @@
+"""
+Single-statement inserts that let a unique constraint settle duplicates.
+
+A SELECT-then-INSERT check costs an extra round trip and still races: two requests
+can both find no row, and the second INSERT then fails on the constraint. An
+INSERT ... ON CONFLICT DO NOTHING RETURNING id does both in one statement, and
+exactly one of the racing requests gets the id back. Databases without ON CONFLICT
+support fall back to an INSERT in a savepoint that a unique violation rolls back.
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from api.extensions import db
+
+DIALECT_INSERTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+
+def insert_or_ignore(model, **values):
+    """Insert a row, returning its id, or None when a unique constraint already holds a matching row."""
+    dialect = db.session.get_bind(mapper=sa.inspect(model)).dialect.name
+    if dialect not in DIALECT_INSERTS:
+        row = model(**values)
+        try:
+            with db.session.begin_nested():
+                db.session.add(row)
+        except IntegrityError:
+            return None
+        return row.id
+    statement = DIALECT_INSERTS[dialect](model).values(**values).on_conflict_do_nothing().returning(model.id)
+    return db.session.execute(statement).scalar()
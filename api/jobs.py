@@ -0,0 +1,205 @@
+"""
+Background jobs for reports and exports that take too long for a request.
+
+POST /jobs stores a Job row and hands its id to the app's JobRunner. The runner is a
+small thread pool (JOB_WORKERS), so heavy work never holds a request thread and only
+a bounded number of jobs compete with interactive requests. A running job reports
+progress in memory rather than by writing its row, so it adds no SQLite writes until
+it finishes. The output is written to a result file under the instance folder.
+"""
+import collections
+import contextlib
+import csv
+import datetime
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+from api import attendance_bitmap
+from api.archive import archived_classes, archive_term
+from api.attendance_store import enrollment_ordinals, class_bitsets
+from api.extensions import db
+from api.models import Student, Subject, Class, Job, Term
+from api.sharding import current_shard, use_shard
+
+_runner_lock = threading.Lock()
+
+# Jobs still pending from before this process started were lost with the previous process
+PROCESS_STARTED = datetime.datetime.utcnow()
+
+# Classes read per step of an export; also the granularity of its progress
+EXPORT_CHUNK = 50
+
+JobKind = collections.namedtuple('JobKind', 'extension mimetype validate run')
+
+
+def validate_subject(professor_id, params):
+    subject_id = params.get('subject_id')
+    if not isinstance(subject_id, int):
+        return "subject_id is required."
+    if not Subject.query.filter_by(id=subject_id, professor_id=professor_id).first():
+        return "Subject not found or access denied"
+    return None
+
+
+def validate_at_risk(professor_id, params):
+    threshold = params.setdefault('threshold', 0.75)
+    window = params.setdefault('window', 5)
+    if not isinstance(threshold, (int, float)) or not 0 <= threshold <= 1 \
+            or not isinstance(window, int) or window < 1:
+        return "Threshold must be between 0 and 1 and window at least 1."
+    return None
+
+
+def validate_term(professor_id, params):
+    term_id = params.get('term_id')
+    if not isinstance(term_id, int):
+        return "term_id is required."
+    term = Term.query.filter_by(id=term_id, professor_id=professor_id).first()
+    if not term:
+        return "Term not found or access denied"
+    if term.end_date >= datetime.date.today():
+        return "Only terms that have ended can be archived."
+    return None
+
+
+def run_subject_report(job, params, out, progress):
+    from api.analytics import subject_report
+
+    json.dump(subject_report(db.session.get(Subject, params['subject_id'])), out)
+
+
+def run_at_risk(job, params, out, progress):
+    from api.analytics import at_risk_report
+
+    json.dump(at_risk_report(job.professor_id, params['threshold'], params['window']), out)
+
+
+def run_archive_term(job, params, out, progress):
+    json.dump(archive_term(db.session.get(Term, params['term_id']), progress), out)
+
+
+def run_attendance_export(job, params, out, progress):
+    """Every attendance mark of a subject as CSV, one row per class and enrolled student."""
+    subject_id = params['subject_id']
+    live = db.session.query(Class.id, Class.date) \
+        .filter_by(subject_id=subject_id, professor_id=job.professor_id) \
+        .order_by(Class.date, Class.id).all()
+    archived = archived_classes(subject_id, job.professor_id)
+    ordinals = enrollment_ordinals(subject_id)
+    names = {row.id: row for row in db.session.query(Student.id, Student.first_name, Student.last_name)
+             .filter(Student.id.in_(ordinals))}
+    total = len(live) + len(archived)
+
+    writer = csv.writer(out)
+    writer.writerow(['date', 'class_id', 'student_id', 'first_name', 'last_name', 'status'])
+
+    def write_class(class_id, date, marked, present):
+        for ordinal, student_id in enumerate(ordinals):
+            if not attendance_bitmap.has_bit(marked, ordinal):
+                status = ''
+            elif attendance_bitmap.has_bit(present, ordinal):
+                status = 'present'
+            else:
+                status = 'absent'
+            writer.writerow([date.isoformat(), class_id, student_id, names[student_id].first_name,
+                             names[student_id].last_name, status])
+
+    # Archived terms are closed, so their classes come first
+    for done, entry in enumerate(archived, 1):
+        write_class(*entry)
+        if done % EXPORT_CHUNK == 0:
+            progress(done / total)
+    for start in range(0, len(live), EXPORT_CHUNK):
+        chunk = live[start:start + EXPORT_CHUNK]
+        bitsets = class_bitsets([class_id for class_id, _ in chunk], ordinals)
+        for class_id, date in chunk:
+            write_class(class_id, date, *bitsets[class_id])
+        progress((len(archived) + start + len(chunk)) / total)
+
+
+JOB_KINDS = {
+    'subject_report': JobKind('json', 'application/json', validate_subject, run_subject_report),
+    'attendance_export': JobKind('csv', 'text/csv', validate_subject, run_attendance_export),
+    'at_risk': JobKind('json', 'application/json', validate_at_risk, run_at_risk),
+    'archive_term': JobKind('json', 'application/json', validate_term, run_archive_term),
+}
+
+
+def result_path(shard, job):
+    directory = os.path.join(current_app.instance_path, current_app.config['JOB_RESULTS_DIR'], shard or 'main')
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f'{job.id}.{JOB_KINDS[job.kind].extension}')
+
+
+def run_job(shard, job_id, progress):
+    job = db.session.get(Job, job_id)
+    job.status = 'running'
+    job.started_at = datetime.datetime.utcnow()
+    db.session.commit()
+
+    path = result_path(shard, job)
+    try:
+        with open(path + '.part', 'w', newline='') as out:
+            JOB_KINDS[job.kind].run(job, json.loads(job.params), out, progress)
+        os.replace(path + '.part', path)
+    except Exception as e:
+        db.session.rollback()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path + '.part')
+        job.status = 'failed'
+        job.message = str(e)[:200]
+    else:
+        job.status = 'succeeded'
+        job.progress = 1.0
+        job.result_path = path
+    job.finished_at = datetime.datetime.utcnow()
+    db.session.commit()
+
+
+class JobRunner:
+    def __init__(self, app, max_workers):
+        self.app = app
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._progress = {}  # (shard, job id) -> fraction done, for jobs queued or running here
+        self._lock = threading.Lock()
+
+    def submit(self, shard, job_id):
+        with self._lock:
+            self._progress[(shard, job_id)] = 0.0
+        self._executor.submit(self._run, shard, job_id)
+
+    def progress(self, shard, job_id):
+        """Fraction done, or None when this process is not running the job."""
+        with self._lock:
+            return self._progress.get((shard, job_id))
+
+    def _run(self, shard, job_id):
+        key = (shard, job_id)
+
+        def report(fraction):
+            with self._lock:
+                self._progress[key] = fraction
+
+        try:
+            with self.app.app_context(), use_shard(shard) if shard else contextlib.nullcontext():
+                run_job(shard, job_id, report)
+        finally:
+            with self._lock:
+                del self._progress[key]
+
+
+def job_runner():
+    """The app's JobRunner, started on first use."""
+    app = current_app._get_current_object()
+    with _runner_lock:
+        if 'jobs' not in app.extensions:
+            app.extensions['jobs'] = JobRunner(app, app.config['JOB_WORKERS'])
+        return app.extensions['jobs']
+
+
+def job_shard():
+    return current_shard() if current_app.config['SHARDING_ENABLED'] else None
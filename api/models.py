@@ -0,0 +1,158 @@
+import datetime
+
+from api.extensions import db
+
+
+# Models
+
+# Professor
+class Professor(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(100), unique=True, nullable=False)
+    password = db.Column(db.String(255), nullable=False)
+
+
+# Refresh token of a login session. Only the SHA-256 of the token is stored; each one is used once
+# (see auth.refresh_token). Kept in the main database with Professor, since refreshing carries no
+# access token to pick a shard by.
+class RefreshToken(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    professor_id = db.Column(db.Integer, db.ForeignKey('professor.id'), nullable=False, index=True)
+    token_hash = db.Column(db.String(64), nullable=False, unique=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+
+class Student(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    first_name = db.Column(db.String(100), nullable=False)
+    last_name = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(100), unique=True, nullable=False)
+    professor_id = db.Column(db.Integer, db.ForeignKey('professor.id'), nullable=False)
+    professor = db.relationship('Professor', backref='students')
+
+
+class Subject(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    professor_id = db.Column(db.Integer, db.ForeignKey('professor.id'), nullable=False)
+    professor = db.relationship('Professor', backref='subjects')
+
+    # A professor's subject names are unique; add_subject relies on it to reject duplicates
+    __table_args__ = (db.Index('ux_subject_professor_name', 'professor_id', 'name', unique=True),)
+
+
+class StudentSubject(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
+    subject_id = db.Column(db.Integer, db.ForeignKey('subject.id'), nullable=False)
+    student = db.relationship('Student', backref='student_subjects')
+    subject = db.relationship('Subject', backref='student_subjects')
+    __table_args__ = (db.UniqueConstraint('student_id', 'subject_id', name='unique_student_subject'),)
+
+
+class Class(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    professor_id = db.Column(db.Integer, db.ForeignKey('professor.id'), nullable=False)
+    subject_id = db.Column(db.Integer, db.ForeignKey('subject.id'), nullable=False)
+    date = db.Column(db.Date, nullable=False, default=datetime.date.today)
+
+    professor = db.relationship('Professor', backref='classes')
+    subject = db.relationship('Subject', backref='classes')
+
+    # Serves a subject's classes by date range, newest first
+    __table_args__ = (db.Index('ix_class_subject_date', 'subject_id', 'date'),)
+
+
+class Attendance(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    class_id = db.Column(db.Integer, db.ForeignKey('class.id'), nullable=False)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
+    status = db.Column(db.String(10), nullable=False, default='present')  # e.g., 'present', 'absent'
+
+    class_ = db.relationship('Class', backref='attendances')
+    student = db.relationship('Student', backref='attendances')
+
+    __table_args__ = (db.UniqueConstraint('class_id', 'student_id', name='unique_attendance'),)
+
+# Compact attendance: one row per class, bits indexed by enrollment ordinal (see attendance_bitmap)
+class AttendanceBitmap(db.Model):
+    class_id = db.Column(db.Integer, db.ForeignKey('class.id'), primary_key=True)
+    size = db.Column(db.Integer, nullable=False, default=0)  # number of ordinals covered
+    marked = db.Column(db.LargeBinary, nullable=False, default=b'')  # attendance recorded at all
+    present = db.Column(db.LargeBinary, nullable=False, default=b'')  # subset of marked that was present
+
+    class_ = db.relationship('Class', backref=db.backref('bitmap', uselist=False))
+
+# Responses stored per Idempotency-Key so retried POSTs are replayed instead of re-executed.
+# The key is reserved before the request runs; status_code and response stay NULL until it finishes
+class IdempotencyKey(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    professor_id = db.Column(db.Integer, db.ForeignKey('professor.id'), nullable=False)
+    key = db.Column(db.String(100), nullable=False)
+    request_path = db.Column(db.String(200), nullable=False)
+    request_hash = db.Column(db.String(64), nullable=False)  # sha256 of the request body
+    status_code = db.Column(db.Integer)
+    response = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow, index=True)
+
+    __table_args__ = (db.UniqueConstraint('professor_id', 'key', name='unique_idempotency_key'),)
+
+# Background job (see api.jobs); progress of a running job is kept in memory, not in this row
+class Job(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    professor_id = db.Column(db.Integer, db.ForeignKey('professor.id'), nullable=False, index=True)
+    kind = db.Column(db.String(50), nullable=False)
+    params = db.Column(db.Text, nullable=False, default='{}')  # JSON
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, succeeded, failed
+    progress = db.Column(db.Float, nullable=False, default=0.0)
+    message = db.Column(db.String(200))
+    result_path = db.Column(db.String(300))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+# A professor's teaching term; classes belong to it by date. Closed terms can be archived (see api.archive).
+class Term(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    professor_id = db.Column(db.Integer, db.ForeignKey('professor.id'), nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False)
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date, nullable=False)
+    archived_at = db.Column(db.DateTime)
+
+
+# One subject's classes of an archived term, packed and zlib-compressed (see api.archive).
+# Lives in the archive database, so there are no foreign keys into the main one.
+class ArchivedSubjectTerm(db.Model):
+    __bind_key__ = 'archive'
+    professor_id = db.Column(db.Integer, primary_key=True)
+    term_id = db.Column(db.Integer, primary_key=True)
+    subject_id = db.Column(db.Integer, primary_key=True)
+    start_date = db.Column(db.Date, nullable=False)  # first and last class date in the block
+    end_date = db.Column(db.Date, nullable=False)
+    size = db.Column(db.Integer, nullable=False)  # enrollment ordinals per class bitmap
+    classes = db.Column(db.Integer, nullable=False)
+    class_ids = db.Column(db.LargeBinary, nullable=False)
+    dates = db.Column(db.LargeBinary, nullable=False)
+    marked = db.Column(db.LargeBinary, nullable=False)
+    present = db.Column(db.LargeBinary, nullable=False)
+
+    __table_args__ = (db.Index('ix_archived_subject_dates', 'professor_id', 'subject_id', 'end_date'),)
+
+
+def create_schema(bind, tables=None, metadata=None):
+    """Create missing tables, and missing indexes on tables that already existed."""
+    metadata = metadata or db.metadata
+    metadata.create_all(bind, tables=tables)
+    # create_all skips existing tables entirely, so indexes added to a model later are created here
+    for table in tables or metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind, checkfirst=True)
+
+
+def init_db():
+    """Create missing tables and indexes. Run once per deploy (`flask init-db`), not on every start."""
+    create_schema(db.engine)
+    create_schema(db.engines['archive'], metadata=db.metadatas['archive'])
@@ -0,0 +1,98 @@
+"""
+Password hashing.
+
+New hashes use PASSWORD_HASH_METHOD, a werkzeug method string with its cost
+parameters (scrypt:N:r:p or pbkdf2:sha256:iterations). A stored hash made with any
+other method, such as the salted sha256 hashes of older accounts, is verified as it
+is and replaced with a new hash on the next successful login. Werkzeug 3 can no
+longer check those plain digests, so they are checked here.
+
+Hashing is deliberately slow, so it runs on a pool of PASSWORD_WORKERS threads,
+which caps the cores a burst of logins can take (hashlib releases the GIL, so the
+workers do run in parallel). At most PASSWORD_MAX_PENDING hashes wait for a worker;
+past that, login and register answer 503 rather than queueing while attendance
+requests wait for CPU.
+"""
+import hashlib
+import hmac
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from api.rate_limit import too_many
+
+_pool_lock = threading.Lock()
+
+
+class PasswordPoolBusy(RuntimeError):
+    """Every worker is busy and the queue is full."""
+
+
+class PasswordPool:
+    def __init__(self, workers, max_pending):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password')
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+
+    def run(self, fn, *args):
+        """Run fn(*args) on a worker and wait for its result. Raises PasswordPoolBusy when full."""
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolBusy('Too many logins in progress.')
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+
+def password_pool():
+    """The app's PasswordPool, started on first use."""
+    app = current_app._get_current_object()
+    with _pool_lock:
+        if 'passwords' not in app.extensions:
+            app.extensions['passwords'] = PasswordPool(app.config['PASSWORD_WORKERS'],
+                                                       app.config['PASSWORD_MAX_PENDING'])
+        return app.extensions['passwords']
+
+
+def needs_rehash(stored, method):
+    return stored.split('$', 1)[0] != method
+
+
+def check_hash(stored, password):
+    algorithm, _, rest = stored.partition('$')
+    if algorithm not in hashlib.algorithms_available:
+        return check_password_hash(stored, password)
+    # Legacy werkzeug format: algorithm$salt$hmac(salt, password) hex digest
+    salt, _, digest = rest.partition('$')
+    return hmac.compare_digest(hmac.new(salt.encode(), password.encode(), algorithm).hexdigest(), digest)
+
+
+def _verify(stored, password, method):
+    if not check_hash(stored, password):
+        return False, None
+    return True, generate_password_hash(password, method=method) if needs_rehash(stored, method) else None
+
+
+def hash_password(password):
+    method = current_app.config['PASSWORD_HASH_METHOD']
+    return password_pool().run(generate_password_hash, password, method)
+
+
+def verify_password(stored, password):
+    """
+    (matches, new hash). The new hash is set when the password matches but `stored` was made
+    with another method than PASSWORD_HASH_METHOD; store it in place of the old one.
+    """
+    return password_pool().run(_verify, stored, password, current_app.config['PASSWORD_HASH_METHOD'])
+
+
+def password_pool_busy(e):
+    return too_many('Server is busy, try again shortly.', 503, 1)
+
+
+def init_app(app):
+    app.register_error_handler(PasswordPoolBusy, password_pool_busy)
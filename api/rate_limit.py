@@ -0,0 +1,153 @@
+"""
+Rate limiting and load shedding (RATE_LIMIT_ENABLED).
+
+Both checks run in before_request, before the view opens a database session, so a
+rejected request costs a dictionary lookup rather than a query.
+
+- Token buckets: each client gets a bucket per budget in RATE_LIMITS, refilled at
+  ``rate`` tokens per second up to ``burst``. Clients are keyed by the professor id
+  of a valid token, or by remote address for requests without one (login and
+  register are always keyed by address). An empty bucket answers 429.
+- Concurrency gate: at most GATE_MAX_INFLIGHT requests run at once. Reads are only
+  admitted while fewer than GATE_READ_SHARE of those slots are taken, so a flood of
+  list and report requests is shed with 503 while attendance writes still get in.
+
+Both responses carry Retry-After. A POST /batch is a read that takes one token per
+sub-request.
+"""
+import math
+import threading
+import time
+
+from flask import current_app, request, jsonify
+
+from api.tokens import token_professor_id
+
+# Endpoints keyed by remote address whatever the request carries
+ADDRESS_BUDGETS = {'auth.login': 'login', 'auth.register': 'login'}
+
+# Endpoints that keep their budget and gate priority
+ATTENDANCE_ENDPOINTS = {'classes.mark_attendance'}
+
+# Long-lived responses that should not hold a gate slot
+UNGATED_ENDPOINTS = {'classes.stream_class_events'}
+
+BATCH_ENDPOINT = 'batch.batch'
+
+# Kept in the WSGI environ rather than g: batched sub-requests share g with their batch
+SLOT_KEY = 'checkmate.rate_limit_slot'
+
+# Buckets are pruned once there are more than this many
+MAX_BUCKETS = 10000
+
+
+class TokenBucket:
+    __slots__ = ('tokens', 'updated')
+
+    def __init__(self, burst, now):
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, rate, burst, now, cost=1):
+        """Take `cost` tokens. Returns 0 on success, otherwise seconds until they are available."""
+        self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0
+        return (cost - self.tokens) / rate
+
+
+class RateLimiter:
+    def __init__(self, budgets, max_inflight, read_share):
+        self.budgets = budgets
+        self.max_inflight = max_inflight
+        self.read_limit = max(1, int(max_inflight * read_share))
+        self.inflight = 0
+        self._buckets = {}  # (budget, client) -> TokenBucket
+        self._lock = threading.Lock()
+
+    def take(self, budget, client, cost=1):
+        rate, burst = self.budgets[budget]
+        cost = min(cost, burst)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get((budget, client))
+            if bucket is None:
+                if len(self._buckets) >= MAX_BUCKETS:
+                    self._prune(now)
+                bucket = self._buckets[(budget, client)] = TokenBucket(burst, now)
+            return bucket.take(rate, burst, now, cost)
+
+    def _prune(self, now):
+        # A bucket that would have refilled by now behaves exactly like a new one
+        for key, bucket in list(self._buckets.items()):
+            rate, burst = self.budgets[key[0]]
+            if bucket.tokens + (now - bucket.updated) * rate >= burst:
+                del self._buckets[key]
+
+    def enter(self, priority):
+        """Take a gate slot; reads only get one while the gate is below read_limit."""
+        with self._lock:
+            if self.inflight >= (self.max_inflight if priority else self.read_limit):
+                return False
+            self.inflight += 1
+            return True
+
+    def leave(self):
+        with self._lock:
+            self.inflight -= 1
+
+
+def request_budget():
+    """(budget, client key, priority, cost) for the current request."""
+    endpoint = request.endpoint
+    if endpoint in ADDRESS_BUDGETS:
+        return ADDRESS_BUDGETS[endpoint], request.remote_addr, False, 1
+    professor_id = token_professor_id()
+    client = f'professor:{professor_id}' if professor_id is not None else request.remote_addr
+    if endpoint in ATTENDANCE_ENDPOINTS:
+        return 'attendance', client, True, 1
+    if endpoint == BATCH_ENDPOINT:
+        items = (request.get_json(silent=True) or {}).get('requests')
+        return 'read', client, False, max(1, len(items)) if isinstance(items, list) else 1
+    if request.method in ('GET', 'HEAD'):
+        return 'read', client, False, 1
+    return 'write', client, True, 1
+
+
+def too_many(message, code, retry_after):
+    response = jsonify({'message': message})
+    response.status_code = code
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def limit_request():
+    if request.endpoint is None or request.endpoint in UNGATED_ENDPOINTS:
+        return None
+    limiter = current_app.extensions['rate_limit']
+    budget, client, priority, cost = request_budget()
+
+    retry_after = limiter.take(budget, client, cost)
+    if retry_after:
+        return too_many('Too many requests, slow down.', 429, retry_after)
+
+    # Check if the server has room for this request
+    if not limiter.enter(priority):
+        return too_many('Server is busy, try again shortly.', 503, 1)
+    request.environ[SLOT_KEY] = True
+    return None
+
+
+def release_slot(exc=None):
+    if request.environ.pop(SLOT_KEY, False):
+        current_app.extensions['rate_limit'].leave()
+
+
+def init_app(app):
+    if app.config['RATE_LIMIT_ENABLED']:
+        app.extensions['rate_limit'] = RateLimiter(app.config['RATE_LIMITS'], app.config['GATE_MAX_INFLIGHT'],
+                                                   app.config['GATE_READ_SHARE'])
+        app.before_request(limit_request)
+        app.teardown_request(release_slot)
@@ -0,0 +1,183 @@
+"""
+Optional per-professor sharding (SHARDING_ENABLED).
+
+Professors and their refresh tokens stay in the main database, which is what login
+and token checks read.
+Every other table is scoped by professor, so its rows live in a shard: one SQLite
+file per professor under SHARD_DIR, or one of SHARD_BUCKETS files chosen by
+professor id. Each shard has its own write lock, so different professors' writes
+no longer queue behind each other.
+
+The shard is picked per request from the x-access-token header. ShardedSession
+then sends queries on shard tables to that shard's engine. Code outside a request,
+such as CLI commands and the group commit writer, selects a shard with
+``use_shard``.
+"""
+import contextlib
+import os
+import threading
+
+import sqlalchemy as sa
+from flask import current_app, g, jsonify
+from flask_sqlalchemy.session import Session
+
+from api.tokens import token_professor_id
+
+# Tables kept in the main database. Tables with their own bind (the archive) keep it.
+DIRECTORY_TABLES = {'professor', 'refresh_token'}
+
+_engines_lock = threading.Lock()
+
+
+class ShardRoutingError(RuntimeError):
+    """A shard table was queried without a professor to route by."""
+
+
+class ShardedSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and current_app.config['SHARDING_ENABLED']:
+            table = sa.inspect(mapper).local_table if mapper is not None else clause
+            # Flask-SQLAlchemy sets bind_key to None on the default metadata; only other binds keep theirs
+            if isinstance(table, sa.Table) and table.name not in DIRECTORY_TABLES \
+                    and table.metadata.info.get('bind_key') is None:
+                return shard_engine(current_shard())
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def shard_tables():
+    metadata = current_app.extensions['sqlalchemy'].metadata
+    return [table for table in metadata.sorted_tables if table.name not in DIRECTORY_TABLES]
+
+
+def shard_name(professor_id):
+    buckets = current_app.config['SHARD_BUCKETS']
+    if buckets:
+        return f'bucket_{professor_id % buckets:03d}'
+    return f'professor_{professor_id}'
+
+
+def shard_dir():
+    return os.path.join(current_app.instance_path, current_app.config['SHARD_DIR'])
+
+
+def shard_path(name):
+    return os.path.join(shard_dir(), f'{name}.db')
+
+
+def shard_engine(name):
+    """The engine for shard ``name``; the file and its tables are created on first use."""
+    app = current_app._get_current_object()
+    engines = app.extensions.setdefault('shards', {})
+    engine = engines.get(name)
+    if engine is None:
+        with _engines_lock:
+            engine = engines.get(name)
+            if engine is None:
+                os.makedirs(shard_dir(), exist_ok=True)
+                engine = sa.create_engine(f'sqlite:///{shard_path(name)}')
+                from api.models import create_schema  # deferred: api.models imports this module via api.extensions
+                create_schema(engine, shard_tables())
+                engines[name] = engine
+    return engine
+
+
+def existing_shards():
+    if not os.path.isdir(shard_dir()):
+        return []
+    return sorted(name[:-3] for name in os.listdir(shard_dir()) if name.endswith('.db'))
+
+
+def current_shard():
+    shard = g.get('shard')
+    if shard is None:
+        raise ShardRoutingError('No professor to select a database shard for this request.')
+    return shard
+
+
+@contextlib.contextmanager
+def use_shard(name):
+    """
+    Route the session to shard ``name`` for the block. Ids are only unique within a shard,
+    so the session is cleared on the way in and out to keep objects from mixing.
+    """
+    db = current_app.extensions['sqlalchemy']
+    previous = g.get('shard')
+    db.session.remove()
+    g.shard = name
+    try:
+        yield
+    finally:
+        db.session.remove()
+        g.shard = previous
+
+
+def each_shard():
+    """Run a block per shard: yields shard names, or a single None when sharding is off."""
+    if not current_app.config['SHARDING_ENABLED']:
+        yield None
+        return
+    for name in existing_shards():
+        with use_shard(name):
+            yield name
+
+
+def event_channel(class_id):
+    """Class ids repeat across shards, so live event channels are keyed by shard too."""
+    if current_app.config['SHARDING_ENABLED']:
+        return current_shard(), class_id
+    return class_id
+
+
+def route_request():
+    # Authentication stays with token_required; this only picks the shard. A bad token
+    # leaves the shard unset and token_required rejects the request.
+    professor_id = token_professor_id()
+    if professor_id is not None:
+        g.shard = shard_name(professor_id)
+
+
+def shard_routing_error(e):
+    return jsonify({'message': 'Token is missing!'}), 401
+
+
+def init_app(app):
+    if app.config['SHARDING_ENABLED']:
+        app.before_request(route_request)
+        app.register_error_handler(ShardRoutingError, shard_routing_error)
+
+
+def owner_filter(table, professor_id):
+    """WHERE clause selecting a professor's rows from ``table``, directly or through a foreign key."""
+    if 'professor_id' in table.c:
+        return table.c.professor_id == professor_id
+    for fk in table.foreign_keys:
+        parent = fk.column.table
+        if 'professor_id' in parent.c:
+            return fk.parent.in_(sa.select(fk.column).where(parent.c.professor_id == professor_id))
+    raise ValueError(f'Cannot tell which professor owns rows in {table.name}.')
+
+
+def split_database():
+    """
+    Copy each professor's rows from the main database into their shard, keeping ids.
+    The main database is left as it was. Returns {shard name: rows copied}.
+    """
+    db = current_app.extensions['sqlalchemy']
+    professor_ids = [row[0] for row in db.session.execute(sa.text('SELECT id FROM professor ORDER BY id'))]
+    targets = {shard_name(professor_id) for professor_id in professor_ids}
+    occupied = sorted(name for name in targets if os.path.exists(shard_path(name)))
+    if occupied:
+        raise FileExistsError(f'Shards already exist: {", ".join(occupied)}')
+
+    copied = dict.fromkeys(sorted(targets), 0)
+    with db.engine.connect() as source:
+        for professor_id in professor_ids:
+            name = shard_name(professor_id)
+            with shard_engine(name).begin() as target:
+                for table in shard_tables():
+                    rows = [row._asdict() for row in source.execute(
+                        sa.select(table).where(owner_filter(table, professor_id)))]
+                    if rows:
+                        target.execute(table.insert(), rows)
+                        copied[name] += len(rows)
+    return copied
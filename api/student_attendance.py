@@ -0,0 +1,112 @@
+"""
+Attendance of one student across a professor's subjects (GET /students/<id>/attendance).
+
+Totals for classes stored as rows come from one query grouped by subject, which looks up
+the student's mark on each class through the unique (class_id, student_id) index. Bitmap
+classes and archived terms already summarise a whole class in one row, so only the
+student's bit is read from those. A class with no mark counts as an absence, as in the
+subject report, and scheduled classes that are still to come are not counted.
+"""
+from api import attendance_bitmap
+from api.archive import unpack_block
+from api.attendance_store import held_classes
+from api.extensions import db
+from api.models import Subject, StudentSubject, Class, Attendance, AttendanceBitmap, ArchivedSubjectTerm
+
+SUBJECT_ATTENDANCE_FIELDS = ['subject_id', 'subject_name', 'classes', 'attended', 'absences', 'rate',
+                             'recent_absences']
+
+
+def enrolled_subjects(student_id, professor_id):
+    """[(subject_id, name, ordinal)] of the professor's subjects the student is enrolled in."""
+    earlier = db.aliased(StudentSubject)
+    ordinal = db.select(db.func.count(earlier.id)) \
+        .where(earlier.subject_id == StudentSubject.subject_id, earlier.id < StudentSubject.id) \
+        .scalar_subquery()
+    return db.session.execute(
+        db.select(Subject.id, Subject.name, ordinal)
+        .join(StudentSubject, StudentSubject.subject_id == Subject.id)
+        .where(StudentSubject.student_id == student_id, Subject.professor_id == professor_id)
+        .order_by(Subject.name, Subject.id)
+    ).all()
+
+
+def student_attendance(student_id, professor_id, recent=5, with_recent=True):
+    """
+    Per-subject totals for a student: [{subject_id, subject_name, classes, attended, absences,
+    rate, recent_absences}], where recent_absences are the dates of the latest `recent` classes
+    the student was not present at, newest first. with_recent=False skips looking them up.
+    """
+    enrolled = enrolled_subjects(student_id, professor_id)
+    if not enrolled:
+        return []
+    subject_ids = [subject_id for subject_id, _, _ in enrolled]
+    ordinals = {subject_id: ordinal for subject_id, _, ordinal in enrolled}
+    summary = {subject_id: {"classes": 0, "attended": 0, "absent_dates": []} for subject_id in subject_ids}
+
+    row_class = AttendanceBitmap.class_id.is_(None)
+    present_row = db.and_(row_class, Attendance.status == 'present')
+
+    def live_classes(*columns):
+        return db.select(*columns) \
+            .outerjoin(Attendance, (Attendance.class_id == Class.id) & (Attendance.student_id == student_id)) \
+            .outerjoin(AttendanceBitmap, AttendanceBitmap.class_id == Class.id) \
+            .where(Class.professor_id == professor_id, Class.subject_id.in_(subject_ids), held_classes())
+
+    # Live classes and the student's marks on those stored as rows, grouped by subject
+    totals = db.session.execute(live_classes(
+        Class.subject_id,
+        db.func.count(Class.id),
+        db.func.sum(db.case((present_row, 1), else_=0)),
+        db.func.count(AttendanceBitmap.class_id)
+    ).group_by(Class.subject_id)).all()
+    bitmap_subjects = []
+    for subject_id, classes, attended, bitmap_classes in totals:
+        summary[subject_id]["classes"] += classes
+        summary[subject_id]["attended"] += attended or 0
+        if bitmap_classes:
+            bitmap_subjects.append(subject_id)
+
+    if with_recent and recent:
+        # Rank each subject's absences newest first, so only the latest `recent` are fetched
+        latest = db.func.row_number().over(partition_by=Class.subject_id,
+                                           order_by=(Class.date.desc(), Class.id.desc()))
+        absent = live_classes(Class.subject_id, Class.date, latest.label('latest')) \
+            .where(row_class, db.or_(Attendance.status.is_(None), Attendance.status != 'present')).subquery()
+        for subject_id, date in db.session.execute(
+                db.select(absent.c.subject_id, absent.c.date).where(absent.c.latest <= recent)):
+            summary[subject_id]["absent_dates"].append(date)
+
+    def add_bitmap_class(subject_id, date, present):
+        if attendance_bitmap.has_bit(present, ordinals[subject_id]):
+            summary[subject_id]["attended"] += 1
+        elif with_recent:
+            summary[subject_id]["absent_dates"].append(date)
+
+    if bitmap_subjects:
+        for subject_id, date, present in db.session.execute(
+                db.select(Class.subject_id, Class.date, AttendanceBitmap.present)
+                .join(AttendanceBitmap, AttendanceBitmap.class_id == Class.id)
+                .where(Class.professor_id == professor_id, Class.subject_id.in_(bitmap_subjects), held_classes())):
+            add_bitmap_class(subject_id, date, attendance_bitmap.from_bytes(present))
+
+    blocks = ArchivedSubjectTerm.query.filter(ArchivedSubjectTerm.professor_id == professor_id,
+                                              ArchivedSubjectTerm.subject_id.in_(subject_ids))
+    for block in blocks:
+        for _, date, _, present in unpack_block(block):
+            summary[block.subject_id]["classes"] += 1
+            add_bitmap_class(block.subject_id, date, present)
+
+    result = []
+    for subject_id, name, _ in enrolled:
+        entry = summary[subject_id]
+        result.append({
+            "subject_id": subject_id,
+            "subject_name": name,
+            "classes": entry["classes"],
+            "attended": entry["attended"],
+            "absences": entry["classes"] - entry["attended"],
+            "rate": round(entry["attended"] / entry["classes"], 4) if entry["classes"] else None,
+            "recent_absences": [date.isoformat() for date in sorted(entry["absent_dates"], reverse=True)[:recent]]
+        })
+    return result
@@ -0,0 +1,19 @@
+from flask import current_app, g, request
+import jwt
+
+
+def token_professor_id():
+    """
+    Professor id from a valid x-access-token header, or None. Decoded once per request and
+    shared by token_required, shard routing and rate limiting.
+    """
+    if 'token_professor_id' not in g:
+        token = request.headers.get('x-access-token')
+        professor_id = None
+        if token:
+            try:
+                professor_id = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])['id']
+            except (jwt.InvalidTokenError, KeyError):
+                pass
+        g.token_professor_id = professor_id
+    return g.token_professor_id
@@ -0,0 +1,152 @@
+"""
+Request tracing (TRACING_ENABLED).
+
+A traced request records spans for the whole request, token_required, the view
+handler and every SQL statement, and appends them to
+instance/TRACE_DIR/<trace id>.json in the Chrome trace event format, which
+chrome://tracing and ui.perfetto.dev render as a waterfall.
+
+A request is traced when it carries an X-Trace-Id header (the client sends one
+for the screens it samples, see src/utils/http.py) or, failing that, with
+probability TRACE_SAMPLE_RATE. Requests that are not traced only pay for a
+g lookup per span, and with tracing off no hooks or SQL listeners are installed.
+"""
+import contextlib
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+TRACE_HEADER = 'X-Trace-Id'
+TRACE_ID = re.compile(r'[0-9a-f]{32}')
+# Chrome trace process id for server spans; the client uses 1
+SERVER_PID = 2
+# Longest SQL statement kept in a span
+MAX_STATEMENT = 500
+# The request that started a trace finishes it; batched sub-requests share g, and so the trace, with it
+TRACE_KEY = 'checkmate.trace'
+
+_write_lock = threading.Lock()
+_sql_listening = False
+
+
+class Trace:
+    __slots__ = ('trace_id', 'events', 'start')
+
+    def __init__(self, trace_id):
+        self.trace_id = trace_id
+        self.events = []
+        self.start = time.time_ns()
+
+    def add(self, name, cat, start, end, args=None):
+        self.events.append({"name": name, "cat": cat, "ph": "X", "ts": start // 1000, "dur": (end - start) // 1000,
+                            "pid": SERVER_PID, "tid": threading.get_native_id(), "args": args or {}})
+
+
+def current_trace():
+    return g.get('trace') if has_app_context() else None
+
+
+@contextlib.contextmanager
+def span(name, cat='app', **args):
+    """Record the block as a span of the current request's trace, if it is traced."""
+    trace = current_trace()
+    if trace is None:
+        yield
+        return
+    start = time.time_ns()
+    try:
+        yield
+    finally:
+        trace.add(name, cat, start, time.time_ns(), args)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_trace() is not None:
+        context.trace_start = time.time_ns()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = current_trace()
+    start = getattr(context, 'trace_start', None)
+    if trace is not None and start is not None:
+        # Parameters are left out: they hold student names and emails
+        trace.add(statement.split(None, 1)[0].upper(), 'sql', start, time.time_ns(),
+                  {"statement": statement[:MAX_STATEMENT], "rows": cursor.rowcount, "executemany": executemany})
+
+
+def start_trace():
+    trace_id = request.headers.get(TRACE_HEADER)
+    if trace_id is None:
+        if random.random() >= current_app.config['TRACE_SAMPLE_RATE']:
+            return
+        trace_id = uuid.uuid4().hex
+    elif not TRACE_ID.fullmatch(trace_id):
+        # The id names a file, so anything but hex is ignored
+        return
+    g.trace = request.environ[TRACE_KEY] = Trace(trace_id)
+
+
+def tag_response(response):
+    trace = request.environ.get(TRACE_KEY)
+    if trace is not None:
+        response.headers[TRACE_HEADER] = trace.trace_id
+        g.trace_status = response.status_code
+    return response
+
+
+def finish_trace(exc=None):
+    trace = request.environ.pop(TRACE_KEY, None)
+    if trace is None:
+        return
+    g.pop('trace', None)
+    trace.add(f'{request.method} {request.path}', 'request', trace.start, time.time_ns(),
+              {"endpoint": request.endpoint, "status": g.get('trace_status')})
+    write_events(os.path.join(current_app.instance_path, current_app.config['TRACE_DIR'], f'{trace.trace_id}.json'),
+                 trace.events)
+
+
+def write_events(path, events):
+    """Append events to a JSON array trace file; the format allows the closing bracket to be left off."""
+    with _write_lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        new = not os.path.exists(path)
+        with open(path, 'a') as out:
+            if new:
+                out.write('[\n' + json.dumps({"name": "process_name", "ph": "M", "pid": SERVER_PID,
+                                              "args": {"name": "server"}}) + ',\n')
+            out.writelines(json.dumps(e) + ',\n' for e in events)
+
+
+def read_events(path):
+    with open(path) as source:
+        text = source.read().rstrip().rstrip(',').rstrip(']')
+    return json.loads(text + ']')
+
+
+def merge_traces(paths):
+    """Events of several trace files (say the client's and the server's) as one sorted list."""
+    events = [e for path in paths for e in read_events(path)]
+    events.sort(key=lambda e: (e["ph"] != "M", e.get("ts", 0)))
+    return events
+
+
+def init_app(app):
+    global _sql_listening
+    if not app.config['TRACING_ENABLED']:
+        return
+    app.before_request(start_trace)
+    app.after_request(tag_response)
+    app.teardown_request(finish_trace)
+    if not _sql_listening:
+        # Listening on the Engine class covers the main, archive and shard engines alike
+        event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', after_cursor_execute)
+        _sql_listening = True
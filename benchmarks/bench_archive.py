@@ -0,0 +1,122 @@
+"""
+Archiving closed terms: database sizes and read latencies before and after moving past terms to the archive.
+
+    python benchmarks/bench_archive.py [terms] [students] [subjects]
+"""
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+import jwt
+
+WORKDIR = tempfile.mkdtemp()
+MAIN_DB = os.path.join(WORKDIR, 'bench_archive.db')
+ARCHIVE_DB = os.path.join(WORKDIR, 'bench_archive_archive.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{MAIN_DB}'
+os.environ['ARCHIVE_DATABASE_URL'] = f'sqlite:///{ARCHIVE_DB}'
+os.environ['RATE_LIMIT_ENABLED'] = '0'  # measures storage throughput, not the limiter
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import create_app  # noqa: E402
+from api.analytics import load_subject_matrices  # noqa: E402
+from api.archive import archive_term  # noqa: E402
+from api.extensions import db  # noqa: E402
+from api.models import Professor, Student, Subject, StudentSubject, Class, Attendance, Term, init_db  # noqa: E402
+
+app = create_app()
+
+TERMS = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+STUDENTS = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+SUBJECTS = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+CLASSES_PER_TERM = 30
+RUNS = 20
+
+
+def populate():
+    """TERMS past terms plus the current one, two classes a week per subject."""
+    rng = random.Random(3)
+    professor = Professor(name='Bench', email='bench@example.com', password='x')
+    db.session.add(professor)
+    db.session.flush()
+    students = [Student(first_name='S', last_name=str(i), email=f's{i}@example.com', professor=professor)
+                for i in range(STUDENTS)]
+    subjects = [Subject(name=f'Subject {j}', professor=professor) for j in range(SUBJECTS)]
+    db.session.add_all(students + subjects)
+    db.session.flush()
+    db.session.add_all([StudentSubject(student_id=s.id, subject_id=subject.id) for subject in subjects for s in students])
+
+    today = datetime.date.today()
+    terms = []
+    for t in range(TERMS + 1):
+        start = today - datetime.timedelta(weeks=20 * (TERMS - t) + 15)
+        end = start + datetime.timedelta(weeks=15, days=-1)
+        terms.append(Term(professor_id=professor.id, name=f'Term {t}', start_date=start, end_date=end))
+        for subject in subjects:
+            for c in range(CLASSES_PER_TERM):
+                class_ = Class(professor=professor, subject=subject, date=start + datetime.timedelta(days=c * 3))
+                db.session.add(class_)
+                db.session.flush()
+                db.session.execute(db.insert(Attendance), [
+                    {'class_id': class_.id, 'student_id': s.id, 'status': 'present' if rng.random() < 0.85 else 'absent'}
+                    for s in students])
+    db.session.add_all(terms)
+    db.session.commit()
+    token = jwt.encode({'id': professor.id, 'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)},
+                       app.config['SECRET_KEY'])
+    return token, subjects[0].id, terms[:-1]
+
+
+def sizes():
+    for path, engine in ((MAIN_DB, db.engine), (ARCHIVE_DB, db.engines['archive'])):
+        with engine.connect() as connection:
+            connection.exec_driver_sql('VACUUM')
+    return os.path.getsize(MAIN_DB), os.path.getsize(ARCHIVE_DB)
+
+
+def median_ms(fn):
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def measure(client, token, subject_id):
+    headers = {'x-access-token': token}
+    main_size, archive_size = sizes()
+    return {
+        'main db bytes': main_size,
+        'archive db bytes': archive_size,
+        'report ms': median_ms(lambda: client.get(f'/subject/{subject_id}/report', headers=headers)),
+        'recent classes ms': median_ms(lambda: client.get(f'/subject/{subject_id}/classes?limit=20', headers=headers)),
+        'at-risk load ms': median_ms(load_subject_matrices),
+    }
+
+
+def main():
+    with app.app_context():
+        init_db()
+        token, subject_id, past_terms = populate()
+        client = app.test_client()
+
+        before = measure(client, token, subject_id)
+        start = time.perf_counter()
+        for term in past_terms:
+            archive_term(term)
+        archived_in = time.perf_counter() - start
+        after = measure(client, token, subject_id)
+
+    print(f'{TERMS} past terms + current, {SUBJECTS} subjects x {STUDENTS} students x {CLASSES_PER_TERM} classes/term')
+    print(f'archived in {archived_in:.2f}s')
+    print(f'{"":<20} {"before":>12} {"after":>12}')
+    for name in before:
+        print(f'{name:<20} {before[name]:>12.1f} {after[name]:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
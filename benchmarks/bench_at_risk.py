@@ -0,0 +1,81 @@
+"""
+Faculty-wide at-risk detection: bulk NumPy load + threshold checks over every subject.
+
+    python benchmarks/bench_at_risk.py [professors] [subjects_per_professor] [students_per_subject] [classes]
+"""
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_at_risk.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import create_app  # noqa: E402
+from api.analytics import load_subject_matrices, at_risk_report  # noqa: E402
+from api.extensions import db  # noqa: E402
+from api.models import Professor, Student, Subject, StudentSubject, Class, Attendance, init_db  # noqa: E402
+
+app = create_app()
+
+PROFESSORS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+SUBJECTS = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+STUDENTS = int(sys.argv[3]) if len(sys.argv) > 3 else 60
+CLASSES = int(sys.argv[4]) if len(sys.argv) > 4 else 30
+
+
+def populate():
+    rng = random.Random(7)
+    db.session.execute(db.insert(Professor), [
+        {'id': p, 'name': f'P{p}', 'email': f'p{p}@example.com', 'password': 'x'}
+        for p in range(1, PROFESSORS + 1)])
+    db.session.execute(db.insert(Student), [
+        {'id': p * STUDENTS + s, 'first_name': 'S', 'last_name': str(s),
+         'email': f'{p}.{s}@example.com', 'professor_id': p}
+        for p in range(1, PROFESSORS + 1) for s in range(STUDENTS)])
+
+    subjects, enrollments, classes, attendance = [], [], [], []
+    for p in range(1, PROFESSORS + 1):
+        for j in range(SUBJECTS):
+            subject_id = len(subjects) + 1
+            subjects.append({'id': subject_id, 'name': f'Subject {subject_id}', 'professor_id': p})
+            students = [p * STUDENTS + s for s in range(STUDENTS)]
+            enrollments += [{'student_id': s, 'subject_id': subject_id} for s in students]
+            for c in range(CLASSES):
+                class_id = len(classes) + 1
+                classes.append({'id': class_id, 'professor_id': p, 'subject_id': subject_id,
+                                'date': datetime.date(2024, 1, 1) + datetime.timedelta(days=c)})
+                # A few students per subject drift below the threshold
+                attendance += [{'class_id': class_id, 'student_id': s,
+                                'status': 'present' if rng.random() < (0.5 if s % 10 == 0 else 0.9) else 'absent'}
+                               for s in students]
+    for model, values in ((Subject, subjects), (StudentSubject, enrollments), (Class, classes),
+                          (Attendance, attendance)):
+        db.session.execute(db.insert(model), values)
+    db.session.commit()
+    return len(attendance)
+
+
+def main():
+    with app.app_context():
+        init_db()
+        start = time.perf_counter()
+        rows = populate()
+        print(f'populated {rows} attendance rows in {time.perf_counter() - start:.1f}s')
+
+        start = time.perf_counter()
+        matrices = load_subject_matrices()
+        loaded = time.perf_counter() - start
+
+        start = time.perf_counter()
+        report = at_risk_report(None, 0.75, 5)
+        total = time.perf_counter() - start
+
+    print(f'{len(matrices)} subjects, {PROFESSORS} professors')
+    print(f'bulk load: {loaded:.3f}s, full at-risk report: {total:.3f}s, flagged: {len(report["students"])}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Server time for the subject detail reads (subject with students, classes, all students) sent as three
+GETs or as one POST /batch. Over a real network the batch also saves two round trips.
+
+    python benchmarks/bench_batch.py [iterations]
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+import jwt
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_batch.db')}"
+os.environ['RATE_LIMIT_ENABLED'] = '0'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import create_app  # noqa: E402
+from api.extensions import db  # noqa: E402
+from api.models import Professor, Student, Subject, StudentSubject, Class, init_db  # noqa: E402
+
+app = create_app()
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+STUDENTS = 60
+CLASSES = 40
+
+
+def populate():
+    professor = Professor(name='Bench', email='bench@example.com', password='x')
+    subject = Subject(name='Bench subject', professor=professor)
+    students = [Student(first_name='S', last_name=str(i), email=f's{i}@example.com', professor=professor)
+                for i in range(STUDENTS)]
+    db.session.add_all([professor, subject] + students)
+    db.session.flush()
+    db.session.add_all([StudentSubject(student_id=s.id, subject_id=subject.id) for s in students])
+    start = datetime.date(2025, 2, 1)
+    db.session.add_all([Class(professor_id=professor.id, subject_id=subject.id, date=start + datetime.timedelta(days=i))
+                        for i in range(CLASSES)])
+    db.session.commit()
+    token = jwt.encode({'id': professor.id, 'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)},
+                       app.config['SECRET_KEY'])
+    return token, subject.id
+
+
+def main():
+    with app.app_context():
+        init_db()
+        token, subject_id = populate()
+
+    headers = {'x-access-token': token}
+    paths = [f'/subject/{subject_id}/students', f'/subject/{subject_id}/classes?limit=20', '/students']
+    client = app.test_client()
+
+    def separate():
+        for path in paths:
+            assert client.get(path, headers=headers).status_code == 200
+
+    def batched():
+        response = client.post('/batch', json={"requests": [{"path": path} for path in paths]}, headers=headers)
+        assert all(item["status"] == 200 for item in response.json["responses"])
+
+    print(f'{ITERATIONS} x subject detail reads ({STUDENTS} students, {CLASSES} classes)')
+    for name, run in (('3 GETs', separate), ('POST /batch', batched)):
+        run()
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            run()
+        print(f'{name:12} {(time.perf_counter() - start) / ITERATIONS * 1000:6.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
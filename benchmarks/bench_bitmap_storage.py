@@ -0,0 +1,98 @@
+"""
+Row vs bitmap attendance storage: on-disk size and /subject/<id>/report latency.
+
+    python benchmarks/bench_bitmap_storage.py [students] [classes]
+"""
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+import jwt
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), 'bench_bitmap.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+os.environ['RATE_LIMIT_ENABLED'] = '0'  # measures storage throughput, not the limiter
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import create_app  # noqa: E402
+from api.attendance_store import convert_class_to_bitmap  # noqa: E402
+from api.extensions import db  # noqa: E402
+from api.models import Professor, Student, Subject, StudentSubject, Class, Attendance, init_db  # noqa: E402
+
+app = create_app()
+
+STUDENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+CLASSES = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+RUNS = 20
+
+
+def populate():
+    professor = Professor(name='Bench', email='bench@example.com', password='x')
+    subject = Subject(name='Bench subject', professor=professor)
+    db.session.add_all([professor, subject])
+    db.session.flush()
+
+    students = [Student(first_name='S', last_name=str(i), email=f's{i}@example.com', professor=professor)
+                for i in range(STUDENTS)]
+    db.session.add_all(students)
+    db.session.flush()
+    db.session.add_all([StudentSubject(student_id=s.id, subject_id=subject.id) for s in students])
+
+    classes = [Class(professor=professor, subject=subject) for _ in range(CLASSES)]
+    db.session.add_all(classes)
+    db.session.flush()
+
+    rng = random.Random(42)
+    db.session.add_all([
+        Attendance(class_id=c.id, student_id=s.id, status='present' if rng.random() < 0.8 else 'absent')
+        for c in classes for s in students
+    ])
+    db.session.commit()
+    return professor, subject
+
+
+def storage_bytes():
+    db.session.execute(db.text('VACUUM'))
+    return os.path.getsize(DB_PATH)
+
+
+def report_latency(client, token, subject_id):
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        response = client.get(f'/subject/{subject_id}/report', headers={'x-access-token': token})
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.get_json()
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def main():
+    with app.app_context():
+        init_db()
+        professor, subject = populate()
+        token = jwt.encode({'id': professor.id, 'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)},
+                           app.config['SECRET_KEY'])
+        client = app.test_client()
+
+        row_size = storage_bytes()
+        row_latency = report_latency(client, token, subject.id)
+
+        for class_ in Class.query.all():
+            convert_class_to_bitmap(class_)
+        db.session.commit()
+
+        bitmap_size = storage_bytes()
+        bitmap_latency = report_latency(client, token, subject.id)
+
+    print(f'{STUDENTS} students x {CLASSES} classes')
+    print(f'{"storage":<8} {"db bytes":>12} {"report p50 ms":>15}')
+    print(f'{"rows":<8} {row_size:>12} {row_latency * 1000:>15.2f}')
+    print(f'{"bitmap":<8} {bitmap_size:>12} {bitmap_latency * 1000:>15.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Client startup: fresh interpreter -> login form built, with every screen imported up front (the old
+src/main.py) vs screens loaded on first navigation through src/utils/screen_loader.py.
+
+    python benchmarks/bench_client_startup.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+# The login screen only touches page.navigation_bar while building its controls, so a bare namespace
+# stands in for the Flet page and the probe measures imports plus building the first frame.
+FIRST_FRAME = """
+from types import SimpleNamespace
+login_screen(SimpleNamespace(page=SimpleNamespace(navigation_bar=None)))
+"""
+
+EAGER = """
+import time
+start = time.perf_counter()
+import flet as ft
+import requests
+from flet_navigator import PublicFletNavigator, PageData, route
+from src.screens.profile_screen import profile_screen
+from src.screens.students_screen import students_screen
+from src.screens.subject.subject_detail_screen import subject_detail_screen
+from src.screens.subject.subject_report_screen import subject_report_screen
+from src.screens.subjects_screen import subjects_screen
+from src.screens.login_screen import login_screen
+from src.screens.register_screen import register_screen
+from src.utils.route_guard import auth_guard, guests_guard
+""" + FIRST_FRAME + """
+print((time.perf_counter() - start) * 1000)
+"""
+
+LAZY = """
+import time
+start = time.perf_counter()
+import flet as ft
+from flet_navigator import PublicFletNavigator, PageData, route
+from src.utils.route_guard import auth_guard, guests_guard
+from src.utils.screen_loader import load_screen
+login_screen = load_screen('login')
+""" + FIRST_FRAME + """
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def median_ms(probe):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    timings = [float(subprocess.run([sys.executable, '-c', probe], cwd=ROOT, env=env, check=True,
+                                    capture_output=True, text=True).stdout)
+               for _ in range(RUNS)]
+    return statistics.median(timings)
+
+
+def main():
+    print(f'{RUNS} runs, time to first login form')
+    print(f'eager screen imports: median {median_ms(EAGER):7.1f} ms')
+    print(f'lazy screen imports:  median {median_ms(LAZY):7.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
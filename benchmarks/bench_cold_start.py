@@ -0,0 +1,42 @@
+"""
+Cold start of the API: fresh interpreter -> `import server` -> first response served.
+
+    python benchmarks/bench_cold_start.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+PROBE = """
+import time
+start = time.perf_counter()
+import server
+imported = time.perf_counter()
+server.app.test_client().get('/subjects')
+served = time.perf_counter()
+print((imported - start) * 1000, (served - start) * 1000)
+"""
+
+
+def main():
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'cold_start.db')}",
+               PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE='')
+    imports, firsts = [], []
+    for _ in range(RUNS):
+        output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env, check=True,
+                                capture_output=True, text=True).stdout.split()
+        imports.append(float(output[0]))
+        firsts.append(float(output[1]))
+
+    print(f'{RUNS} runs')
+    print(f'import server:        median {statistics.median(imports):7.1f} ms')
+    print(f'first response ready: median {statistics.median(firsts):7.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+CPU cost versus bytes saved by response compression, on the JSON a large roster produces:
+compressed size and encode time per payload at several gzip levels and, when the brotli package
+is installed, brotli qualities. Then server time per request with and without Accept-Encoding.
+
+    python benchmarks/bench_compression.py [iterations]
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+import zlib
+
+import jwt
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_compression.db')}"
+os.environ['RATE_LIMIT_ENABLED'] = '0'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import create_app  # noqa: E402
+from api.compression import brotli  # noqa: E402
+from api.extensions import db  # noqa: E402
+from api.models import Professor, Student, Subject, StudentSubject, Class, Attendance, init_db  # noqa: E402
+
+app = create_app()
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+STUDENTS = 2000
+CLASSES = 30
+
+
+def populate():
+    professor = Professor(name='Bench', email='bench@example.com', password='x')
+    subject = Subject(name='Bench subject', professor=professor)
+    students = [Student(first_name=f'First{i}', last_name=f'Last{i}', email=f'student{i}@example.com',
+                        professor=professor) for i in range(STUDENTS)]
+    db.session.add_all([professor, subject] + students)
+    db.session.flush()
+    db.session.add_all([StudentSubject(student_id=s.id, subject_id=subject.id) for s in students])
+    start = datetime.date(2025, 2, 1)
+    classes = [Class(professor_id=professor.id, subject_id=subject.id, date=start + datetime.timedelta(days=i))
+               for i in range(CLASSES)]
+    db.session.add_all(classes)
+    db.session.flush()
+    db.session.add_all([Attendance(class_id=c.id, student_id=s.id, status='present' if (i + j) % 4 else 'absent')
+                        for i, c in enumerate(classes) for j, s in enumerate(students)])
+    db.session.commit()
+    token = jwt.encode({'id': professor.id, 'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)},
+                       app.config['SECRET_KEY'])
+    return token, subject.id, classes[0].id
+
+
+def gzip(level):
+    def encode(data):
+        stream = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return stream.compress(data) + stream.flush()
+    return encode
+
+
+def encoders():
+    yield from ((f'gzip {level}', gzip(level)) for level in (1, 6, 9))
+    if brotli is not None:
+        yield from ((f'br {quality}', lambda data, q=quality: brotli.compress(data, quality=q)) for quality in (1, 4, 11))
+
+
+def timed(run):
+    run()
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        result = run()
+    return result, (time.perf_counter() - start) / ITERATIONS * 1000
+
+
+def main():
+    with app.app_context():
+        init_db()
+        token, subject_id, class_id = populate()
+
+    headers = {'x-access-token': token}
+    client = app.test_client()
+    paths = ['/students', f'/subject/{subject_id}/students', f'/classes/{class_id}', f'/subject/{subject_id}/report']
+    payloads = {path: client.get(path, headers=headers).data for path in paths}
+    if brotli is None:
+        print('brotli is not installed, only gzip is measured')
+
+    print(f'{ITERATIONS} x encode ({STUDENTS} students, {CLASSES} classes)')
+    print(f'{"payload":28} {"encoding":9} {"bytes":>8} {"ratio":>6} {"ms":>7}')
+    for path, data in payloads.items():
+        print(f'{path:28} {"identity":9} {len(data):8}')
+        for name, encode in encoders():
+            encoded, elapsed = timed(lambda: encode(data))
+            print(f'{"":28} {name:9} {len(encoded):8} {len(data) / len(encoded):6.1f} {elapsed:7.3f}')
+
+    print(f'\n{ITERATIONS} x request, server time (COMPRESSION_GZIP_LEVEL={app.config["COMPRESSION_GZIP_LEVEL"]})')
+    for path in paths:
+        for encoding in ('identity', 'gzip', 'br') if brotli is not None else ('identity', 'gzip'):
+            response, elapsed = timed(lambda: client.get(path, headers=dict(headers, **{'Accept-Encoding': encoding})))
+            print(f'{path:28} {encoding:9} {len(response.data):8} {elapsed:7.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
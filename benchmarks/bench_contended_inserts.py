@@ -0,0 +1,86 @@
+"""
+Throughput and outcomes of contended inserts: every attendance mark and every subject is sent by two
+threads at once, as when a check-in is double-tapped or a request is retried.
+
+    python benchmarks/bench_contended_inserts.py [threads] [marks_per_thread]
+"""
+import collections
+import datetime
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import jwt
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_contended_inserts.db')}"
+os.environ['RATE_LIMIT_ENABLED'] = '0'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import create_app  # noqa: E402
+from api.extensions import db  # noqa: E402
+from api.models import Professor, Student, Subject, StudentSubject, Class, init_db  # noqa: E402
+
+app = create_app()
+
+THREADS = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+MARKS = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+
+def populate():
+    professor = Professor(name='Bench', email='bench@example.com', password='x')
+    subject = Subject(name='Bench subject', professor=professor)
+    students = [Student(first_name='S', last_name=str(i), email=f's{i}@example.com', professor=professor)
+                for i in range(THREADS * MARKS // 2)]
+    db.session.add_all([professor, subject] + students)
+    db.session.flush()
+    db.session.add_all([StudentSubject(student_id=s.id, subject_id=subject.id) for s in students])
+    class_ = Class(professor_id=professor.id, subject_id=subject.id)
+    db.session.add(class_)
+    db.session.commit()
+    token = jwt.encode({'id': professor.id, 'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)},
+                       app.config['SECRET_KEY'])
+    return token, class_.id, [s.id for s in students]
+
+
+def contend(requests):
+    """Run (path, body) requests so that each pair lands on two threads at about the same time."""
+    token = app.config['BENCH_TOKEN']
+    outcomes = collections.Counter()
+
+    def worker(index):
+        client = app.test_client()
+        # Threads 2k and 2k+1 send the same requests in the same order
+        mine = requests[index // 2::THREADS // 2]
+        for path, body in mine:
+            response = client.post(path, json=body, headers={'x-access-token': token})
+            outcomes[response.status_code] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return sum(outcomes.values()) / elapsed, outcomes
+
+
+def main():
+    with app.app_context():
+        init_db()
+        token, class_id, student_ids = populate()
+    app.config['BENCH_TOKEN'] = token
+
+    print(f'{THREADS} threads, every request sent twice')
+    marks = [(f'/classes/{class_id}/attendance', {'student_id': student_id}) for student_id in student_ids]
+    subjects = [('/subjects', {'name': f'Subject {i}'}) for i in range(len(student_ids))]
+    for name, requests in (('mark_attendance', marks), ('add_subject', subjects)):
+        rate, outcomes = contend(requests)
+        codes = ', '.join(f'{code}: {count}' for code, count in sorted(outcomes.items()))
+        print(f'{name:16} {rate:6.0f} requests/s  ({codes})')
+
+
+if __name__ == '__main__':
+    main()
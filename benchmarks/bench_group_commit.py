@@ -0,0 +1,83 @@
+"""
+Peak attendance writes/sec for a check-in burst, with and without group commit.
+
+    python benchmarks/bench_group_commit.py [threads] [marks_per_thread]
+"""
+import datetime
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import jwt
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_group_commit.db')}"
+os.environ['RATE_LIMIT_ENABLED'] = '0'  # measures storage throughput, not the limiter
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import create_app  # noqa: E402
+from api.extensions import db  # noqa: E402
+from api.models import Professor, Student, Subject, StudentSubject, Class, init_db  # noqa: E402
+
+app = create_app()
+
+THREADS = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+MARKS = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+
+def populate():
+    professor = Professor(name='Bench', email='bench@example.com', password='x')
+    subject = Subject(name='Bench subject', professor=professor)
+    students = [Student(first_name='S', last_name=str(i), email=f's{i}@example.com', professor=professor)
+                for i in range(THREADS * MARKS)]
+    db.session.add_all([professor, subject] + students)
+    db.session.flush()
+    db.session.add_all([StudentSubject(student_id=s.id, subject_id=subject.id) for s in students])
+    db.session.commit()
+    token = jwt.encode({'id': professor.id, 'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)},
+                       app.config['SECRET_KEY'])
+    return token, professor.id, subject.id, [s.id for s in students]
+
+
+def burst(token, professor_id, subject_id, student_ids):
+    with app.app_context():
+        class_ = Class(professor_id=professor_id, subject_id=subject_id)
+        db.session.add(class_)
+        db.session.commit()
+        class_id = class_.id
+
+    failures = []
+
+    def worker(chunk):
+        client = app.test_client()
+        for student_id in chunk:
+            response = client.post(f'/classes/{class_id}/attendance', json={'student_id': student_id},
+                                   headers={'x-access-token': token})
+            if response.status_code != 201:
+                failures.append(response.status_code)
+
+    threads = [threading.Thread(target=worker, args=(student_ids[i::THREADS],)) for i in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return len(student_ids) / elapsed, len(failures)
+
+
+def main():
+    with app.app_context():
+        init_db()
+        token, professor_id, subject_id, student_ids = populate()
+
+    print(f'{THREADS} threads x {MARKS} marks')
+    for enabled in (False, True):
+        app.config['GROUP_COMMIT_ENABLED'] = enabled
+        rate, failed = burst(token, professor_id, subject_id, student_ids)
+        print(f'group commit {"on " if enabled else "off"}: {rate:8.0f} writes/s, {failed} failed')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Check-in latency while another client floods GET /students, with and without rate limiting.
+
+    python benchmarks/bench_load_shedding.py [flood_threads] [checkins]
+"""
+import collections
+import datetime
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import jwt
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_load_shedding.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import create_app  # noqa: E402
+from api.extensions import db  # noqa: E402
+from api.models import Professor, Student, Subject, StudentSubject, Class, init_db  # noqa: E402
+
+FLOOD_THREADS = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+CHECKINS = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+FLOOD_STUDENTS = 500
+
+
+def populate(app):
+    def professor(name, students):
+        professor = Professor(name=name, email=f'{name}@example.com', password='x')
+        subject = Subject(name=f'{name} subject', professor=professor)
+        rows = [Student(first_name='S', last_name=str(i), email=f'{name}{i}@example.com', professor=professor)
+                for i in range(students)]
+        db.session.add_all([professor, subject] + rows)
+        db.session.flush()
+        db.session.add_all([StudentSubject(student_id=s.id, subject_id=subject.id) for s in rows])
+        db.session.commit()
+        token = jwt.encode({'id': professor.id, 'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)},
+                           app.config['SECRET_KEY'])
+        return token, professor.id, subject.id, [s.id for s in rows]
+
+    return professor('script', FLOOD_STUDENTS), professor('lecturer', CHECKINS)
+
+
+def run(app, script, lecturer):
+    token, professor_id, subject_id, student_ids = lecturer
+    with app.app_context():
+        class_ = Class(professor_id=professor_id, subject_id=subject_id)
+        db.session.add(class_)
+        db.session.commit()
+        class_id = class_.id
+
+    done = threading.Event()
+    flood = collections.Counter()
+
+    def flooder():
+        client = app.test_client()
+        while not done.is_set():
+            flood[client.get('/students', headers={'x-access-token': script[0]}).status_code] += 1
+
+    latencies = []
+
+    def lecture():
+        client = app.test_client()
+        for student_id in student_ids:
+            start = time.perf_counter()
+            response = client.post(f'/classes/{class_id}/attendance', json={'student_id': student_id},
+                                   headers={'x-access-token': token})
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 201, response.json
+
+    threads = [threading.Thread(target=flooder) for _ in range(FLOOD_THREADS)]
+    for thread in threads:
+        thread.start()
+    start = time.perf_counter()
+    lecture()
+    elapsed = time.perf_counter() - start
+    done.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    return (latencies[len(latencies) // 2] * 1000, latencies[int(len(latencies) * 0.95)] * 1000,
+            len(latencies) / elapsed, flood)
+
+
+def main():
+    apps = {enabled: create_app({'RATE_LIMIT_ENABLED': enabled}) for enabled in (False, True)}
+    with apps[False].app_context():
+        init_db()
+        script, lecturer = populate(apps[False])
+
+    print(f'{FLOOD_THREADS} threads flooding GET /students ({FLOOD_STUDENTS} students), {CHECKINS} check-ins')
+    for enabled, app in apps.items():
+        p50, p95, rate, flood = run(app, script, lecturer)
+        codes = ', '.join(f'{code}: {count}' for code, count in sorted(flood.items()))
+        print(f'rate limit {"on " if enabled else "off"}: check-in p50 {p50:6.1f} ms, p95 {p95:6.1f} ms, '
+              f'{rate:5.0f} check-ins/s; flood responses {codes}')
+
+
+if __name__ == '__main__':
+    main()
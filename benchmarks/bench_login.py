@@ -0,0 +1,111 @@
+"""
+Login throughput and what a login storm does to other requests. First the cost of one
+verification per hash method, then LOGIN_THREADS clients logging in nonstop for a few seconds
+while another client reads /students, with hashing limited to PASSWORD_WORKERS threads and
+with one worker per login thread (about what hashing on the request thread amounted to).
+
+    python benchmarks/bench_login.py [seconds]
+"""
+import datetime
+import hmac
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import jwt
+from werkzeug.security import generate_password_hash
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_login.db')}"
+os.environ['RATE_LIMIT_ENABLED'] = '0'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import create_app  # noqa: E402
+from api.extensions import db  # noqa: E402
+from api.models import Professor, Student, init_db  # noqa: E402
+from api.passwords import check_hash  # noqa: E402
+
+app = create_app()
+
+SECONDS = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+LOGIN_THREADS = 16
+METHODS = ['sha256', 'pbkdf2:sha256:600000', 'scrypt:32768:8:1']
+
+
+def populate():
+    professor = Professor(name='Bench', email='bench@example.com',
+                          password=generate_password_hash('secret', method=app.config['PASSWORD_HASH_METHOD']))
+    db.session.add(professor)
+    db.session.add_all([Student(first_name='S', last_name=str(i), email=f's{i}@example.com', professor=professor)
+                        for i in range(200)])
+    db.session.commit()
+    return jwt.encode({'id': professor.id, 'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)},
+                      app.config['SECRET_KEY'])
+
+
+def hash_costs():
+    print('one verification')
+    for method in METHODS:
+        if method == 'sha256':
+            # The legacy format, which werkzeug no longer generates
+            stored = 'sha256$salt$' + hmac.new(b'salt', b'secret', 'sha256').hexdigest()
+        else:
+            stored = generate_password_hash('secret', method=method)
+        start = time.perf_counter()
+        for _ in range(5):
+            assert check_hash(stored, 'secret')
+        print(f'  {method:24} {(time.perf_counter() - start) / 5 * 1000:8.2f} ms')
+
+
+def storm(token, workers):
+    app.config['PASSWORD_WORKERS'] = workers
+    app.config['PASSWORD_MAX_PENDING'] = LOGIN_THREADS
+    app.extensions.pop('passwords', None)
+    stop = time.perf_counter() + SECONDS
+    logins = []
+    reads = []
+
+    def login():
+        client = app.test_client()
+        while time.perf_counter() < stop:
+            response = client.post('/login', json={'email': 'bench@example.com', 'password': 'secret'})
+            logins.append(response.status_code)
+
+    def read():
+        client = app.test_client()
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            assert client.get('/students', headers={'x-access-token': token}).status_code == 200
+            reads.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=login) for _ in range(LOGIN_THREADS if workers else 0)]
+    threads.append(threading.Thread(target=read))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ok = logins.count(200)
+    reads.sort()
+    label = f'{workers} workers' if workers else 'no logins'
+    print(f'  {label:12} {ok / SECONDS:7.1f} logins/s {len(logins) - ok:5} shed  '
+          f'/students p50 {statistics.median(reads):6.2f} ms  p95 {reads[int(len(reads) * 0.95)]:6.2f} ms')
+
+
+def main():
+    with app.app_context():
+        init_db()
+        token = populate()
+
+    hash_costs()
+    print(f'\n{LOGIN_THREADS} clients logging in for {SECONDS:g} s ({app.config["PASSWORD_HASH_METHOD"]}, '
+          f'{os.cpu_count()} cores)')
+    for workers in (0, 2, LOGIN_THREADS):
+        storm(token, workers)
+
+
+if __name__ == '__main__':
+    main()
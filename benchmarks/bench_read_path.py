@@ -0,0 +1,119 @@
+"""
+ORM-hydrating vs column-tuple read path for the list and report endpoints:
+peak Python memory (tracemalloc) and CPU time per request.
+
+    python benchmarks/bench_read_path.py [rows ...]    (default: 10000 100000)
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_read_path.db')}"
+
+from flask import jsonify  # noqa: E402
+
+from api import create_app  # noqa: E402
+from api.blueprints import classes, students, subjects  # noqa: E402
+from api.extensions import db  # noqa: E402
+from api.models import Professor, Student, Subject, StudentSubject, Class, Attendance  # noqa: E402
+
+app = create_app()
+
+SIZES = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+
+
+# Previous ORM implementations, kept here as the baseline
+
+def orm_get_students(current_user):
+    students = Student.query.filter_by(professor_id=current_user.id).all()
+    return jsonify({'students': [{'id': s.id, 'first_name': s.first_name, 'last_name': s.last_name,
+                                  'email': s.email} for s in students]})
+
+
+def orm_get_subjects(current_user):
+    subjects = Subject.query.filter_by(professor_id=current_user.id).all()
+    return jsonify({'subjects': [{'id': s.id, 'name': s.name} for s in subjects]})
+
+
+def orm_get_subject_students(subject_id):
+    subject = db.session.get(Subject, subject_id)
+    student_subjects = StudentSubject.query.filter_by(subject_id=subject_id).all()
+    return {'id': subject.id, 'name': subject.name, 'students': [
+        {'id': ss.student.id, 'first_name': ss.student.first_name, 'last_name': ss.student.last_name}
+        for ss in student_subjects]}
+
+
+def orm_get_class_attendance(current_user, class_id):
+    class_ = Class.query.filter_by(id=class_id, professor_id=current_user.id).first()
+    attendance_data = []
+    for ss in StudentSubject.query.filter_by(subject_id=class_.subject_id).all():
+        attendance = Attendance.query.filter_by(class_id=class_id, student_id=ss.student_id).first()
+        attendance_data.append({'student_id': ss.student.id, 'first_name': ss.student.first_name,
+                                'last_name': ss.student.last_name,
+                                'status': attendance.status if attendance else 'absent'})
+    return jsonify({'class': {'id': class_.id, 'subject_name': class_.subject.name, 'date': class_.date},
+                    'attendance': attendance_data})
+
+
+def populate(rows):
+    db.drop_all()
+    db.create_all()
+    db.session.execute(db.insert(Professor), [{'id': 1, 'name': 'P', 'email': 'p@example.com', 'password': 'x'}])
+    db.session.execute(db.insert(Student), [
+        {'id': i, 'first_name': f'First{i}', 'last_name': f'Last{i}', 'email': f's{i}@example.com',
+         'professor_id': 1} for i in range(1, rows + 1)])
+    db.session.execute(db.insert(Subject), [{'id': i, 'name': f'Subject {i}', 'professor_id': 1}
+                                            for i in range(1, rows + 1)])
+    db.session.execute(db.insert(StudentSubject), [{'student_id': i, 'subject_id': 1} for i in range(1, rows + 1)])
+    db.session.execute(db.insert(Class), [{'id': 1, 'professor_id': 1, 'subject_id': 1,
+                                           'date': datetime.date(2024, 1, 1)}])
+    db.session.execute(db.insert(Attendance), [{'class_id': 1, 'student_id': i, 'status': 'present'}
+                                               for i in range(1, rows + 1, 2)])
+    db.session.commit()
+
+
+def measure(view, *args):
+    """CPU seconds of one call, then peak traced memory of a second call (tracing skews CPU)."""
+    db.session.remove()
+    start = time.process_time()
+    with app.test_request_context():
+        view(*args)
+    cpu = time.process_time() - start
+    db.session.remove()
+
+    tracemalloc.start()
+    with app.test_request_context():
+        view(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    db.session.remove()
+    return cpu, peak
+
+
+def main():
+    endpoints = [
+        ('get_students', orm_get_students, students.get_students.__wrapped__, 'user'),
+        ('get_subjects', orm_get_subjects, subjects.get_subjects.__wrapped__, 'user'),
+        ('get_subject_students', orm_get_subject_students, subjects.get_subject_students, 'subject'),
+        ('get_class_attendance', orm_get_class_attendance, classes.get_class_attendance.__wrapped__, 'class'),
+    ]
+    print(f'{"endpoint":<22} {"rows":>7} {"orm cpu s":>10} {"tuple cpu s":>12} {"orm peak MB":>12} '
+          f'{"tuple peak MB":>14}')
+    with app.app_context():
+        for rows in SIZES:
+            populate(rows)
+            user = db.session.get(Professor, 1)
+            for name, orm_view, tuple_view, kind in endpoints:
+                args = {'user': (user,), 'subject': (1,), 'class': (user, 1)}[kind]
+                orm_cpu, orm_peak = measure(orm_view, *args)
+                tuple_cpu, tuple_peak = measure(tuple_view, *args)
+                print(f'{name:<22} {rows:>7} {orm_cpu:>10.3f} {tuple_cpu:>12.3f} '
+                      f'{orm_peak / 2 ** 20:>12.1f} {tuple_peak / 2 ** 20:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Server CPU spent keeping a user logged in: one full login (password hash check) versus one
+POST /token/refresh, and what that adds up to per active user per week. Before refresh tokens,
+every 24-hour token meant a full login on each day of use. Now an access token lasts
+ACCESS_TOKEN_TTL and is refreshed while the client is in use, with one login per
+REFRESH_TOKEN_TTL.
+
+    python benchmarks/bench_refresh.py [iterations]
+"""
+import os
+import sys
+import tempfile
+import time
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_refresh.db')}"
+os.environ['RATE_LIMIT_ENABLED'] = '0'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import create_app  # noqa: E402
+from api.models import init_db  # noqa: E402
+
+app = create_app()
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+# An active user: the client open 8 hours a day, 5 days a week
+DAYS_PER_WEEK = 5
+HOURS_PER_DAY = 8
+
+
+def cpu_ms(run):
+    run()
+    start = time.process_time()
+    for _ in range(ITERATIONS):
+        run()
+    return (time.process_time() - start) / ITERATIONS * 1000
+
+
+def main():
+    with app.app_context():
+        init_db()
+    client = app.test_client()
+    assert client.post('/register', json={'name': 'Bench', 'email': 'bench@example.com',
+                                          'password': 'secret'}).status_code == 201
+    credentials = {'email': 'bench@example.com', 'password': 'secret'}
+
+    def login():
+        assert client.post('/login', json=credentials).status_code == 200
+
+    refresh_token = [client.post('/login', json=credentials).json['refresh_token']]
+
+    def refresh():
+        response = client.post('/token/refresh', json={'refresh_token': refresh_token[0]})
+        assert response.status_code == 200
+        refresh_token[0] = response.json['refresh_token']
+
+    login_ms = cpu_ms(login)
+    refresh_ms = cpu_ms(refresh)
+    print(f'CPU per call ({app.config["PASSWORD_HASH_METHOD"]}, {ITERATIONS} iterations)')
+    print(f'  login          {login_ms:8.2f} ms')
+    print(f'  token refresh  {refresh_ms:8.2f} ms')
+
+    access_hours = app.config['ACCESS_TOKEN_TTL'].total_seconds() / 3600
+    refresh_weeks = app.config['REFRESH_TOKEN_TTL'].days / 7
+    before = DAYS_PER_WEEK * login_ms
+    refreshes = DAYS_PER_WEEK * HOURS_PER_DAY / access_hours
+    after = login_ms / refresh_weeks + refreshes * refresh_ms
+    print(f'\nper active user per week ({DAYS_PER_WEEK} days x {HOURS_PER_DAY} h)')
+    print(f'  24 h tokens      {DAYS_PER_WEEK:5} logins                          {before:8.1f} ms')
+    print(f'  refresh tokens   {1 / refresh_weeks:5.2f} logins + {refreshes:4.0f} refreshes        {after:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Attendance writes/sec with one writer thread per professor, single database vs per-professor shards.
+
+    python benchmarks/bench_sharding.py [professors] [marks_per_professor]
+"""
+import datetime
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import jwt
+
+WORKDIR = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(WORKDIR, 'bench_sharding.db')}"
+os.environ['RATE_LIMIT_ENABLED'] = '0'  # measures storage throughput, not the limiter
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import create_app  # noqa: E402
+from api.extensions import db  # noqa: E402
+from api.models import Professor, Student, Subject, StudentSubject, Class, init_db  # noqa: E402
+from api.sharding import split_database  # noqa: E402
+
+PROFESSORS = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+MARKS = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+CONFIG = {'SHARD_DIR': os.path.join(WORKDIR, 'shards')}
+
+
+def populate(app):
+    """One subject and MARKS enrolled students per professor, with one class per run."""
+    professors = []
+    for p in range(PROFESSORS):
+        professor = Professor(name=f'P{p}', email=f'p{p}@example.com', password='x')
+        subject = Subject(name='Bench subject', professor=professor)
+        students = [Student(first_name='S', last_name=str(i), email=f'{p}.{i}@example.com', professor=professor)
+                    for i in range(MARKS)]
+        classes = [Class(professor=professor, subject=subject) for _ in range(2)]
+        db.session.add_all([professor, subject] + students + classes)
+        db.session.flush()
+        db.session.add_all([StudentSubject(student_id=s.id, subject_id=subject.id) for s in students])
+        token = jwt.encode({'id': professor.id, 'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)},
+                           app.config['SECRET_KEY'])
+        professors.append((token, [c.id for c in classes], [s.id for s in students]))
+    db.session.commit()
+    return professors
+
+
+def burst(app, professors, run):
+    failures = []
+
+    def worker(token, class_id, student_ids):
+        client = app.test_client()
+        for student_id in student_ids:
+            response = client.post(f'/classes/{class_id}/attendance', json={'student_id': student_id},
+                                   headers={'x-access-token': token})
+            if response.status_code != 201:
+                failures.append(response.status_code)
+
+    threads = [threading.Thread(target=worker, args=(token, class_ids[run], student_ids))
+               for token, class_ids, student_ids in professors]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return PROFESSORS * MARKS / elapsed, len(failures)
+
+
+def main():
+    single = create_app(CONFIG)
+    with single.app_context():
+        init_db()
+        professors = populate(single)
+        split_database()
+    sharded = create_app(dict(CONFIG, SHARDING_ENABLED=True))
+
+    print(f'{PROFESSORS} professors x {MARKS} marks, one writer thread each')
+    for run, (label, app) in enumerate((('single db', single), ('sharded', sharded))):
+        rate, failed = burst(app, professors, run)
+        print(f'{label:<10} {rate:8.0f} writes/s, {failed} failed')
+
+
+if __name__ == '__main__':
+    main()
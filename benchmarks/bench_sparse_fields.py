@@ -0,0 +1,79 @@
+"""
+Payload size and server time of list and report endpoints on a large roster, returned in full
+and trimmed with ?fields= to what a screen actually shows.
+
+    python benchmarks/bench_sparse_fields.py [iterations]
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+import jwt
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_sparse_fields.db')}"
+os.environ['RATE_LIMIT_ENABLED'] = '0'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import create_app  # noqa: E402
+from api.extensions import db  # noqa: E402
+from api.models import Professor, Student, Subject, StudentSubject, Class, Attendance, init_db  # noqa: E402
+
+app = create_app()
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+STUDENTS = 2000
+CLASSES = 30
+
+
+def populate():
+    professor = Professor(name='Bench', email='bench@example.com', password='x')
+    subject = Subject(name='Bench subject', professor=professor)
+    students = [Student(first_name=f'First{i}', last_name=f'Last{i}', email=f'student{i}@example.com',
+                        professor=professor) for i in range(STUDENTS)]
+    db.session.add_all([professor, subject] + students)
+    db.session.flush()
+    db.session.add_all([StudentSubject(student_id=s.id, subject_id=subject.id) for s in students])
+    start = datetime.date(2025, 2, 1)
+    classes = [Class(professor_id=professor.id, subject_id=subject.id, date=start + datetime.timedelta(days=i))
+               for i in range(CLASSES)]
+    db.session.add_all(classes)
+    db.session.flush()
+    db.session.add_all([Attendance(class_id=c.id, student_id=s.id, status='present' if (i + j) % 4 else 'absent')
+                        for i, c in enumerate(classes) for j, s in enumerate(students)])
+    db.session.commit()
+    token = jwt.encode({'id': professor.id, 'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)},
+                       app.config['SECRET_KEY'])
+    return token, subject.id, classes[0].id
+
+
+def main():
+    with app.app_context():
+        init_db()
+        token, subject_id, class_id = populate()
+
+    headers = {'x-access-token': token}
+    client = app.test_client()
+    cases = [
+        ('/students', 'id,first_name,last_name'),
+        (f'/classes/{class_id}', 'student_id,status'),
+        (f'/subject/{subject_id}/students', 'id'),
+        (f'/subject/{subject_id}/report', 'students.id,students.rate'),
+    ]
+
+    print(f'{ITERATIONS} x each read ({STUDENTS} students, {CLASSES} classes)')
+    print(f'{"endpoint":32} {"fields":26} {"bytes":>9} {"ms":>8}')
+    for path, fields in cases:
+        for query in ('', f'?fields={fields}'):
+            response = client.get(path + query, headers=headers)
+            assert response.status_code == 200, (path + query, response.json)
+            start = time.perf_counter()
+            for _ in range(ITERATIONS):
+                client.get(path + query, headers=headers)
+            elapsed = (time.perf_counter() - start) / ITERATIONS * 1000
+            print(f'{path:32} {fields if query else "(all)":26} {len(response.data):9} {elapsed:8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+One student's attendance across all of a professor's subjects: GET /students/<id>/attendance
+against rebuilding it from /subject/<id>/classes and /classes/<id> for every class of every
+subject, the only way before the endpoint existed. Server time and request count per summary.
+
+    python benchmarks/bench_student_attendance.py [iterations]
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+import jwt
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_student_attendance.db')}"
+os.environ['RATE_LIMIT_ENABLED'] = '0'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import create_app  # noqa: E402
+from api.extensions import db  # noqa: E402
+from api.models import Professor, Student, Subject, StudentSubject, Class, Attendance, init_db  # noqa: E402
+
+app = create_app()
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+SUBJECTS = 6
+STUDENTS = 40
+CLASSES = 60
+
+
+def populate():
+    professor = Professor(name='Bench', email='bench@example.com', password='x')
+    subjects = [Subject(name=f'Subject {i}', professor=professor) for i in range(SUBJECTS)]
+    students = [Student(first_name='S', last_name=str(i), email=f's{i}@example.com', professor=professor)
+                for i in range(STUDENTS)]
+    db.session.add_all([professor] + subjects + students)
+    db.session.flush()
+    db.session.add_all([StudentSubject(student_id=s.id, subject_id=subject.id) for subject in subjects for s in students])
+    start = datetime.date(2025, 2, 1)
+    classes = [Class(professor_id=professor.id, subject_id=subject.id, date=start + datetime.timedelta(days=i))
+               for subject in subjects for i in range(CLASSES)]
+    db.session.add_all(classes)
+    db.session.flush()
+    db.session.add_all([Attendance(class_id=c.id, student_id=s.id, status='present' if (i + j) % 5 else 'absent')
+                        for i, c in enumerate(classes) for j, s in enumerate(students)])
+    db.session.commit()
+    token = jwt.encode({'id': professor.id, 'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)},
+                       app.config['SECRET_KEY'])
+    return token, [subject.id for subject in subjects], students[0].id
+
+
+def main():
+    with app.app_context():
+        init_db()
+        token, subject_ids, student_id = populate()
+
+    headers = {'x-access-token': token}
+    client = app.test_client()
+
+    def endpoint():
+        response = client.get(f'/students/{student_id}/attendance', headers=headers)
+        assert response.status_code == 200
+        return {entry['subject_id']: entry['attended'] for entry in response.json['subjects']}, 1
+
+    def per_class():
+        attended, requests = {}, 0
+        for subject_id in subject_ids:
+            classes = client.get(f'/subject/{subject_id}/classes?limit=1000', headers=headers).json['classes']
+            requests += 1
+            attended[subject_id] = 0
+            for class_ in classes:
+                entries = client.get(f"/classes/{class_['id']}", headers=headers).json['attendance']
+                requests += 1
+                attended[subject_id] += any(e['student_id'] == student_id and e['status'] == 'present'
+                                            for e in entries)
+        return attended, requests
+
+    assert endpoint()[0] == per_class()[0]
+    print(f'{ITERATIONS} x one student summary ({SUBJECTS} subjects x {CLASSES} classes, {STUDENTS} students each)')
+    for name, run in (('per class', per_class), ('endpoint', endpoint)):
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            _, requests = run()
+        print(f'{name:10} {(time.perf_counter() - start) / ITERATIONS * 1000:8.2f} ms  {requests:4} requests')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Per-request cost of tracing: off, on but not sampled, and every request traced.
+
+    python benchmarks/bench_tracing.py [requests]
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+import jwt
+
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_tracing.db')}"
+os.environ['RATE_LIMIT_ENABLED'] = '0'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import create_app  # noqa: E402
+from api.extensions import db  # noqa: E402
+from api.models import Professor, Student, init_db  # noqa: E402
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+STUDENTS = 50
+
+
+def populate(app):
+    professor = Professor(name='Bench', email='bench@example.com', password='x')
+    db.session.add_all([professor] + [Student(first_name='S', last_name=str(i), email=f's{i}@example.com',
+                                              professor=professor) for i in range(STUDENTS)])
+    db.session.commit()
+    return jwt.encode({'id': professor.id, 'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)},
+                      app.config['SECRET_KEY'])
+
+
+def per_request(app, token, traced):
+    client = app.test_client()
+    headers = {'x-access-token': token}
+    client.get('/students', headers=headers)  # warm up
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        if traced:
+            headers['X-Trace-Id'] = uuid.uuid4().hex
+        client.get('/students', headers=headers)
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+
+def main():
+    instance = tempfile.mkdtemp()
+    cases = [
+        ('tracing off', {'TRACING_ENABLED': False}, False),
+        ('on, not sampled', {'TRACING_ENABLED': True, 'TRACE_SAMPLE_RATE': 0.0}, False),
+        ('on, every request', {'TRACING_ENABLED': True}, True),
+    ]
+    apps = [(name, create_app(config), traced) for name, config, traced in cases]
+    for _, app, _ in apps:
+        app.instance_path = instance
+    with apps[0][1].app_context():
+        init_db()
+        token = populate(apps[0][1])
+
+    print(f'{REQUESTS} x GET /students ({STUDENTS} students)')
+    for name, app, traced in apps:
+        print(f'{name:18} {per_request(app, token, traced):7.0f} us/request')
+
+
+if __name__ == '__main__':
+    main()
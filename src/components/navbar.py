@@ -30,4 +30,8 @@ def navbar(page_data: PageData, current_page=1):
     )
 
     def handle_change(e):
+        # Deferred: subject_cache imports route_guard, which imports this module
+        from src.utils.subject_cache import SubjectCache
+
+        SubjectCache.cancel()
         page_data.navigate(pages[int(e.data)])
@@ -0,0 +1,59 @@
+import os
+
+import flet as ft
+
+from src.utils.perf import Perf
+
+# Show the overlay from the start; otherwise Ctrl+Shift+P toggles it
+SHOW_ON_START = os.environ.get('CHECKMATE_PERF_OVERLAY', '0') == '1'
+MAX_ROWS = 15
+
+
+class PerfOverlay:
+
+    def __init__(self, page: ft.Page):
+        self.page = page
+        self.rows = ft.Column(spacing=2, tight=True)
+        self.container = ft.Container(
+            content=self.rows,
+            bgcolor=ft.Colors.BLACK,
+            opacity=0.85,
+            padding=8,
+            border_radius=6,
+            right=8,
+            top=8,
+            visible=False,
+        )
+
+    def attach(self):
+        Perf.overlay = self
+        previous = self.page.on_keyboard_event
+
+        def on_key(e: ft.KeyboardEvent):
+            if e.ctrl and e.shift and e.key.upper() == 'P':
+                self.toggle()
+            elif previous:
+                previous(e)
+
+        self.page.on_keyboard_event = on_key
+        if SHOW_ON_START:
+            self.toggle()
+
+    def toggle(self):
+        self.container.visible = not self.container.visible
+        self.refresh()
+
+    def refresh(self):
+        if not self.container.visible:
+            return
+        # The loader clears page.overlay, so put the panel back if it went with it
+        if self.container not in self.page.overlay:
+            self.page.overlay.append(self.container)
+
+        def text(value):
+            return ft.Text(value, size=11, color=ft.Colors.WHITE, font_family='monospace')
+
+        self.rows.controls = [text(f"{'metric':<40} {'n':>4} {'p50 ms':>8} {'p95 ms':>8}")]
+        for kind, name, count, p50, p95 in Perf.stats()[:MAX_ROWS]:
+            self.rows.controls.append(text(f"{(kind + ' ' + name)[:40]:<40} {count:>4} {p50:>8.1f} {p95:>8.1f}"))
+        self.page.update()
@@ -1,15 +1,11 @@
 import flet as ft
-import requests
 from flet_navigator import PublicFletNavigator, PageData, route
 
-from src.screens.profile_screen import profile_screen
-from src.screens.students_screen import students_screen
-from src.screens.subject.subject_detail_screen import subject_detail_screen
-from src.screens.subject.subject_report_screen import subject_report_screen
-from src.screens.subjects_screen import subjects_screen
-from src.screens.login_screen import login_screen
-from src.screens.register_screen import register_screen
+from src.components.perf_overlay import PerfOverlay
+from src.utils.global_state import GlobalState
+from src.utils.perf import Perf
 from src.utils.route_guard import auth_guard, guests_guard
+from src.utils.screen_loader import load_screen
 
 
 # Backend URL
@@ -17,37 +13,50 @@ from src.utils.route_guard import auth_guard, guests_guard
 
 @route('/')
 def main(page_data: PageData) -> None:
-    guests_guard(page_data, 'CheckMate | Prijava', login_screen)
+    guests_guard(page_data, 'CheckMate | Prijava', load_screen('login'))
 
 
 @route
 def register(page_data: PageData) -> None:
-    guests_guard(page_data, 'CheckMate | Registracija', register_screen)
+    guests_guard(page_data, 'CheckMate | Registracija', load_screen('register'))
 
 
 @route
 def subjects(page_data: PageData) -> None:
-    auth_guard(page_data, "CheckMate | Predmeti", subjects_screen)
+    auth_guard(page_data, "CheckMate | Predmeti", load_screen('subjects'))
 
 
 @route
 def students(page_data: PageData) -> None:
-    auth_guard(page_data, "CheckMate | Studenti", students_screen)
+    auth_guard(page_data, "CheckMate | Studenti", load_screen('students'))
 
 
 @route
 def profile(page_data: PageData) -> None:
-    auth_guard(page_data, "CheckMate | Profil", profile_screen)
+    auth_guard(page_data, "CheckMate | Profil", load_screen('profile'))
+
+
+@route
+def student_profile(page_data: PageData) -> None:
+    auth_guard(page_data, "CheckMate | Student", load_screen('student_profile'))
 
 
 @route
 def subject_detail(page_data: PageData) -> None:
-    auth_guard(page_data, "CheckMate | Subject Detail", subject_detail_screen)
+    auth_guard(page_data, "CheckMate | Subject Detail", load_screen('subject_detail'))
 
 
 @route
 def subject_report(page_data: PageData) -> None:
-    auth_guard(page_data, "CheckMate | Subject Detail", subject_report_screen)
+    auth_guard(page_data, "CheckMate | Subject Detail", load_screen('subject_report'))
+
+
+def app(page: ft.Page) -> None:
+    # A saved, unexpired session skips the login screen without contacting the server
+    GlobalState.attach_storage(page.client_storage)
+    Perf.instrument_page(page)
+    PerfOverlay(page).attach()
+    PublicFletNavigator(page).render(page)
 
 
-ft.app(lambda page: PublicFletNavigator(page).render(page))
+ft.app(app)
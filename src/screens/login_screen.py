@@ -1,13 +1,14 @@
 import flet as ft, asyncio
-import requests
 # from components.button import form_button
 from flet_navigator import PageData
 
 from src.components.loader import Loader
 from src.components.responsive_card import ResponsiveForm
 from src.components.snack_bar import SnackBar
+from src.utils import http
 from src.utils.global_state import GlobalState
 from src.utils.route_guard import BASE_URL
+from src.utils.screen_loader import prefetch_screens
 
 
 def login_screen(page_data: PageData) -> None:
@@ -20,14 +21,16 @@ def login_screen(page_data: PageData) -> None:
 
         try:
             # Send login request to the backend
-            response = requests.post(f"{BASE_URL}/login", json={"email": email, "password": password})
+            response = http.post(f"{BASE_URL}/login", json={"email": email, "password": password})
 
             if response.status_code == 200:
                 data = response.json()
-                token = data.get('token')  # Extract the token from the response
 
-                # Save the logged-in user in global state
-                GlobalState.set_user({"email": email, "token": token})
+                # Save the logged-in user and their tokens in global state
+                GlobalState.set_user({"email": email, "token": data.get('token'),
+                                      "refresh_token": data.get('refresh_token'),
+                                      "refresh_expires_in": data.get('refresh_expires_in')})
+                prefetch_screens()
 
                 # Show success message and navigate to the subjects screen
                 page.overlay.append(SnackBar('Uspešna prijava!', duration=2500))
@@ -1,9 +1,10 @@
 import flet as ft
 from flet_navigator import PageData
-import requests
 
 from src.components.navbar import navbar
+from src.utils import http
 from src.utils.global_state import GlobalState
+from src.utils.perf import timed_action
 from src.utils.route_guard import BASE_URL
 
 
@@ -16,43 +17,27 @@ def profile_screen(page_data: PageData) -> ft.Control:
     token = GlobalState.get_user().get("token")
     headers = {"x-access-token": token}
 
-    # Fetch data for dropdown
-    def fetch_students():
+    # Fetch data for dropdowns: students and subjects in one batched round trip
+    def fetch_students_and_subjects():
         try:
-            response = requests.get(f"{BASE_URL}/students", headers=headers)
-            if response.status_code == 200:
-                return response.json().get("students", [])
+            students_response, subjects_response = http.batch(
+                BASE_URL, [("/students", {"fields": "id,first_name,last_name"}), "/subjects"], headers=headers)
+            if students_response.status_code == 200 and subjects_response.status_code == 200:
+                return students_response.json().get("students", []), subjects_response.json().get("subjects", [])
             else:
-                page.snack_bar = ft.SnackBar(ft.Text("Failed to fetch students!"))
+                page.snack_bar = ft.SnackBar(ft.Text("Failed to fetch students and subjects!"))
                 page.snack_bar.open = True
                 page.update()
-                return []
+                return [], []
         except Exception as e:
-            page.snack_bar = ft.SnackBar(ft.Text(f"Error fetching students: {str(e)}"))
+            page.snack_bar = ft.SnackBar(ft.Text(f"Error fetching students and subjects: {str(e)}"))
             page.snack_bar.open = True
             page.update()
-            return []
-
-    def fetch_subjects():
-        try:
-            response = requests.get(f"{BASE_URL}/subjects", headers=headers)
-            if response.status_code == 200:
-                return response.json().get("subjects", [])
-            else:
-                page.snack_bar = ft.SnackBar(ft.Text("Failed to fetch subjects!"))
-                page.snack_bar.open = True
-                page.update()
-                return []
-        except Exception as e:
-            page.snack_bar = ft.SnackBar(ft.Text(f"Error fetching subjects: {str(e)}"))
-            page.snack_bar.open = True
-            page.update()
-            return []
+            return [], []
 
     # Open assign student to subject dialog
     def show_assign_student_dialog(e):
-        students = fetch_students()
-        subjects = fetch_subjects()
+        students, subjects = fetch_students_and_subjects()
 
         if not students or not subjects:
             page.snack_bar = ft.SnackBar(ft.Text("Students or subjects data is missing!"))
@@ -77,6 +62,7 @@ def profile_screen(page_data: PageData) -> ft.Control:
             width=400,
         )
 
+        @timed_action('assign_student')
         def submit_assignment(e):
             student_id = student_dropdown.value
             subject_id = subject_dropdown.value
@@ -89,7 +75,7 @@ def profile_screen(page_data: PageData) -> ft.Control:
 
             data = {"student_id": student_id, "subject_id": subject_id}
             try:
-                response = requests.post(f"{BASE_URL}/assign_student", json=data, headers=headers)
+                response = http.post(f"{BASE_URL}/assign_student", json=data, headers=headers)
                 if response.status_code == 200:
                     page.snack_bar = ft.SnackBar(ft.Text("Student assigned to subject successfully!"))
                 else:
@@ -121,6 +107,13 @@ def profile_screen(page_data: PageData) -> ft.Control:
 
     # Logout function
     def logout_user(_):
+        # End the session on the server too, so its refresh token cannot be used again
+        refresh_token = (GlobalState.get_user() or {}).get("refresh_token")
+        if refresh_token:
+            try:
+                http.post(f"{BASE_URL}/token/revoke", json={"refresh_token": refresh_token})
+            except Exception:
+                pass  # the session is cleared locally either way; the token expires on its own
         GlobalState.clear_token()
         page_data.navigate("main")
 
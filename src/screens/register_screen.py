@@ -1,11 +1,11 @@
 import flet as ft
 import asyncio
-import requests
 from flet_navigator import PageData
 
 from src.components.loader import Loader
 from src.components.responsive_card import ResponsiveForm
 from src.components.snack_bar import SnackBar, SnackBarTypes  # Custom SnackBar
+from src.utils import http
 from src.utils.route_guard import BASE_URL
 
 
@@ -23,7 +23,7 @@ def register_screen(page_data: PageData):
 
         try:
             # Send a POST request to register the user
-            response = requests.post(
+            response = http.post(
                 f'{BASE_URL}/register',
                 json={
                     "name": name,
@@ -0,0 +1,77 @@
+import flet as ft
+from flet_navigator import PageData
+from src.utils import http
+from src.utils.global_state import GlobalState
+from src.utils.route_guard import BASE_URL
+
+
+def student_profile_screen(page_data: PageData) -> ft.Control:
+    page = page_data.page
+    # Retrieve the student id from the page parameters.
+    student_id = page_data.parameters.get("id")
+    token = GlobalState.get_user().get("token")
+    headers = {"x-access-token": token}
+
+    def show_snackbar(message, success):
+        page.snack_bar = ft.SnackBar(
+            ft.Text(message, color=ft.colors.GREEN if success else ft.colors.RED)
+        )
+        page.snack_bar.open = True
+        page.update()
+
+    # The student's attendance in every subject, in one request.
+    def fetch_attendance():
+        try:
+            response = http.get(f"{BASE_URL}/students/{student_id}/attendance", headers=headers)
+            if response.status_code == 200:
+                return response.json()
+            show_snackbar("Failed to load student attendance", False)
+            return None
+        except Exception as e:
+            show_snackbar(f"Error fetching student attendance: {str(e)}", False)
+            return None
+
+    def rate_text(rate):
+        return "No classes yet" if rate is None else f"{rate:.0%}"
+
+    def subject_card(subject):
+        recent = subject["recent_absences"]
+        return ft.Card(
+            content=ft.Container(
+                padding=10,
+                content=ft.Column([
+                    ft.Text(subject["subject_name"], weight=ft.FontWeight.BOLD),
+                    ft.Text(f"Attended {subject['attended']} of {subject['classes']} classes "
+                            f"({rate_text(subject['rate'])}), {subject['absences']} absences"),
+                    ft.Text(f"Recent absences: {', '.join(recent)}" if recent else "No recent absences",
+                            size=12, color=ft.colors.GREY),
+                ])
+            )
+        )
+
+    data = fetch_attendance()
+    content = ft.Column(scroll=ft.ScrollMode.AUTO, expand=True)
+    if data:
+        student = data["student"]
+        content.controls.append(
+            ft.Text(f"{student['first_name']} {student['last_name']}", size=20, weight=ft.FontWeight.BOLD)
+        )
+        content.controls.append(
+            ft.Text(f"Overall: attended {data['attended']} of {data['classes']} classes ({rate_text(data['rate'])})")
+        )
+        content.controls.append(ft.Divider())
+        if data["subjects"]:
+            content.controls.extend(subject_card(subject) for subject in data["subjects"])
+        else:
+            content.controls.append(ft.Text("Not enrolled in any subject."))
+
+    # Set up the AppBar with a back button.
+    page.appbar = ft.AppBar(
+        title=ft.Text("Student"),
+        leading=ft.IconButton(
+            ft.icons.ARROW_BACK,
+            on_click=lambda e: page_data.navigate("students")
+        )
+    )
+
+    return ft.Container(content=content, expand=True, padding=10)
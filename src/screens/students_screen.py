@@ -1,9 +1,12 @@
+import uuid
+
 import flet as ft
 from flet_navigator import PageData
 from src.components.navbar import navbar
-import requests
 
+from src.utils import http
 from src.utils.global_state import GlobalState
+from src.utils.perf import timed_action
 from src.utils.route_guard import BASE_URL
 
 
@@ -15,7 +18,7 @@ def students_screen(page_data: PageData) -> ft.Control:
         token = GlobalState.get_user().get("token")
         headers = {"x-access-token": token}
         try:
-            response = requests.get(f"{BASE_URL}/students", headers=headers)
+            response = http.get(f"{BASE_URL}/students", headers=headers)
             if response.status_code == 200:
                 students = response.json().get("students", [])
                 return students if students else []
@@ -35,10 +38,13 @@ def students_screen(page_data: PageData) -> ft.Control:
         first_name_field = ft.TextField(label="First Name", autofocus=True)
         last_name_field = ft.TextField(label="Last Name")
         email_field = ft.TextField(label="Email")
+        # One key per dialog, so a retried submit cannot add the student twice
+        idempotency_key = uuid.uuid4().hex
 
+        @timed_action('add_student')
         def submit_student(e):
             token = GlobalState.get_user().get("token")
-            headers = {"x-access-token": token}
+            headers = {"x-access-token": token, "Idempotency-Key": idempotency_key}
             data = {
                 "first_name": first_name_field.value,
                 "last_name": last_name_field.value,
@@ -46,7 +52,7 @@ def students_screen(page_data: PageData) -> ft.Control:
             }
 
             try:
-                response = requests.post(f"{BASE_URL}/students", json=data, headers=headers)
+                response = http.post(f"{BASE_URL}/students", json=data, headers=headers)
                 if response.status_code == 201:
                     page.snack_bar = ft.SnackBar(ft.Text("Student added successfully!"))
                     load_students()
@@ -84,6 +90,8 @@ def students_screen(page_data: PageData) -> ft.Control:
                         title=ft.Text(f"{student['first_name']} {student['last_name']}"),
                         subtitle=ft.Text(student['email']),
                         leading=ft.Icon(ft.icons.PERSON),
+                        on_click=lambda e, s_id=student["id"]: page_data.navigate("student_profile",
+                                                                                  parameters={"id": s_id}),
                     )
                 )
         else:
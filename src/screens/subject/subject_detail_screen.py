@@ -1,9 +1,12 @@
 import datetime
+import uuid
 import flet as ft
 from flet_navigator import PageData
-import requests
+from src.utils import http
 from src.utils.global_state import GlobalState
+from src.utils.perf import timed_action
 from src.utils.route_guard import BASE_URL
+from src.utils.subject_cache import SubjectCache
 
 
 def subject_detail_screen(page_data: PageData) -> ft.Control:
@@ -42,19 +45,17 @@ def subject_detail_screen(page_data: PageData) -> ft.Control:
     # ---------------------------
     # Data Fetching Functions
     # ---------------------------
+    # Students and classes usually come straight from the cache the subjects list warmed
     def fetch_subject_details():
         try:
-            response = requests.get(
-                f"{BASE_URL}/subject/{subject_id}/students", headers=headers
-            )
-            return response.json() if response.status_code == 200 else {}
+            return SubjectCache.get(token, "students", subject_id)
         except Exception as e:
             show_snackbar(f"Error fetching subject: {str(e)}", False)
             return {}
 
     def fetch_available_students():
         try:
-            response = requests.get(f"{BASE_URL}/students", headers=headers)
+            response = http.get(f"{BASE_URL}/students", params={"fields": "id,first_name,last_name"}, headers=headers)
             if response.status_code == 200:
                 all_students = response.json().get("students", [])
                 # Filter out students already enrolled in the subject
@@ -71,13 +72,7 @@ def subject_detail_screen(page_data: PageData) -> ft.Control:
         (Requires that your backend implements GET /subject/<subject_id>/classes)
         """
         try:
-            response = requests.get(
-                f"{BASE_URL}/subject/{subject_id}/classes", headers=headers
-            )
-            if response.status_code == 200:
-                return response.json().get("classes", [])
-            else:
-                return []
+            return SubjectCache.get(token, "classes", subject_id).get("classes", [])
         except Exception as ex:
             show_snackbar(f"Error fetching classes: {str(ex)}", False)
             return []
@@ -103,6 +98,7 @@ def subject_detail_screen(page_data: PageData) -> ft.Control:
             autofocus=True
         )
 
+        @timed_action('assign_student')
         def assign_student(e):
             if not student_dropdown.value:
                 return
@@ -113,7 +109,7 @@ def subject_detail_screen(page_data: PageData) -> ft.Control:
             }
 
             try:
-                response = requests.post(
+                response = http.post(
                     f"{BASE_URL}/assign_student", json=data, headers=headers
                 )
                 if response.status_code == 201:
@@ -137,12 +133,16 @@ def subject_detail_screen(page_data: PageData) -> ft.Control:
 
     def show_create_class_dialog(e):
         today = datetime.date.today().isoformat()
+        # One key per dialog, so a double tap or a retried request creates a single class
+        idempotency_key = uuid.uuid4().hex
 
+        @timed_action('create_class')
         def create_class(e):
             data = {"subject_id": int(subject_id)}
             try:
-                response = requests.post(
-                    f"{BASE_URL}/classes", json=data, headers=headers
+                response = http.post(
+                    f"{BASE_URL}/classes", json=data,
+                    headers={**headers, "Idempotency-Key": idempotency_key}
                 )
                 if response.status_code == 201:
                     show_snackbar("Class created successfully!", True)
@@ -164,16 +164,66 @@ def subject_detail_screen(page_data: PageData) -> ft.Control:
         )
         open_dialog(dialog)
 
+    def show_schedule_dialog(e):
+        today = datetime.date.today()
+        start_field = ft.TextField(label="First day (YYYY-MM-DD)", value=today.isoformat())
+        end_field = ft.TextField(label="Last day (YYYY-MM-DD)",
+                                 value=(today + datetime.timedelta(weeks=15)).isoformat())
+        weekday_boxes = [ft.Checkbox(label=day, value=False, data=day.lower())
+                         for day in ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat")]
+        exclude_field = ft.TextField(label="Skip dates (comma separated, optional)")
+        # The server skips days that already have a class, so re-sending a schedule is harmless
+        idempotency_key = uuid.uuid4().hex
+
+        @timed_action('create_schedule')
+        def create_schedule(e):
+            data = {
+                "start": start_field.value.strip(),
+                "end": end_field.value.strip(),
+                "weekdays": [cb.data for cb in weekday_boxes if cb.value],
+                "exclude": [d.strip() for d in exclude_field.value.split(",") if d.strip()],
+            }
+            try:
+                response = http.post(
+                    f"{BASE_URL}/subject/{subject_id}/schedule", json=data,
+                    headers={**headers, "Idempotency-Key": idempotency_key}
+                )
+                if response.status_code == 201:
+                    show_snackbar(response.json().get("message", "Schedule created!"), True)
+                    refresh_classes()
+                    close_dialog(dialog)
+                else:
+                    show_snackbar(response.json().get("message", "Scheduling failed"), False)
+            except Exception as e:
+                show_snackbar(f"Error: {str(e)}", False)
+
+        dialog = ft.AlertDialog(
+            title=ft.Text("Schedule Classes"),
+            content=ft.Column([
+                start_field,
+                end_field,
+                ft.Row(weekday_boxes, wrap=True),
+                exclude_field,
+            ], tight=True),
+            actions=[
+                ft.TextButton("Cancel", on_click=lambda e: close_dialog(dialog)),
+                ft.TextButton("Schedule", on_click=create_schedule),
+            ],
+        )
+        open_dialog(dialog)
+
     # ---------------------------
     # Refresh Functions
     # ---------------------------
     def refresh_data():
         nonlocal subject_data
+        SubjectCache.invalidate(subject_id, "students")
         subject_data = fetch_subject_details()
         load_students()
 
     def refresh_classes():
         # Refresh the classes dropdown by re-fetching classes.
+        SubjectCache.invalidate(subject_id, "classes")
         classes = fetch_classes()
         class_dropdown.options = [
             ft.dropdown.Option(
@@ -212,6 +262,7 @@ def subject_detail_screen(page_data: PageData) -> ft.Control:
     # ---------------------------
     # Attendance Submission
     # ---------------------------
+    @timed_action('save_attendance')
     def save_attendance(e):
         if not class_dropdown.value:
             show_snackbar("Please select a class first.", False)
@@ -224,6 +275,7 @@ def subject_detail_screen(page_data: PageData) -> ft.Control:
             if cb.value:  # if the checkbox is checked
                 selected_attendance.append({
                     "student_id": cb.data,
+                    "name": cb.label,
                     "status": "present"
                 })
 
@@ -233,16 +285,30 @@ def subject_detail_screen(page_data: PageData) -> ft.Control:
 
         try:
             all_success = True
+            # Students already marked with another status than the one sent
+            conflicts = []
             # Iterate over each attendance record and POST it.
             for entry in selected_attendance:
-                response = requests.post(
+                # The key is derived from the mark itself, so saving again replays the earlier result
+                idempotency_key = f"attendance-{selected_class}-{entry['student_id']}-{entry['status']}"
+                response = http.post(
                     f"{BASE_URL}/classes/{selected_class}/attendance",
                     json={"student_id": entry["student_id"], "status": entry["status"]},
-                    headers=headers
+                    headers={**headers, "Idempotency-Key": idempotency_key}
                 )
-                if response.status_code != 201:
+                if response.status_code == 201:
+                    continue
+                # 409: the student was already marked, which is what saving asked for if the status matches
+                stored = response.json().get("status") if response.status_code == 409 else None
+                if stored == entry["status"]:
+                    continue
+                if stored:
+                    conflicts.append(f"{entry['name']} ({stored})")
+                else:
                     all_success = False
-            if all_success:
+            if conflicts:
+                show_snackbar(f"Already marked differently, not changed: {', '.join(conflicts)}", False)
+            elif all_success:
                 show_snackbar("Attendance marked successfully!", True)
             else:
                 show_snackbar("Failed to mark attendance for some students", False)
@@ -269,6 +335,7 @@ def subject_detail_screen(page_data: PageData) -> ft.Control:
         autofocus=True,
     )
     # When the dropdown value changes, update the selected class id.
+    @timed_action('select_class')
     def on_class_change(e):
         nonlocal selected_class_id
         selected_class_id = class_dropdown.value
@@ -287,6 +354,7 @@ def subject_detail_screen(page_data: PageData) -> ft.Control:
         actions=[
             ft.IconButton(ft.icons.GROUP_ADD, on_click=show_assign_student_dialog),
             ft.IconButton(ft.icons.CALENDAR_TODAY, on_click=show_create_class_dialog),
+            ft.IconButton(ft.icons.EVENT_REPEAT, on_click=show_schedule_dialog),
             # New button to view report; pass along the subject id.
             ft.IconButton(
                 ft.icons.ASSIGNMENT,
@@ -1,8 +1,13 @@
+import json
+import threading
+
 import flet as ft
 from flet_navigator import PageData
-import requests
+from src.utils import http
 from src.utils.global_state import GlobalState
-from src.utils.route_guard import BASE_URL
+from src.utils.perf import timed_action
+from src.utils.route_guard import BASE_URL, on_leave
+from src.utils.subject_cache import recent_classes_params
 
 
 def subject_report_screen(page_data: PageData) -> ft.Control:
@@ -24,10 +29,11 @@ def subject_report_screen(page_data: PageData) -> ft.Control:
         page.snack_bar.open = True
         page.update()
 
-    # Fetch all classes for the subject.
+    # Fetch the subject's most recent classes.
     def fetch_classes():
         try:
-            response = requests.get(f"{BASE_URL}/subject/{subject_id}/classes", headers=headers)
+            response = http.get(f"{BASE_URL}/subject/{subject_id}/classes", params=recent_classes_params(),
+                                headers=headers)
             if response.status_code == 200:
                 return response.json().get("classes", [])
             return []
@@ -46,55 +52,114 @@ def subject_report_screen(page_data: PageData) -> ft.Control:
         ]
         page.update()
 
+    # Enrolled students by id, ids currently shown as present, and the open event stream.
+    students_by_id = {}
+    present_ids = set()
+    event_stream = {"response": None, "class_id": None}
+
+    def student_name(student):
+        return f"{student.get('first_name', '')} {student.get('last_name', '')}"
+
+    def render_columns():
+        present_students_column.controls.clear()
+        absent_students_column.controls.clear()
+        for student_id, student in students_by_id.items():
+            column = present_students_column if student_id in present_ids else absent_students_column
+            column.controls.append(ft.Text(student_name(student), data=student_id))
+        if not present_students_column.controls:
+            present_students_column.controls.append(ft.Text("No students present"))
+        if not absent_students_column.controls:
+            absent_students_column.controls.append(ft.Text("No students absent"))
+
+    def move_to_present(student_id):
+        # Patch the two columns in place instead of rebuilding them.
+        student = students_by_id.get(student_id)
+        if student is None or student_id in present_ids:
+            return
+        present_ids.add(student_id)
+        absent_students_column.controls = [c for c in absent_students_column.controls if c.data != student_id]
+        if not absent_students_column.controls:
+            absent_students_column.controls.append(ft.Text("No students absent"))
+        present_students_column.controls = [c for c in present_students_column.controls if c.data is not None]
+        present_students_column.controls.append(ft.Text(student_name(student), data=student_id))
+        page.update()
+
+    def stop_event_stream():
+        response = event_stream["response"]
+        event_stream["response"] = event_stream["class_id"] = None
+        if response is not None:
+            response.close()
+
+    def listen_for_attendance(class_id):
+        # Runs on a background thread; GET /classes/<id>/events pushes marks as they are committed.
+        try:
+            response = http.get(f"{BASE_URL}/classes/{class_id}/events", headers=headers,
+                                stream=True, timeout=(5, None))
+            if event_stream["class_id"] != class_id:
+                response.close()
+                return
+            event_stream["response"] = response
+            for line in response.iter_lines(decode_unicode=True):
+                if event_stream["class_id"] != class_id:
+                    break
+                if line and line.startswith("data:"):
+                    event = json.loads(line[len("data:"):])
+                    if event.get("status") == "present":
+                        move_to_present(event["student_id"])
+        except Exception:
+            # The stream is a live convenience; the report itself is already loaded.
+            pass
+
+    def start_event_stream(class_id):
+        stop_event_stream()
+        event_stream["class_id"] = class_id
+        threading.Thread(target=listen_for_attendance, args=(class_id,), daemon=True).start()
+
     # When a class is selected, fetch its attendance details.
+    @timed_action('select_class')
     def on_class_change(e):
         selected_class_id = report_class_dropdown.value
         if not selected_class_id:
             return
         try:
-            response = requests.get(f"{BASE_URL}/classes/{selected_class_id}", headers=headers)
+            response = http.get(f"{BASE_URL}/classes/{selected_class_id}", headers=headers)
             if response.status_code == 200:
                 data = response.json()
                 # Use the flat structure returned by your backend.
                 attendance = data.get("attendance", [])
-                # Filter attendance records to get those with status "present".
-                present_students = [record for record in attendance if record.get("status") == "present"]
                 # Build a set of present student IDs.
-                present_ids = {record["student_id"] for record in present_students}
+                present_ids.clear()
+                present_ids.update(record["student_id"] for record in attendance if record.get("status") == "present")
 
                 # Fetch the full list of enrolled students for the subject.
-                subject_response = requests.get(f"{BASE_URL}/subject/{subject_id}/students", headers=headers)
+                students_by_id.clear()
+                subject_response = http.get(f"{BASE_URL}/subject/{subject_id}/students", headers=headers)
                 if subject_response.status_code == 200:
-                    subject_data = subject_response.json()
-                    all_students = subject_data.get("students", [])
-                    # Absent students are those not in the present_ids set.
-                    absent_students = [s for s in all_students if s["id"] not in present_ids]
-                else:
-                    absent_students = []
-
-                # Update the UI lists.
-                present_students_column.controls.clear()
-                absent_students_column.controls.clear()
-
-                if present_students:
-                    for record in present_students:
-                        name = f"{record.get('first_name', '')} {record.get('last_name', '')}"
-                        present_students_column.controls.append(ft.Text(name))
-                else:
-                    present_students_column.controls.append(ft.Text("No students present"))
-
-                if absent_students:
-                    for student in absent_students:
-                        name = f"{student.get('first_name', '')} {student.get('last_name', '')}"
-                        absent_students_column.controls.append(ft.Text(name))
-                else:
-                    absent_students_column.controls.append(ft.Text("No students absent"))
+                    for student in subject_response.json().get("students", []):
+                        students_by_id[student["id"]] = student
+                # Present students are listed even if the roster request failed.
+                for record in attendance:
+                    if record["student_id"] in present_ids:
+                        students_by_id.setdefault(record["student_id"], {
+                            "first_name": record.get("first_name", ""),
+                            "last_name": record.get("last_name", ""),
+                        })
+
+                # Update the UI lists, then keep them current from the event stream.
+                render_columns()
                 page.update()
+                start_event_stream(selected_class_id)
             else:
                 show_snackbar("Failed to load class report", False)
         except Exception as ex:
             show_snackbar(f"Error: {str(ex)}", False)
 
+    def go_back(e):
+        page_data.navigate("subject_detail", parameters={"id": subject_id})
+
+    # Close the event stream however the screen is left, including through the navbar.
+    on_leave(stop_event_stream)
+
     # Bind the on_change event of the dropdown.
     report_class_dropdown.on_change = on_class_change
     load_class_options()
@@ -104,7 +169,7 @@ def subject_report_screen(page_data: PageData) -> ft.Control:
         title=ft.Text("Subject Report"),
         leading=ft.IconButton(
             ft.icons.ARROW_BACK,
-            on_click=lambda e: page_data.navigate("subject_detail", parameters={"id": subject_id})
+            on_click=go_back
         )
     )
 
@@ -1,9 +1,13 @@
+import uuid
+
 import flet as ft
 from flet_navigator import PageData
-import requests
 
+from src.utils import http
 from src.utils.global_state import GlobalState
+from src.utils.perf import timed_action
 from src.utils.route_guard import BASE_URL
+from src.utils.subject_cache import SubjectCache
 
 
 def subjects_screen(page_data: PageData) -> ft.Control:
@@ -14,7 +18,7 @@ def subjects_screen(page_data: PageData) -> ft.Control:
         token = GlobalState.get_user().get("token")
         headers = {"x-access-token": token}
         try:
-            response = requests.get(f"{BASE_URL}/subjects", headers=headers)
+            response = http.get(f"{BASE_URL}/subjects", headers=headers)
             if response.status_code == 200:
                 subjects = response.json().get("subjects", [])
                 return subjects if subjects else []
@@ -33,10 +37,14 @@ def subjects_screen(page_data: PageData) -> ft.Control:
         # Error message label
         error_label = ft.Text("", color=ft.colors.RED, size=12)
 
+        # One key per dialog, so a retried submit cannot add the subject twice
+        idempotency_key = uuid.uuid4().hex
+
         # Submit button handler
+        @timed_action('add_subject')
         def submit_subject(e):
             token = GlobalState.get_user().get("token")
-            headers = {"x-access-token": token}
+            headers = {"x-access-token": token, "Idempotency-Key": idempotency_key}
             subject_name = subject_name_field.value.strip()
 
             if not subject_name:
@@ -46,7 +54,7 @@ def subjects_screen(page_data: PageData) -> ft.Control:
 
             data = {"name": subject_name}
             try:
-                response = requests.post(f"{BASE_URL}/subjects", json=data, headers=headers)
+                response = http.post(f"{BASE_URL}/subjects", json=data, headers=headers)
                 if response.status_code == 201:
                     show_snackbar("Subject added successfully!", success=True)
                     add_subject_dialog.open = False
@@ -95,17 +103,22 @@ def subjects_screen(page_data: PageData) -> ft.Control:
                     ft.ListTile(
                         title=ft.Text(subject["name"]),
                         leading=ft.Icon(ft.icons.BOOK),
-                        on_click=lambda e, s_id=subject["id"]: page_data.navigate(
-                            "subject_detail", parameters={"id": s_id}
-                        ),
+                        on_click=lambda e, s_id=subject["id"]: open_subject(s_id),
                     )
                 )
+            # Tapping a subject is the likely next step, so warm its detail data while the list is read
+            SubjectCache.prefetch(GlobalState.get_user().get("token"), [s["id"] for s in subjects])
         else:
             subjects_list.controls.append(
                 ft.Text("No subjects available.", size=20, text_align=ft.TextAlign.CENTER)
             )
         page.update()
 
+    def open_subject(subject_id):
+        # Leaving the list: only the tapped subject's prefetch is still worth finishing
+        SubjectCache.cancel(keep=subject_id)
+        page_data.navigate("subject_detail", parameters={"id": subject_id})
+
     # Helper to show snack bars
     def show_snackbar(message, success=True):
         page.snack_bar = ft.SnackBar(
@@ -1,14 +1,72 @@
+import base64
+import json
+import time
+
+SESSION_KEY = 'checkmate.session'
+
+# Treat a token this close to expiry as expired, so a restored session is not rejected mid-request
+EXPIRY_LEEWAY = 60
+
+
+def token_expiry(token):
+    """
+    Read `exp` from the JWT payload without verifying it; the server still verifies every request.
+    """
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload)).get('exp')
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
 class GlobalState:
     user = None
+    storage = None
+    restored = False
+
+    @classmethod
+    def attach_storage(cls, storage):
+        """Persist the session in Flet client storage (page.client_storage) from here on."""
+        cls.storage = storage
+        cls.restored = False
 
     @classmethod
     def set_user(cls, user_data):
-        cls.user = user_data
+        """Store the session; `refresh_expires_in` from the server is kept as an absolute `refresh_exp`."""
+        cls.user = dict(user_data, exp=token_expiry(user_data.get('token')))
+        refresh_expires_in = cls.user.pop('refresh_expires_in', None)
+        if refresh_expires_in is not None:
+            cls.user['refresh_exp'] = time.time() + refresh_expires_in
+        if cls.storage is not None:
+            cls.storage.set(SESSION_KEY, cls.user)
+
+    @classmethod
+    def set_tokens(cls, tokens):
+        """Replace the session's tokens with those of a login or POST /token/refresh response."""
+        cls.set_user(dict(cls.user or {}, token=tokens['token'], refresh_token=tokens['refresh_token'],
+                          refresh_expires_in=tokens['refresh_expires_in']))
+
+    @classmethod
+    def access_token_expired(cls):
+        return bool(cls.user) and (cls.user.get('exp') or 0) - EXPIRY_LEEWAY < time.time()
 
     @classmethod
     def get_user(cls):
+        if cls.user is None and not cls.restored:
+            cls.restored = True
+            if cls.storage is not None:
+                cls.user = cls.storage.get(SESSION_KEY)
+
+        # Expiry is checked locally, so an expired session falls back to login without a request. An
+        # expired access token alone does not end it: the HTTP layer refreshes it (see utils.http).
+        if cls.access_token_expired() and \
+                (not cls.user.get('refresh_token') or (cls.user.get('refresh_exp') or 0) - EXPIRY_LEEWAY < time.time()):
+            cls.clear_token()
         return cls.user
 
-    @staticmethod
-    def clear_token():
-        GlobalState.user_token = None
\ No newline at end of file
+    @classmethod
+    def clear_token(cls):
+        cls.user = None
+        if cls.storage is not None:
+            cls.storage.remove(SESSION_KEY)
@@ -0,0 +1,184 @@
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+
+from src.utils.global_state import GlobalState
+from src.utils.perf import Perf, api_name
+
+# Tracing: a sampled screen gets a trace id that every API call made from it sends in
+# TRACE_HEADER, and each call is written as a span to TRACE_DIR/<trace id>.client.json.
+# The server writes its side of the same trace under instance/traces/ (see api.tracing).
+TRACE_HEADER = 'X-Trace-Id'
+TRACE_SAMPLE_RATE = float(os.environ.get('CHECKMATE_TRACE_SAMPLE', '0'))
+TRACE_DIR = os.environ.get('CHECKMATE_TRACE_DIR', 'traces')
+# Chrome trace process ids, so client and server spans land on separate rows when merged
+CLIENT_PID = 1
+
+# Screens send the token they were built with; requests carry the session's current one instead
+ACCESS_HEADER = 'x-access-token'
+_refresh_lock = threading.Lock()
+
+# Requests shed by the server's rate limiter (429) or while it is busy (503) were not carried out,
+# so they are sent again after the Retry-After the server asks for, up to RETRY_LIMIT times
+RETRY_STATUSES = (429, 503)
+RETRY_LIMIT = 3
+RETRY_MAX_WAIT = 5  # seconds; a longer Retry-After is reported to the screen instead
+
+
+class Trace:
+    current = None  # trace id of the screen on display, or None when it is not sampled
+    _lock = threading.Lock()
+
+    @classmethod
+    def start(cls, screen):
+        """Start a new trace for a screen, subject to TRACE_SAMPLE_RATE."""
+        cls.current = None
+        if TRACE_SAMPLE_RATE and random.random() < TRACE_SAMPLE_RATE:
+            cls.current = uuid.uuid4().hex
+            cls.record(cls.current, {"name": "process_name", "ph": "M", "pid": CLIENT_PID,
+                                     "args": {"name": "client"}})
+            cls.record(cls.current, {"name": "thread_name", "ph": "M", "pid": CLIENT_PID,
+                                     "tid": threading.get_native_id(), "args": {"name": screen}})
+        return cls.current
+
+    @classmethod
+    def record(cls, trace_id, event):
+        # JSON array trace format: the closing bracket is optional, so events are appended as they finish
+        path = os.path.join(TRACE_DIR, f'{trace_id}.client.json')
+        with cls._lock:
+            os.makedirs(TRACE_DIR, exist_ok=True)
+            new = not os.path.exists(path)
+            with open(path, 'a') as out:
+                out.write(('[\n' if new else '') + json.dumps(event) + ',\n')
+
+
+def refresh_session(url, stale_token):
+    """
+    Swap the session's refresh token for new tokens at the server `url` points to. Returns the
+    access token to use, or None when the session is over and the user has to log in again.
+    """
+    with _refresh_lock:
+        user = GlobalState.get_user()
+        if not user:
+            return None
+        if user.get('token') != stale_token:
+            return user['token']  # another request refreshed while this one waited
+        if not user.get('refresh_token'):
+            GlobalState.clear_token()
+            return None
+
+        parts = urlsplit(url)
+        response = send('POST', f'{parts.scheme}://{parts.netloc}/token/refresh',
+                        json={"refresh_token": user['refresh_token']})
+        if response.status_code in (400, 401):
+            GlobalState.clear_token()
+            return None
+        if response.status_code != 200:
+            return stale_token  # server busy; the request goes ahead and reports its own error
+        GlobalState.set_tokens(response.json())
+        return GlobalState.user['token']
+
+
+def request(method, url, **kwargs):
+    """
+    send() with the session's access token: an expiring token is refreshed first, and a request
+    rejected with 401 is refreshed and retried once. Shed requests are retried by send_patiently().
+    """
+    headers = kwargs.get('headers')
+    if not headers or ACCESS_HEADER not in headers or not GlobalState.get_user():
+        return send_patiently(method, url, **kwargs)
+
+    token = GlobalState.user['token']
+    if GlobalState.access_token_expired():
+        token = refresh_session(url, token) or token
+    kwargs['headers'] = dict(headers, **{ACCESS_HEADER: token})
+    response = send_patiently(method, url, **kwargs)
+    if response.status_code == 401:
+        fresh = refresh_session(url, token)
+        if fresh and fresh != token:
+            kwargs['headers'][ACCESS_HEADER] = fresh
+            response = send_patiently(method, url, **kwargs)
+    return response
+
+
+def send_patiently(method, url, **kwargs):
+    """send(), waiting out the Retry-After of a 429 or 503 and sending again, up to RETRY_LIMIT times."""
+    for attempt in range(RETRY_LIMIT + 1):
+        response = send(method, url, **kwargs)
+        if response.status_code not in RETRY_STATUSES or attempt == RETRY_LIMIT:
+            return response
+        try:
+            wait = float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return response
+        if wait > RETRY_MAX_WAIT:
+            return response
+        time.sleep(wait)
+
+
+def send(method, url, **kwargs):
+    """
+    requests.request that times the call for Perf and, on a traced screen, attaches the trace id
+    and records the call as a span.
+    """
+    import requests
+
+    trace_id = Trace.current
+    if trace_id is not None:
+        kwargs['headers'] = dict(kwargs.get('headers') or {}, **{TRACE_HEADER: trace_id})
+    start = time.time_ns()
+    status = None
+    try:
+        response = requests.request(method, url, **kwargs)
+        status = response.status_code
+        return response
+    finally:
+        end = time.time_ns()
+        path = urlsplit(url).path
+        Perf.record('api', api_name(method, path), (end - start) / 1e6, status=status, trace=trace_id)
+        if trace_id is not None:
+            Trace.record(trace_id, {"name": f"{method} {path}", "cat": "http", "ph": "X",
+                                    "ts": start // 1000, "dur": (end - start) // 1000,
+                                    "pid": CLIENT_PID, "tid": threading.get_native_id(), "args": {"status": status}})
+
+
+class BatchResponse:
+    """One sub-response of batch(), with the parts of requests.Response the screens use."""
+
+    def __init__(self, path, status_code, body):
+        self.path = path
+        self.status_code = status_code
+        self.body = body
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+
+            raise requests.HTTPError(f"{self.status_code} for {self.path}")
+
+
+def batch(base_url, paths, **kwargs):
+    """
+    GET several paths in one POST /batch round trip. `paths` holds paths or (path, params) pairs;
+    returns a BatchResponse per path, in order. Raises for a failed batch as a whole.
+    """
+    items = [{"path": path} if isinstance(path, str) else {"path": path[0], "params": path[1]} for path in paths]
+    response = post(f"{base_url}/batch", json={"requests": items}, **kwargs)
+    response.raise_for_status()
+    return [BatchResponse(item["path"], result["status"], result["body"])
+            for item, result in zip(items, response.json()["responses"])]
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
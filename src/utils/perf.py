@@ -0,0 +1,102 @@
+import collections
+import contextlib
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+# Every sample is appended to this rotating JSON-lines log; set CHECKMATE_PERF_LOG= to turn it off
+PERF_LOG = os.environ.get('CHECKMATE_PERF_LOG', 'perf.log')
+PERF_LOG_BYTES = 1_000_000
+PERF_LOG_BACKUPS = 3
+# Recent samples kept per metric for the overlay's percentiles
+WINDOW = 200
+
+# Ids in API paths, so /classes/7 and /classes/8 share a metric
+_ID = re.compile(r'/\d+(?=/|$)')
+
+
+def api_name(method, path):
+    return f"{method} {_ID.sub('/:id', path)}"
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Perf:
+    """
+    Client timings: route renders ('render'), API calls ('api'), page.update() ('update') and user actions
+    ('action'), in milliseconds.
+    """
+    route = None  # screen on display, logged with every sample
+    overlay = None  # PerfOverlay, once attached
+    samples = {}  # (kind, name) -> recent durations
+    _lock = threading.Lock()
+    _log = None
+
+    @classmethod
+    def _logger(cls):
+        # Caller holds the lock
+        if cls._log is None:
+            cls._log = logging.getLogger('checkmate.perf')
+            cls._log.propagate = False
+            if PERF_LOG:
+                handler = RotatingFileHandler(PERF_LOG, maxBytes=PERF_LOG_BYTES, backupCount=PERF_LOG_BACKUPS)
+                cls._log.addHandler(handler)
+                cls._log.setLevel(logging.INFO)
+        return cls._log
+
+    @classmethod
+    def record(cls, kind, name, ms, **fields):
+        with cls._lock:
+            cls.samples.setdefault((kind, name), collections.deque(maxlen=WINDOW)).append(ms)
+            log = cls._logger()
+        if PERF_LOG:
+            log.info(json.dumps(dict(fields, t=round(time.time(), 3), kind=kind, name=name, ms=round(ms, 2),
+                                     route=cls.route)))
+
+    @classmethod
+    @contextlib.contextmanager
+    def timed(cls, kind, name, **fields):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cls.record(kind, name, (time.perf_counter() - start) * 1000, **fields)
+
+    @classmethod
+    def stats(cls):
+        """[(kind, name, count, p50, p95)], slowest p95 first."""
+        with cls._lock:
+            snapshot = [(key, list(values)) for key, values in cls.samples.items()]
+        rows = [(kind, name, len(values), percentile(values, 0.5), percentile(values, 0.95))
+                for (kind, name), values in snapshot if values]
+        return sorted(rows, key=lambda row: row[4], reverse=True)
+
+    @classmethod
+    def instrument_page(cls, page):
+        """Time every page.update() against the screen on display."""
+        update = page.update
+
+        def timed_update(*controls):
+            with cls.timed('update', cls.route or '-'):
+                return update(*controls)
+
+        page.update = timed_update
+
+
+def timed_action(name):
+    """Decorator timing a user action's handler end to end, including its requests and updates."""
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            with Perf.timed('action', name):
+                return handler(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -2,12 +2,43 @@ from flet_navigator import PageData, ROUTE_404
 
 from src.components.navbar import navbar
 from src.utils.global_state import GlobalState
+from src.utils.http import Trace
+from src.utils.perf import Perf
 
 
-def guests_guard(page_data: PageData, title: str, target_screen, to: str = '/'):
+# Cleanups of the screen on show (e.g. an open event stream), run when any navigation leaves it
+_teardowns = []
+
+
+def on_leave(callback):
+    """Run callback once when the current screen is replaced, whichever way the user navigates away."""
+    _teardowns.append(callback)
+
+
+def leave_screen():
+    while _teardowns:
+        try:
+            _teardowns.pop()()
+        except Exception:
+            # A failed cleanup must not stop the next screen from rendering
+            pass
+
+
+def render(page_data: PageData, target_screen):
+    leave_screen()
+    # Time to render runs from building the screen to the page.add() that first shows it
+    Perf.route = target_screen.__name__
+    Trace.start(Perf.route)
+    with Perf.timed('render', Perf.route):
+        page_data.page.add(target_screen(page_data))
+    if Perf.overlay:
+        Perf.overlay.refresh()
+
+
+def guests_guard(page_data: PageData, title: str, target_screen, to: str = 'subjects'):
     if not GlobalState.get_user():
         page_data.page.title = title
-        page_data.page.add(target_screen(page_data))
+        render(page_data, target_screen)
 
     else:
         page_data.navigate(to)
@@ -17,7 +48,7 @@ def auth_guard(page_data: PageData, title: str, target_screen):
     if GlobalState.get_user():
         navbar(page_data)
         page_data.page.title = title
-        page_data.page.add(target_screen(page_data))
+        render(page_data, target_screen)
 
     else:
         page_data.navigate_homepage()
@@ -0,0 +1,40 @@
+import importlib
+import threading
+
+# Screen name -> (module, function). Modules are imported on first navigation,
+# so the login form does not wait for screens (and their requests imports) it never shows.
+SCREENS = {
+    'login': ('src.screens.login_screen', 'login_screen'),
+    'register': ('src.screens.register_screen', 'register_screen'),
+    'subjects': ('src.screens.subjects_screen', 'subjects_screen'),
+    'students': ('src.screens.students_screen', 'students_screen'),
+    'profile': ('src.screens.profile_screen', 'profile_screen'),
+    'student_profile': ('src.screens.student_profile_screen', 'student_profile_screen'),
+    'subject_detail': ('src.screens.subject.subject_detail_screen', 'subject_detail_screen'),
+    'subject_report': ('src.screens.subject.subject_report_screen', 'subject_report_screen'),
+}
+
+# Screens a logged-in user is likely to open next, warmed up in the background after login.
+PREFETCH_AFTER_LOGIN = ['subjects', 'students', 'profile', 'subject_detail', 'subject_report']
+PREFETCH_ENABLED = True
+
+
+def load_screen(name):
+    module, function = SCREENS[name]
+    return getattr(importlib.import_module(module), function)
+
+
+def prefetch_screens(names=None):
+    """Import screen modules on a background thread so later navigations skip the import."""
+    if not PREFETCH_ENABLED:
+        return
+
+    def prefetch():
+        for name in names or PREFETCH_AFTER_LOGIN:
+            try:
+                load_screen(name)
+            except Exception:
+                # A failed prefetch is retried, and reported, by the real navigation.
+                pass
+
+    threading.Thread(target=prefetch, name='screen-prefetch', daemon=True).start()
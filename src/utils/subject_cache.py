@@ -0,0 +1,145 @@
+import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils import http
+from src.utils.route_guard import BASE_URL
+
+# Class dropdowns list the most recent classes up to today, not the whole history or scheduled ones
+RECENT_CLASSES = 20
+
+
+def recent_classes_params():
+    return {"to": datetime.date.today().isoformat(), "limit": RECENT_CLASSES}
+
+
+# What subject detail needs on open: the enrolled students and the recent classes
+ENDPOINTS = {
+    'students': ('/subject/{}/students', None),
+    'classes': ('/subject/{}/classes', recent_classes_params),
+}
+
+
+class SubjectCache:
+    """
+    Per-subject detail data, warmed in the background from the subjects list and read by subject detail.
+    """
+    ttl = 60  # seconds an entry is served without refetching
+    max_workers = 3
+    prefetch_limit = 8  # subjects warmed per list render
+
+    _entries = {}
+    _inflight = {}
+    # Reentrant: cancelling a future under the lock runs its done callback, which takes the lock again
+    _lock = threading.RLock()
+    _executor = None
+
+    @staticmethod
+    def _key(token, kind, subject_id):
+        # Route parameters and list payloads disagree on int vs str ids
+        return token, kind, str(subject_id)
+
+    @classmethod
+    def _fetch(cls, keys):
+        """Fetch entries of one token and subject, several in a single POST /batch. Returns {key: data}."""
+        token = keys[0][0]
+        requests = []
+        for _, kind, subject_id in keys:
+            path, params = ENDPOINTS[kind]
+            requests.append((path.format(subject_id), params() if params else None))
+        if len(requests) == 1:
+            path, params = requests[0]
+            responses = [http.get(f"{BASE_URL}{path}", params=params, headers={"x-access-token": token}, timeout=10)]
+        else:
+            responses = http.batch(BASE_URL, requests, headers={"x-access-token": token}, timeout=10)
+
+        fetched = {}
+        for key, response in zip(keys, responses):
+            response.raise_for_status()
+            fetched[key] = response.json()
+            with cls._lock:
+                cls._entries[key] = (time.monotonic(), fetched[key])
+        return fetched
+
+    @classmethod
+    def _missing(cls, token, subject_id):
+        # Caller holds the lock
+        keys = [cls._key(token, kind, subject_id) for kind in ENDPOINTS]
+        return [key for key in keys if cls._fresh(key) is None and key not in cls._inflight]
+
+    @classmethod
+    def _submit(cls, keys):
+        # Caller holds the lock
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(max_workers=cls.max_workers, thread_name_prefix='subject-prefetch')
+        future = cls._executor.submit(cls._fetch, keys)
+        for key in keys:
+            cls._inflight[key] = future
+            future.add_done_callback(lambda f, key=key: cls._discard(key, f))
+        return future
+
+    @classmethod
+    def _discard(cls, key, future):
+        with cls._lock:
+            if cls._inflight.get(key) is future:
+                del cls._inflight[key]
+
+    @classmethod
+    def _fresh(cls, key):
+        entry = cls._entries.get(key)
+        if entry and time.monotonic() - entry[0] < cls.ttl:
+            return entry[1]
+        return None
+
+    @classmethod
+    def prefetch(cls, token, subject_ids):
+        """Queue students and classes for the first `prefetch_limit` subjects, dropping any older queue."""
+        cls.cancel()
+        with cls._lock:
+            for subject_id in list(subject_ids)[:cls.prefetch_limit]:
+                keys = cls._missing(token, subject_id)
+                if keys:
+                    cls._submit(keys)
+
+    @classmethod
+    def cancel(cls, keep=None):
+        """Cancel queued prefetches, except those for subject `keep`. Requests already running finish."""
+        with cls._lock:
+            for (token, kind, subject_id), future in list(cls._inflight.items()):
+                if keep is None or subject_id != str(keep):
+                    future.cancel()
+
+    @classmethod
+    def get(cls, token, kind, subject_id):
+        """
+        Return cached data, wait for a prefetch already in flight, or fetch now, together with
+        the subject's other missing entries. Raises whatever the underlying request raised.
+        """
+        key = cls._key(token, kind, subject_id)
+        with cls._lock:
+            data = cls._fresh(key)
+            future = cls._inflight.get(key)
+            others = [other for other in cls._missing(token, subject_id) if other != key]
+        if data is not None:
+            return data
+        if future is not None:
+            try:
+                return future.result()[key]
+            except Exception:
+                # Cancelled or failed in the background: retry in the foreground so errors surface here
+                pass
+        return cls._fetch([key] + others)[key]
+
+    @classmethod
+    def invalidate(cls, subject_id, kind=None):
+        with cls._lock:
+            for key in list(cls._entries):
+                if key[2] == str(subject_id) and kind in (None, key[1]):
+                    del cls._entries[key]
+
+    @classmethod
+    def clear(cls):
+        cls.cancel()
+        with cls._lock:
+            cls._entries.clear()
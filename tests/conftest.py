@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import create_app  # noqa: E402
+from api.models import init_db  # noqa: E402
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Build an app on its own databases and instance folder under tmp_path."""
+    def make(**config):
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'main.db'}",
+            'SQLALCHEMY_BINDS': {'archive': f"sqlite:///{tmp_path / 'archive.db'}"},
+            'RATE_LIMIT_ENABLED': False,
+            'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+            **config
+        })
+        app.instance_path = str(tmp_path)
+        with app.app_context():
+            init_db()
+        return app
+    return make
+
+
+def login(client, name):
+    """Register a professor and return the headers of their requests."""
+    client.post('/register', json={'name': name, 'email': f'{name}@example.com', 'password': 'secret'})
+    token = client.post('/login', json={'email': f'{name}@example.com', 'password': 'secret'}).json['token']
+    return {'x-access-token': token}
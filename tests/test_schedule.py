@@ -0,0 +1,37 @@
+import datetime
+
+import pytest
+
+from conftest import login
+
+
+def rates(client, headers, subject_id, student_id):
+    summary = client.get(f'/students/{student_id}/attendance', headers=headers).json['subjects'][0]
+    report = client.get(f'/subject/{subject_id}/report', headers=headers).json
+    at_risk = client.get('/analytics/at-risk', headers=headers).json['students']
+    return summary, report['students'], len(report['classes']), at_risk
+
+
+@pytest.mark.parametrize('storage', ['rows', 'bitmap'])
+def test_scheduled_classes_do_not_count_until_held(make_app, storage):
+    client = make_app(ATTENDANCE_STORAGE=storage).test_client()
+    headers = login(client, 'ada')
+    subject_id = client.post('/subjects', json={'name': 'Math'}, headers=headers).json['subject']['id']
+    student_id = client.post('/students', json={'first_name': 'Grace', 'last_name': 'Hopper',
+                                                'email': 'grace@example.com'}, headers=headers).json['student']['id']
+    client.post('/assign_student', json={'student_id': student_id, 'subject_id': subject_id}, headers=headers)
+    class_id = client.post('/classes', json={'subject_id': subject_id}, headers=headers).json['class']['id']
+    client.post(f'/classes/{class_id}/attendance', json={'student_id': student_id}, headers=headers)
+    before = rates(client, headers, subject_id, student_id)
+
+    tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+    response = client.post(f'/subject/{subject_id}/schedule', headers=headers, json={
+        'start': tomorrow.isoformat(), 'end': (tomorrow + datetime.timedelta(weeks=16)).isoformat(),
+        'weekdays': ['mon', 'wed', 'fri']})
+    assert len(response.json['created']['ids']) > 40
+
+    assert rates(client, headers, subject_id, student_id) == before
+    summary, students, classes, at_risk = before
+    assert (summary['classes'], summary['rate'], summary['recent_absences']) == (1, 1.0, [])
+    assert students[0]['rate'] == 1.0 and classes == 1
+    assert at_risk == []
@@ -0,0 +1,28 @@
+import sqlite3
+
+from conftest import login
+
+
+def count(path, table):
+    with sqlite3.connect(path) as connection:
+        return connection.execute(f'SELECT count(*) FROM {table}').fetchone()[0]
+
+
+def test_sharded_writes_go_to_the_professors_shard(make_app, tmp_path):
+    app = make_app(SHARDING_ENABLED=True)
+    client = app.test_client()
+    headers = login(client, 'ada')
+
+    response = client.post('/subjects', json={'name': 'Math'}, headers=headers)
+    assert response.status_code == 201
+    assert client.get('/subjects', headers=headers).json['subjects'] == [response.json['subject']]
+
+    assert count(tmp_path / 'shards' / 'professor_1.db', 'subject') == 1
+    assert count(tmp_path / 'main.db', 'subject') == 0
+    assert count(tmp_path / 'main.db', 'professor') == 1
+
+
+def test_shard_tables_need_a_token(make_app):
+    client = make_app(SHARDING_ENABLED=True).test_client()
+    assert client.get('/subject/1/students').status_code == 401
+    assert client.post('/assign_student', json={'student_id': 1, 'subject_id': 1}).status_code == 401